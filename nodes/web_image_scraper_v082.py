@@ -66,27 +66,42 @@ try:
     nest_asyncio.apply()
 except ImportError:
     print("Warning: nest_asyncio not available. Some async functionality may be limited.")
-from PIL import Image
+from PIL import Image, ImageFile
 from io import BytesIO
 from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+import urllib.request
 try:
     import folder_paths
 except ImportError:
     print("Warning: folder_paths not available (running outside ComfyUI)")
     folder_paths = None
+try:
+    import comfy.model_management as comfy_model_management
+except ImportError:
+    comfy_model_management = None  # Not running inside ComfyUI
 import re
+import logging
 import traceback
 import sys
-from threading import Timer
+from threading import Lock, Thread, Timer
+import atexit
+import weakref
 import importlib
 import inspect
+import types
 from collections import defaultdict       
+from functools import lru_cache
+from itertools import zip_longest
 import pkgutil
 from pathlib import Path
 import shutil
 import subprocess
 import tempfile
-import requests
+import errno
+import sqlite3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 try:
     import scrapling
     SCRAPLING_IMPORT_SUCCESS = True
@@ -128,6 +143,19 @@ try:
         print(f"Successfully imported Playwright async API (version: {playwright_version})")
     except:
         print(f"Successfully imported Playwright async API (version information unavailable)")
+
+    # Playwright calls inspect.stack() on every API call just to label traces, which is a
+    # large share of CPU time on locator-heavy pages (reported upstream in playwright-python).
+    # Give its connection module an inspect namespace whose stack() is empty; the real
+    # inspect module is left alone. Set PW_INSPECT_STACK=1 to keep the original behaviour.
+    if os.getenv('PW_INSPECT_STACK', '0') != '1':
+        try:
+            from playwright._impl import _connection as _pw_connection
+            _pw_inspect = types.SimpleNamespace(**vars(_pw_connection.inspect))
+            _pw_inspect.stack = lambda *args, **kwargs: []
+            _pw_connection.inspect = _pw_inspect
+        except (ImportError, AttributeError):
+            pass
 except ImportError:
     playwright = None
     async_playwright = None
@@ -135,6 +163,22 @@ except ImportError:
     PLAYWRIGHT_AVAILABLE = False
     print("Playwright import failed.")
 
+# aiohttp for the parallel download queue (falls back to requests in worker threads)
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+# orjson (optional) for metadata export and session JSON; the stdlib encoder is the fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 # Add proper import for imagehash with error handling
 try:
     import imagehash
@@ -145,6 +189,16 @@ except ImportError:
     IMAGEHASH_AVAILABLE = False
 
 
+# lxml (a Scrapling dependency) for parsing raw HTML in the Scrapling fallback
+try:
+    from lxml import etree as lxml_etree
+    from lxml import html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    lxml_etree = None
+    lxml_html = None
+    LXML_AVAILABLE = False
+
 # Scrapling support - as a fallback
 
 
@@ -195,10 +249,313 @@ except ImportError:
             async def extract_with_scrapling(self, response, **kwargs):
                 return []
 
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    # Print to the console like the rest of the node instead of depending on the host's logging config.
+    # The level stays fixed; debug output is gated per instance on debug_mode (see _log_debug)
+    _log_handler = logging.StreamHandler(sys.stdout)
+    _log_handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_log_handler)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+
+# URL substrings for links unlikely to contain media content, matched case-insensitively
+# in one regex scan (no lowercased copy of each link)
+_NON_CONTENT_LINK_PATTERNS = (
+    '/login', '/signup', '/signin', '/register',
+    '/terms', '/privacy', '/about', '/contact',
+    '/help', '/faq', '/support', '/legal',
+    '/settings', '/account', '/profile',
+    'javascript:', 'mailto:', 'tel:', '/tag/',
+    '/category/', '/search?', '/logout', '/password'
+)
+_NON_CONTENT_LINK_RE = re.compile('|'.join(map(re.escape, _NON_CONTENT_LINK_PATTERNS)), re.IGNORECASE)
+
+# Modern, realistic user agents picked at random to avoid detection
+_USER_AGENTS = (
+    # Chrome on Windows
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/97.0.4692.99 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36",
+    # Chrome on macOS
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/97.0.4692.99 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36",
+    # Firefox on Windows
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:96.0) Gecko/20100101 Firefox/96.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:95.0) Gecko/20100101 Firefox/95.0",
+    # Firefox on macOS
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:96.0) Gecko/20100101 Firefox/96.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:95.0) Gecko/20100101 Firefox/95.0",
+    # Safari on macOS
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.2 Safari/605.1.15",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.1 Safari/605.1.15",
+    # Edge on Windows
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/97.0.4692.99 Safari/537.36 Edg/97.0.1072.69",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36 Edg/96.0.1054.62",
+)
+
+# Browser launch/context settings for _init_direct_playwright, built once at import
+_STEALTH_BROWSER_ARGS = (
+    '--disable-blink-features=AutomationControlled',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--disable-site-isolation-trials',
+    '--disable-features=BlockInsecurePrivateNetworkRequests',
+    '--disable-web-security',
+    '--no-sandbox',
+)
+_BASE_CONTEXT_OPTIONS = types.MappingProxyType({
+    "viewport": {"width": 5120, "height": 2880},
+    "device_scale_factor": 1.0,
+})
+_STEALTH_CONTEXT_OPTIONS = types.MappingProxyType({
+    "locale": "en-US",
+    "timezone_id": "America/New_York",
+    "has_touch": False,
+    "is_mobile": False,
+    "color_scheme": 'light',
+})
+
+# Init script _init_direct_playwright adds to every context to mask common automation fingerprints
+_STEALTH_JS = """
+() => {
+    // Pass WebDriver test
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => false,
+    });
+    
+    // Pass Chrome test
+    window.chrome = {
+        runtime: {},
+    };
+    
+    // Pass permissions test
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+    );
+    
+    // Prevent iframe detection
+    const iframe = document.createElement('iframe');
+    iframe.srcdoc = "<!DOCTYPE html><html><head></head><body></body></html>";
+    document.head.appendChild(iframe);
+    window.navigator.plugins = iframe.contentWindow.navigator.plugins;
+    document.head.removeChild(iframe);
+    
+    // Use webGL renderer
+    const getParameter = WebGLRenderingContext.prototype.getParameter;
+    WebGLRenderingContext.prototype.getParameter = function(parameter) {
+        // UNMASKED_VENDOR_WEBGL
+        if (parameter === 37445) {
+            return 'Intel Inc.';
+        }
+        // UNMASKED_RENDERER_WEBGL
+        if (parameter === 37446) {
+            return 'Intel Iris OpenGL Engine';
+        }
+        return getParameter.apply(this, arguments);
+    };
+    
+    // Add language and platform overrides
+    Object.defineProperty(navigator, 'platform', {
+        get: () => 'Win32',
+    });
+    
+    Object.defineProperty(navigator, 'hardwareConcurrency', {
+        get: () => 8,
+    });
+    
+    // Mock plugins for more authenticity
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => {
+            const plugins = [
+                { name: 'Chrome PDF Plugin', filename: 'internal-pdf-viewer', description: 'Portable Document Format' },
+                { name: 'Chrome PDF Viewer', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai', description: '' },
+                { name: 'Native Client', filename: 'internal-nacl-plugin', description: '' }
+            ];
+            
+            plugins.__proto__ = window.PluginArray.prototype;
+            
+            plugins.item = idx => plugins[idx];
+            plugins.namedItem = name => plugins.find(plugin => plugin.name === name);
+            
+            return plugins;
+        }
+    });
+}
+"""
+
+# Media URLs in raw HTML for the Scrapling fallback. The <img> branch uses two optional
+# lookaheads so src and srcset of the same tag are both captured in a single scan, and the
+# third branch catches CSS background url(...) values.
+_HTML_IMAGE_URL_RE = re.compile(
+    r'<img(?:(?=[^>]+src=["\'](https?://[^"\']+)["\']))?(?:(?=[^>]+srcset=["\'](https?://[^"\']+)["\']))?'
+    r'|url\(["\']?(https?://[^"\'()]+)["\']?\)'
+)
+_HTML_VIDEO_URL_RE = re.compile(r'<(?:video|source)[^>]+src=["\'](https?://[^"\']+)["\']')
+# <img> attributes lazy-loading scripts use for the real image URL
+_LAZY_IMG_ATTRS = ("data-src", "data-lazy-src", "data-lazy", "data-original", "data-full-src")
+
+# Spacer/tracking-pixel/icon image URLs that generic extraction skips
+_PLACEHOLDER_IMAGE_RE = re.compile(r'spacer\.gif|pixel\.gif|transparent\.gif|icon', re.IGNORECASE)
+_CSS_URL_RE = re.compile(r'url\(\s*["\']?([^"\'()]+?)["\']?\s*\)')
+
+# Write buffer for export_metadata output files
+_EXPORT_BUFFER_SIZE = 1 << 20
+
+# CDN hosts whose media is accepted even with same_domain_only (matched on the domain or any parent)
+_TRUSTED_CDN_DOMAINS = frozenset({
+    'tildacdn.com', 'cloudfront.net', 'cloudflare.com', 'akamaihd.net', 'akamaized.net',
+    'fastly.net', 'imgix.net', 'twimg.com', 'cdninstagram.com', 'googleapis.com', 'gstatic.com',
+    'photos.modelmayhem.com', 'assets.modelmayhem.com',  # ModelMayhem CDN domains
+})
+# Host name fragments the parallel queue also treats as CDNs (DevTools cache items carry no handler mark)
+_CDN_HOST_MARKERS = ('cdn.', 'assets.', 'static.', 'media.', 'images.')
+
+# Shared with the site handlers so folder names are sanitized the same way everywhere
+try:
+    from ..site_handlers.base_handler import _FS_BAD_TABLE
+except ImportError:
+    # site_handlers' parent was put on sys.path by the GenericWebsiteWithAuthHandler import above
+    from site_handlers.base_handler import _FS_BAD_TABLE
+
+# page.evaluate() scripts kept as constants so the same source is sent on every call
+
+# Swaps data-src/data-srcset style lazy attributes in; returns the number of images touched
+_JS_LOAD_LAZY_IMAGES = """() => {
+    const lazyImgs = document.querySelectorAll('img[data-src], img[data-lazy], img[loading="lazy"], img[data-original], img[data-srcset]');
+    let count = 0;
+    lazyImgs.forEach(img => {
+        // Try all possible lazy attributes
+        const dataSrc = img.getAttribute('data-src') || img.getAttribute('data-lazy') || img.getAttribute('data-original');
+        if (dataSrc && (!img.src || img.src.includes('placeholder'))) {
+            img.src = dataSrc;
+            count++;
+        }
+        // Handle data-srcset
+        const dataSrcset = img.getAttribute('data-srcset');
+        if (dataSrcset && !img.srcset) {
+            img.srcset = dataSrcset;
+            count++;
+        }
+    });
+    return count;
+}"""
+
+# Unique absolute http(s) links on the page
+_JS_EXTRACT_LINKS = """() => {
+    const uniqueLinks = new Set();
+
+    // Get links from <a> tags
+    document.querySelectorAll('a[href]').forEach(a => {
+        if (a.href && a.href.startsWith('http')) {
+            uniqueLinks.add(a.href);
+        }
+    });
+
+    return Array.from(uniqueLinks);
+}"""
+
+# Include data-src for lazy-loaded images (Tilda, many other CMSes)
+# data-img-zoom-url is Tilda CDN's attribute for full-resolution zoomable images
+_MEDIA_DATA_ATTRS = ["data-img-zoom-url", "data-original", "data-src", "data-large",
+                     "data-image", "data-url", "data-lazy-src", "data-full-src",
+                     "data-hi-res", "data-zoom-image"]
+
+# Generic page media in one pass: visible <img> attributes with parent <figure> caption/credits,
+# data-* URL attributes, <video>/<source> src and the best <picture> srcset candidates.
+# Srcsets are resolved in-page (same rules as _get_highest_res_from_srcset) so only the winning URL is returned.
+_JS_PAGE_MEDIA = """(opts) => {
+    const bestFromSrcset = (srcset) => {
+        if (!srcset) return null;
+        let best = null, bestWidth = 0;
+        for (const entry of srcset.split(',')) {
+            const parts = entry.trim().split(/\\s+/);
+            if (parts.length !== 2) continue;
+            const [url, descriptor] = parts;
+            let width = NaN;
+            if (descriptor.endsWith('w')) width = parseInt(descriptor.slice(0, -1), 10);
+            else if (descriptor.endsWith('x')) width = Math.trunc(parseFloat(descriptor.slice(0, -1)) * 1000);
+            if (width > bestWidth) { bestWidth = width; best = url; }
+        }
+        return best;
+    };
+    // Same test as Playwright's is_visible(): non-empty box and not visibility:hidden
+    const visible = (el) => {
+        if (!el) return false;
+        const r = el.getBoundingClientRect();
+        return r.width > 0 && r.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+    };
+    const text = (el) => (visible(el) ? (el.innerText || '').trim() : '');
+    const result = {imageCount: 0, images: [], dataAttrs: [], videos: [], pictureUrls: []};
+
+    if (opts.images) {
+        const imgs = document.querySelectorAll("img:not([width='16']):not([width='24']):not([width='32'])");
+        result.imageCount = imgs.length;
+        for (const img of imgs) {
+            if (!visible(img)) continue;
+            const fig = img.closest('figure');
+            const figVisible = visible(fig);
+            result.images.push({
+                src: img.getAttribute('src'),
+                dataSrc: img.getAttribute('data-src'),
+                dataOriginal: img.getAttribute('data-original'),
+                dataLazySrc: img.getAttribute('data-lazy-src'),
+                dataFullSrc: img.getAttribute('data-full-src'),
+                dataImgZoomUrl: img.getAttribute('data-img-zoom-url'),
+                srcsetBest: bestFromSrcset(img.getAttribute('srcset')),
+                alt: img.getAttribute('alt'),
+                title: img.getAttribute('title'),
+                caption: figVisible ? text(fig.querySelector('figcaption')) : '',
+                credits: figVisible ? text(fig.querySelector(".credit, .author, [rel='author']")) : ''
+            });
+        }
+    }
+
+    for (const attr of opts.dataAttrs) {
+        for (const el of document.querySelectorAll('[' + attr + ']')) {
+            const value = el.getAttribute(attr);
+            if (value) result.dataAttrs.push([attr, value]);
+        }
+    }
+
+    if (opts.videos) {
+        for (const el of document.querySelectorAll("video, source[type*='video']")) {
+            result.videos.push(el.getAttribute('src'));
+        }
+    }
+
+    for (const source of document.querySelectorAll('picture source')) {
+        const best = bestFromSrcset(source.getAttribute('srcset'));
+        if (best) result.pictureUrls.push(best);
+    }
+    return result;
+}"""
+
+# [absolute src, title] for each <audio>/<audio source> with a non-data: src; the title comes from
+# the first visible .title/[title]/[aria-label] element under the parent (text, then title, then aria-label)
+_JS_AUDIO_SOURCES = """() => Array.from(document.querySelectorAll('audio, audio source')).map(el => {
+    let title = '';
+    const titleEl = el.parentElement && el.parentElement.querySelector('.title, [title], [aria-label]');
+    if (titleEl) {
+        const r = titleEl.getBoundingClientRect();
+        if (r.width > 0 && r.height > 0 && getComputedStyle(titleEl).visibility !== 'hidden') {
+            title = titleEl.innerText || titleEl.getAttribute('title') || titleEl.getAttribute('aria-label') || '';
+        }
+    }
+    return [el.src, title];
+}).filter(([src]) => src && !src.startsWith('data:'))"""
+
 SUPPORTED_IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp', '.tiff', '.svg', '.heic', '.heif'}
 SUPPORTED_VIDEO_EXTENSIONS = {'.mp4', '.webm', '.mov', '.m3u8', '.avi', '.flv', '.mkv'}
 SUPPORTED_AUDIO_EXTENSIONS = {'.mp3', '.wav', '.aac', '.ogg', '.flac'}
 
+# Read/write size when streaming video and audio downloads to disk
+_STREAM_CHUNK_SIZE = 1 << 20
+
+# Downloads are network-bound, so default to more workers than cores (override with SCRAPER_MAX_WORKERS)
+DEFAULT_MAX_WORKERS = max(1, min(64, int(os.environ.get('SCRAPER_MAX_WORKERS', min(16, (os.cpu_count() or 4) * 2)))))
+
 def load_site_handlers():
     """Dynamically load all site handlers"""
     handlers = []
@@ -348,6 +705,96 @@ def colored_print(message, color_code="94"):
     """
     print(f"\033[{color_code}m{message}\033[0m")
 
+@lru_cache(maxsize=16384)
+def _netloc(url):
+    """Cached urlparse(url).netloc for per-link/per-item domain checks."""
+    return urlparse(url).netloc
+
+_MEDIA_TRACKING_PARAMS = frozenset(('fbclid', 'gclid'))
+
+def _media_url_key(url):
+    """Dedup key for a media URL: lowercase host, no fragment, no utm_*/fbclid/gclid parameters.
+
+    Every other query component is kept verbatim (order, bare 'get?12345' parameters, 'source'/'ref'),
+    since image endpoints often use them to pick the file.
+    """
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return url
+    key = f"{parsed.scheme}://{parsed.netloc.lower()}{parsed.path}"
+    if parsed.params:
+        key += f";{parsed.params}"
+    if parsed.query:
+        kept = []
+        for part in parsed.query.split('&'):
+            name = part.split('=', 1)[0].lower()
+            if not name.startswith('utm_') and name not in _MEDIA_TRACKING_PARAMS:
+                kept.append(part)
+        if kept:
+            key += '?' + '&'.join(kept)
+    return key
+
+@lru_cache(maxsize=4096)
+def _is_trusted_cdn_domain(domain, allow_host_markers=False):
+    """Whether a host is a known media CDN; cached since a crawl sees few distinct hosts."""
+    domain = domain.lower()
+    labels = domain.split('.')
+    if any('.'.join(labels[i:]) in _TRUSTED_CDN_DOMAINS for i in range(len(labels) - 1)):
+        return True
+    return allow_host_markers and any(marker in domain for marker in _CDN_HOST_MARKERS)
+
+@lru_cache(maxsize=1024)
+def _robots_parser(scheme, netloc):
+    """Fetches and parses a host's robots.txt once per process. Returns None if it can't be read."""
+    parser = RobotFileParser(f"{scheme}://{netloc}/robots.txt")
+    try:
+        with urllib.request.urlopen(parser.url, timeout=10) as response:
+            parser.parse(response.read().decode('utf-8', errors='ignore').splitlines())
+    except Exception:
+        return None
+    return parser
+
+def _json_dumps(obj):
+    """Compact JSON text for obj, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'))
+
+# Scrapers holding a shared Chromium; shut down at interpreter exit so no browser outlives ComfyUI
+_SHARED_BROWSER_OWNERS = weakref.WeakSet()
+
+@atexit.register
+def _discard_shared_browsers():
+    for owner in list(_SHARED_BROWSER_OWNERS):
+        owner._discard_shared_browser()
+
+def _json_load_file(path):
+    """Reads and decodes a JSON file, using orjson when it is installed."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+@lru_cache(maxsize=32)
+def _parse_interactions(interaction_json):
+    """Parses an interaction_sequence JSON string, cached so batches of URLs parse it once."""
+    return json.loads(interaction_json) if interaction_json else []
+
+# Maps every ASCII character outside [\w.-] to '_' for session file names
+_SESSION_NAME_TRANS = str.maketrans({
+    chr(i): '_' for i in range(128) if not (chr(i).isalnum() or chr(i) in '_-.')
+})
+
+@lru_cache(maxsize=1024)
+def _session_file_name(domain):
+    """Session file name for a domain (sanitized for the filesystem), cached per domain."""
+    if domain.isascii():
+        safe_domain = domain.translate(_SESSION_NAME_TRANS)
+    else:
+        # Unicode domains need the full \w test, which the ASCII table doesn't cover
+        safe_domain = re.sub(r'[^\w\-\.]', '_', domain)
+    return f"{safe_domain}_session.json"
+
 class EricWebFileScraper:
     # --- ComfyUI Node Definition ---
     @classmethod
@@ -423,7 +870,8 @@ class EricWebFileScraper:
                 # --- Advanced Options ---
                 "use_stealth_mode": ("BOOLEAN", {"default": False, "label_on": "Use Stealth Mode", "label_off": "Normal Browser"}),
                 "use_parallel": ("BOOLEAN", {"default": True, "label_on": "Parallel Downloads", "label_off": "Sequential Downloads"}),
-                "max_workers": ("INT", {"default": 4, "min": 1, "max": 16, "step": 1, "display": "Parallel Workers"}),
+                "max_workers": ("INT", {"default": DEFAULT_MAX_WORKERS, "min": 1, "max": 64, "step": 1, "display": "Parallel Workers"}),
+                "respect_robots_txt": ("BOOLEAN", {"default": False, "label_on": "Respect robots.txt", "label_off": "Ignore robots.txt"}),
                 "reuse_sessions": ("BOOLEAN", {"default": True, "label_on": "Reuse Sessions", "label_off": "New Session"}),
                 "session_expiry_hours": ("FLOAT", {"default": 24.0, "min": 1.0, "max": 720.0, "step": 1.0, "display": "Session Expiry (hours)"}),
                 "capture_network_stream": ("BOOLEAN", {"default": False, "label_on": "Sniff Responses", "label_off": "Skip Sniff"}),
@@ -446,6 +894,8 @@ class EricWebFileScraper:
     # --- Initialization ---
     def __init__(self):
         self.pw_resources = None  # Tuple: (playwright, browser, context, page)
+        self._pw_shared = None  # (loop, launch args, playwright, browser) kept alive between scrapes
+        self._pw_lock = None  # (loop, asyncio.Lock) guarding _pw_shared
         self.scrapling_available = SCRAPLING_AVAILABLE
         self.playwright_available = PLAYWRIGHT_AVAILABLE
         self.imagehash_available = IMAGEHASH_AVAILABLE
@@ -460,6 +910,20 @@ class EricWebFileScraper:
         self.cancellation_requested = False  # Add cancellation flag
         self.files_saved_this_session = []  # Track files saved in current session
         self.save_batch_size = 10  # Save progress every N files
+        self._cookie_state_cache = {}  # cookie file path -> (mtime_ns, parsed storage_state dict)
+        self._sha1_index = {}  # SHA1 digest of saved image bytes -> filepath (exact duplicates)
+        self._sha1_pending = set()  # Digests claimed by a save that hasn't written its file yet
+        self._sha1_lock = Lock()
+        self._duplicates_folder = None  # Set per download queue when move_duplicates is on
+
+        # Keep-alive session so repeated hits on the same CDN reuse TCP/TLS connections
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=64, pool_maxsize=64, max_retries=Retry(total=2, backoff_factor=0.3))
+        self._http.mount('http://', adapter)
+        self._http.mount('https://', adapter)
+
+        # Decode/hash pool for the download queue, created on first use and kept across runs
+        self._hash_executor = None
 
         # Initialize session manager
         sessions_dir = os.path.join(os.path.dirname(__file__), "sessions")
@@ -610,10 +1074,12 @@ class EricWebFileScraper:
         self.auth_config = None
         self.cancellation_requested = False  # Reset cancellation flag
         self.files_saved_this_session = []  # Reset files tracking
+        self._sha1_index.clear()
+        self._sha1_pending.clear()
 
         # Get important kwargs with defaults
         use_parallel = kwargs.get('use_parallel', True)
-        max_workers = kwargs.get('max_workers', 4)
+        max_workers = kwargs.get('max_workers', DEFAULT_MAX_WORKERS)
 
         # Get advanced options
         self.use_stealth_mode = kwargs.get('use_stealth_mode', False)
@@ -662,7 +1128,10 @@ class EricWebFileScraper:
     def _check_cancellation(self):
         """Check if cancellation has been requested (ComfyUI doesn't provide direct cancellation, so we check for KeyboardInterrupt)"""
         try:
-            # This is a simple check - in practice, ComfyUI may terminate the process
+            # Pick up the ComfyUI "Cancel" button, which only raises an interrupt flag
+            if not self.cancellation_requested and comfy_model_management is not None:
+                if comfy_model_management.processing_interrupted():
+                    self.cancellation_requested = True
             return self.cancellation_requested
         except KeyboardInterrupt:
             self.cancellation_requested = True
@@ -842,7 +1311,8 @@ class EricWebFileScraper:
             except Exception as e:
                 print(f"❌ Failed to process {single_url}: {e}")
                 combined_stats['failed_urls'] += 1
-                traceback.print_exc()
+                if self.debug_mode:
+                    traceback.print_exc()
         
         # Calculate combined image downloads
         combined_stats['downloads_succeeded_image'] = (combined_stats['files_downloaded'] - 
@@ -886,7 +1356,7 @@ class EricWebFileScraper:
         """Process a single URL (existing logic moved here)"""
         # Get important kwargs with defaults
         use_parallel = kwargs.get('use_parallel', True)
-        max_workers = kwargs.get('max_workers', 4)
+        max_workers = kwargs.get('max_workers', DEFAULT_MAX_WORKERS)
 
         # Get advanced options
         self.use_stealth_mode = kwargs.get('use_stealth_mode', False)
@@ -942,6 +1412,7 @@ class EricWebFileScraper:
             "downloads_succeeded_image": 0, "downloads_succeeded_video": 0,
             "duplicates_removed": 0, "duplicates_moved": 0,
             "skipped_small": 0, "skipped_platform": 0, "skipped_not_media": 0, "skipped_already_processed": 0,
+            "skipped_robots": 0,
             "failed_download": 0, "failed_image_error": 0, "failed_other": 0,
             "metadata_files_saved": 0, "screenshots_taken": 0,
             "files_loaded_from_metadata": 0,
@@ -1037,169 +1508,189 @@ class EricWebFileScraper:
         stats["handler_used"] = type(handler_instance).__name__
         print(f"Using handler: {stats['handler_used']}")
 
-        # If crawling is enabled, use the new method instead of standard extraction
-        if crawl_links and crawl_depth > 0:
-            try:
-                print(f"Starting link crawling (depth: {crawl_depth}, max pages: {max_pages})")
+        # Keep the perceptual-hash dedup cache on disk next to the downloads so it
+        # persists across runs instead of growing in memory
+        persistent_cache = None
+        try:
+            persistent_cache = ImageHashCache(os.path.join(output_path, "_dupcache.sqlite"))
+            persistent_cache.update(downloaded_images_cache)  # Entries rebuilt from previous metadata
+            downloaded_images_cache = persistent_cache
+        except Exception as e:
+            if persistent_cache is not None:
+                persistent_cache.close()
+            print(f"Warning: Could not open persistent image hash cache, using in-memory cache: {e}")
+
+        try:
+            # If crawling is enabled, use the new method instead of standard extraction
+            if crawl_links and crawl_depth > 0:
+                try:
+                    print(f"Starting link crawling (depth: {crawl_depth}, max pages: {max_pages})")
                 
-                # Use stealth mode if enabled
-                use_stealth = kwargs.get("use_stealth_mode", False)
-                if use_stealth:
-                    stealth_level = kwargs.get("stealth_mode_level", "basic")
-                    print(f"Using stealth mode (level: {stealth_level})")
-                    self.pw_resources = await self._init_stealth_playwright(**kwargs)
-                else:
-                    # Initialize Playwright
-                    self.pw_resources = await self._init_direct_playwright(**kwargs)
+                    # Use stealth mode if enabled
+                    use_stealth = kwargs.get("use_stealth_mode", False)
+                    if use_stealth:
+                        stealth_level = kwargs.get("stealth_mode_level", "basic")
+                        print(f"Using stealth mode (level: {stealth_level})")
+                        self.pw_resources = await self._init_stealth_playwright(**kwargs)
+                    else:
+                        # Initialize Playwright
+                        self.pw_resources = await self._init_direct_playwright(**kwargs)
 
-                if not self.pw_resources:
-                    raise RuntimeError("Failed to initialize Playwright.")
+                    if not self.pw_resources:
+                        raise RuntimeError("Failed to initialize Playwright.")
 
-                _, _, _, page, _ = self.pw_resources
+                    _, _, _, page, _ = self.pw_resources
                 
-                # Authentication
-                if self.auth_config:
-                    await self.authenticate_with_site(page, url, self.auth_config, save_cookies, output_path)
+                    # Authentication
+                    if self.auth_config:
+                        await self.authenticate_with_site(page, url, self.auth_config, save_cookies, output_path)
                 
-                # Navigate to page
-                wait_until_strategy = "networkidle" if kwargs.get('wait_for_network_idle', False) else "load"
-                await page.goto(url, timeout=int(timeout_seconds * 1000), wait_until=wait_until_strategy)
+                    # Navigate to page
+                    wait_until_strategy = "networkidle" if kwargs.get('wait_for_network_idle', False) else "load"
+                    await page.goto(url, timeout=int(timeout_seconds * 1000), wait_until=wait_until_strategy)
                 
-                kwargs.pop("same_domain_only", None)  # remove duplicate if present
-                # Extract and follow links - pass stats and output_path for direct downloads
-                media_items_from_pages = await self._extract_and_follow_links(
-                    page=page,
-                    base_url=url,
-                    max_depth=crawl_depth,
-                    current_depth=0,
-                    visited_urls=None,
-                    same_domain_only=same_domain_only,
-                    max_pages=max_pages,
-                    stats=stats,
-                    output_path=output_path,
-                    min_width=min_width,
-                    min_height=min_height,
-                    extract_metadata=extract_metadata,
-                    debug_mode=self.debug_mode,
-                    filename_prefix=filename_prefix,
-                    hash_algorithm=hash_algorithm,
-                    download_images=download_images,
-                    download_videos=download_videos,
-                    move_duplicates=move_duplicates,
-                    max_files=max_files,
-                    use_parallel=use_parallel,
-                    max_workers=max_workers,
-                    crawl_subfolders=kwargs.get('crawl_subfolders', True),
-                    link_include_pattern=kwargs.get('link_include_pattern', ''),
-                    link_exclude_pattern=kwargs.get('link_exclude_pattern', ''),
-                    skip_first_page_download=kwargs.get('skip_first_page_download', False)
-                )
+                    kwargs.pop("same_domain_only", None)  # remove duplicate if present
+                    # Extract and follow links - pass stats and output_path for direct downloads
+                    media_items_from_pages = await self._extract_and_follow_links(
+                        page=page,
+                        base_url=url,
+                        max_depth=crawl_depth,
+                        current_depth=0,
+                        visited_urls=None,
+                        same_domain_only=same_domain_only,
+                        max_pages=max_pages,
+                        stats=stats,
+                        output_path=output_path,
+                        min_width=min_width,
+                        min_height=min_height,
+                        extract_metadata=extract_metadata,
+                        debug_mode=self.debug_mode,
+                        filename_prefix=filename_prefix,
+                        hash_algorithm=hash_algorithm,
+                        download_images=download_images,
+                        download_videos=download_videos,
+                        move_duplicates=move_duplicates,
+                        max_files=max_files,
+                        use_parallel=use_parallel,
+                        max_workers=max_workers,
+                        crawl_subfolders=kwargs.get('crawl_subfolders', True),
+                        link_include_pattern=kwargs.get('link_include_pattern', ''),
+                        link_exclude_pattern=kwargs.get('link_exclude_pattern', ''),
+                        skip_first_page_download=kwargs.get('skip_first_page_download', False),
+                        respect_robots_txt=kwargs.get('respect_robots_txt', False)
+                    )
 
-                # Store cache flags so _cleanup_resources() can read them later
-                self.dump_cache_after_run = kwargs.get("dump_cache_after_run", False)
-                self.last_output_path     = kwargs.get("output_path", "")
+                    # Store cache flags so _cleanup_resources() can read them later
+                    self.dump_cache_after_run = kwargs.get("dump_cache_after_run", False)
+                    self.last_output_path     = kwargs.get("output_path", "")
                 
-                # Update stats with found items if any
-                if media_items_from_pages:
-                    print(f"Link crawling found and downloaded {len(media_items_from_pages)} items")
-                    final_files_data.extend(media_items_from_pages)
-                    stats["files_found"] = len(final_files_data)
+                    # Update stats with found items if any
+                    if media_items_from_pages:
+                        print(f"Link crawling found and downloaded {len(media_items_from_pages)} items")
+                        final_files_data.extend(media_items_from_pages)
+                        stats["files_found"] = len(final_files_data)
                 
-            except Exception as e:
-                print(f"Error during link crawling: {e}")
-                traceback.print_exc()
-                stats["error"] = f"Crawling Error: {e}"
-                media_items_from_pages = []
-        else:
-            try:
-                strategy_chosen = "None"
-                # 1. If the handler requires API, always use API
-                if hasattr(handler_instance, "requires_api") and handler_instance.requires_api():
-                    print(f"Handler {type(handler_instance).__name__} requires API. Forcing API extraction.")
-                    strategy_chosen = "API"
-                    stats["strategy_used"] = strategy_chosen
-                    media_items_from_pages = await self._scrape_with_api(
-                        handler_instance, url, **kwargs, output_path=output_path
-                    )
-                # 2. If the handler prefers API, use it if possible
-                elif handler_instance.prefers_api():
-                    strategy_chosen = "API"
-                    stats["strategy_used"] = strategy_chosen
-                    media_items_from_pages = await self._scrape_with_api(
-                        handler_instance, url, **kwargs, output_path=output_path
-                    )
-                # 3. Otherwise, use Playwright or Scrapling fallback
-                elif use_direct_pw and self.playwright_available:
-                    strategy_chosen = "Direct Playwright"
-                    stats["strategy_used"] = strategy_chosen
-                    media_items_from_pages = await self._scrape_with_direct_playwright(
-                        url, handler_instance, **kwargs, output_path=output_path, stats=stats
-                    )
-                elif self.scrapling_available:
-                    strategy_chosen = "Scrapling Fallback"
-                    stats["strategy_used"] = strategy_chosen
-                    media_items_from_pages = await self._scrape_with_scrapling(
-                        url, handler_instance, **kwargs, output_path=output_path, stats=stats
-                    )
-                else:
-                    stats["error"] = "No suitable scraping strategy available (Playwright/Scrapling missing or disabled)."
-                    print(f"Error: {stats['error']}")
-                    raise RuntimeError(stats["error"])
+                except Exception as e:
+                    print(f"Error during link crawling: {e}")
+                    if self.debug_mode:
+                        traceback.print_exc()
+                    stats["error"] = f"Crawling Error: {e}"
+                    media_items_from_pages = []
+            else:
+                try:
+                    strategy_chosen = "None"
+                    # 1. If the handler requires API, always use API
+                    if hasattr(handler_instance, "requires_api") and handler_instance.requires_api():
+                        print(f"Handler {type(handler_instance).__name__} requires API. Forcing API extraction.")
+                        strategy_chosen = "API"
+                        stats["strategy_used"] = strategy_chosen
+                        media_items_from_pages = await self._scrape_with_api(
+                            handler_instance, url, **kwargs, output_path=output_path
+                        )
+                    # 2. If the handler prefers API, use it if possible
+                    elif handler_instance.prefers_api():
+                        strategy_chosen = "API"
+                        stats["strategy_used"] = strategy_chosen
+                        media_items_from_pages = await self._scrape_with_api(
+                            handler_instance, url, **kwargs, output_path=output_path
+                        )
+                    # 3. Otherwise, use Playwright or Scrapling fallback
+                    elif use_direct_pw and self.playwright_available:
+                        strategy_chosen = "Direct Playwright"
+                        stats["strategy_used"] = strategy_chosen
+                        media_items_from_pages = await self._scrape_with_direct_playwright(
+                            url, handler_instance, **kwargs, output_path=output_path, stats=stats
+                        )
+                    elif self.scrapling_available:
+                        strategy_chosen = "Scrapling Fallback"
+                        stats["strategy_used"] = strategy_chosen
+                        media_items_from_pages = await self._scrape_with_scrapling(
+                            url, handler_instance, **kwargs, output_path=output_path, stats=stats
+                        )
+                    else:
+                        stats["error"] = "No suitable scraping strategy available (Playwright/Scrapling missing or disabled)."
+                        print(f"Error: {stats['error']}")
+                        raise RuntimeError(stats["error"])
 
-                print(f"Strategy '{strategy_chosen}' finished. Found {len(media_items_from_pages)} potential media items.")
-                stats["urls_found_on_pages"] = len(media_items_from_pages)
+                    print(f"Strategy '{strategy_chosen}' finished. Found {len(media_items_from_pages)} potential media items.")
+                    stats["urls_found_on_pages"] = len(media_items_from_pages)
 
-                if not media_items_from_pages:
-                    print("No media items found by the scraping strategy.")
-                else:
-                    download_kwargs = {
-                        'filename_prefix': filename_prefix,
-                        'min_width': min_width,
-                        'min_height': min_height,
-                        'hash_algorithm': hash_algorithm,
-                        'download_images': download_images,
-                        'download_videos': download_videos,
-                        'move_duplicates': move_duplicates,
-                        'max_files': max_files,
-                        'save_metadata_json': save_metadata_json,
-                        'initial_file_count': initial_file_count,
-                        'url': url,
-                        'downloaded_images_cache': downloaded_images_cache,
-                        'extract_metadata': extract_metadata,
-                        'same_domain_only': same_domain_only
-                    }
+                    if not media_items_from_pages:
+                        print("No media items found by the scraping strategy.")
+                    else:
+                        download_kwargs = {
+                            'filename_prefix': filename_prefix,
+                            'min_width': min_width,
+                            'min_height': min_height,
+                            'hash_algorithm': hash_algorithm,
+                            'download_images': download_images,
+                            'download_videos': download_videos,
+                            'move_duplicates': move_duplicates,
+                            'max_files': max_files,
+                            'save_metadata_json': save_metadata_json,
+                            'initial_file_count': initial_file_count,
+                            'url': url,
+                            'downloaded_images_cache': downloaded_images_cache,
+                            'extract_metadata': extract_metadata,
+                            'same_domain_only': same_domain_only,
+                            'respect_robots_txt': kwargs.get('respect_robots_txt', False)
+                        }
                     
-                    if use_parallel:
-                        newly_downloaded_data, downloaded_images_cache = await self._process_download_queue_parallel(
-                            media_items_from_pages, output_path, stats, max_workers=max_workers, **download_kwargs
-                        )
-                    else: 
-                        newly_downloaded_data, downloaded_images_cache = await self._process_download_queue(
-                            media_items_from_pages, output_path, stats, **download_kwargs
-                        )
+                        if use_parallel:
+                            newly_downloaded_data, downloaded_images_cache = await self._process_download_queue_parallel(
+                                media_items_from_pages, output_path, stats, max_workers=max_workers, **download_kwargs
+                            )
+                        else: 
+                            newly_downloaded_data, downloaded_images_cache = await self._process_download_queue(
+                                media_items_from_pages, output_path, stats, **download_kwargs
+                            )
                     
-                    # Add newly downloaded files to final data for statistics
-                    if newly_downloaded_data:
-                        final_files_data.extend(newly_downloaded_data)
-                        print(f"Added {len(newly_downloaded_data)} successfully downloaded files to final data")
+                        # Add newly downloaded files to final data for statistics
+                        if newly_downloaded_data:
+                            final_files_data.extend(newly_downloaded_data)
+                            print(f"Added {len(newly_downloaded_data)} successfully downloaded files to final data")
 
-                # Add audio extraction if enabled
-                if download_audio and PLAYWRIGHT_AVAILABLE and self.pw_resources:
-                    try:
-                        _, _, _, page, _ = self.pw_resources
-                        audio_items = await self._extract_audio_sources(page)
-                        if audio_items:
-                            print(f"Found {len(audio_items)} audio items")
-                            media_items_from_pages.extend(audio_items)
-                    except Exception as e:
-                        print(f"Error extracting audio: {e}")
-            except Exception as e:
-                stats["error"] = f"Scraping failed: {type(e).__name__}: {e}"
-                print(f"Error during scraping process: {stats['error']}")
-                traceback.print_exc()
-            finally:
-                # Cleanup
-                await self._cleanup_resources()
+                    # Add audio extraction if enabled
+                    if download_audio and PLAYWRIGHT_AVAILABLE and self.pw_resources:
+                        try:
+                            _, _, _, page, _ = self.pw_resources
+                            audio_items = await self._extract_audio_sources(page)
+                            if audio_items:
+                                print(f"Found {len(audio_items)} audio items")
+                                media_items_from_pages.extend(audio_items)
+                        except Exception as e:
+                            print(f"Error extracting audio: {e}")
+                except Exception as e:
+                    stats["error"] = f"Scraping failed: {type(e).__name__}: {e}"
+                    print(f"Error during scraping process: {stats['error']}")
+                    traceback.print_exc()
+                finally:
+                    # Cleanup
+                    await self._cleanup_resources()
+        finally:
+            # Release the SQLite handle even if scraping raised past its own handlers
+            if isinstance(downloaded_images_cache, ImageHashCache):
+                downloaded_images_cache.close()
 
         # Finalization (same as before)
         stats["end_time"] = time.time()
@@ -1456,17 +1947,15 @@ class EricWebFileScraper:
 
         try:
             # Configure Scrapling Adaptor (Scrapling itself isn't async, so we run it in thread)
-            import concurrent.futures
             loop = asyncio.get_event_loop()
             
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                response = await loop.run_in_executor(
-                    pool, 
-                    lambda: Adaptor(fetcher=PlayWrightFetcher(headless=True)).get(
-                        url, 
-                        timeout=kwargs.get('timeout_seconds', 60.0)
-                    )
+            response = await loop.run_in_executor(
+                None, 
+                lambda: Adaptor(fetcher=PlayWrightFetcher(headless=True)).get(
+                    url, 
+                    timeout=kwargs.get('timeout_seconds', 60.0)
                 )
+            )
 
             if not response or not response.ok:
                 print(f"Scrapling failed to fetch URL: {response.status_code if response else 'No response'}")
@@ -1519,11 +2008,12 @@ class EricWebFileScraper:
         move_duplicates=False,
         max_files=0,
         use_parallel=True,
-        max_workers=4,
+        max_workers=DEFAULT_MAX_WORKERS,
         crawl_subfolders=True,
         link_include_pattern="",
         link_exclude_pattern="",
-        skip_first_page_download=False
+        skip_first_page_download=False,
+        respect_robots_txt=False
     ):
         """Extract content from the current page and follow links (async version).
         
@@ -1532,6 +2022,7 @@ class EricWebFileScraper:
             link_include_pattern: Regex pattern - only follow links matching this pattern (if set)
             link_exclude_pattern: Regex pattern - exclude links matching this pattern
             skip_first_page_download: If True, don't download from the starting page (depth 0), only from linked pages
+            respect_robots_txt: If True, skip media disallowed by robots.txt on followed pages too
         """
         if visited_urls is None:
             visited_urls = set()
@@ -1584,7 +2075,8 @@ class EricWebFileScraper:
                 media_items.extend(page_media_items)
             except Exception as e:
                 print(f"Error extracting with handler: {e}")
-                traceback.print_exc()
+                if self.debug_mode:
+                    traceback.print_exc()
 
             if not media_items and debug_mode:
                 try:
@@ -1612,7 +2104,7 @@ class EricWebFileScraper:
                     page_path = parsed_current.path.strip('/')
                     if page_path:
                         # Sanitize for folder name (replace / with _, remove special chars)
-                        subfolder_name = re.sub(r'[<>:"/\\|?*]', '_', page_path)
+                        subfolder_name = page_path.translate(_FS_BAD_TABLE)
                         subfolder_name = subfolder_name.lower().replace('/', '_')
                         page_output_path = os.path.join(output_path, subfolder_name)
                         os.makedirs(page_output_path, exist_ok=True)
@@ -1632,7 +2124,8 @@ class EricWebFileScraper:
                     'url': current_url,
                     'downloaded_images_cache': {},
                     'extract_metadata': extract_metadata,
-                    'same_domain_only': same_domain_only
+                    'same_domain_only': same_domain_only,
+                    'respect_robots_txt': respect_robots_txt
                 }
 
                 try:
@@ -1650,7 +2143,8 @@ class EricWebFileScraper:
                         media_items_for_download.extend(downloaded_data)
                 except Exception as download_err:
                     print(f"Error during download process: {download_err}")
-                    traceback.print_exc()
+                    if self.debug_mode:
+                        traceback.print_exc()
 
         except Exception as e:
             print(f"Error extracting from {current_url}: {e}")
@@ -1754,7 +2248,8 @@ class EricWebFileScraper:
                         crawl_subfolders=crawl_subfolders,
                         link_include_pattern=link_include_pattern,
                         link_exclude_pattern=link_exclude_pattern,
-                        skip_first_page_download=skip_first_page_download
+                        skip_first_page_download=skip_first_page_download,
+                        respect_robots_txt=respect_robots_txt
                     )
 
                     media_items_for_download.extend(sub_items)
@@ -1831,8 +2326,8 @@ class EricWebFileScraper:
             # Build new query string
             query = '&'.join([f"{k}={v}" for k, v in sorted(query_params.items())])
             
-            # Normalize and rebuild URL
-            normalized = f"{parsed.scheme}://{parsed.netloc}{path}"
+            # Normalize and rebuild URL (host names are case-insensitive; the fragment is dropped)
+            normalized = f"{parsed.scheme}://{parsed.netloc.lower()}{path}"
             if query:
                 normalized += f"?{query}"
                 
@@ -1927,8 +2422,10 @@ class EricWebFileScraper:
         # Clean up in reverse order of creation (page → context → browser → playwright)
         await cleanup_component(page, "close", "page")
         await cleanup_component(context, "close", "context")
-        await cleanup_component(browser, "close", "browser")
-        await cleanup_component(pw, "stop", "playwright instance")
+        # The shared browser (see _get_shared_browser) stays up for the next scrape
+        if not (self._pw_shared and browser is self._pw_shared[3]):
+            await cleanup_component(browser, "close", "browser")
+            await cleanup_component(pw, "stop", "playwright instance")
         
         from pathlib import Path
         if self.pw_user_data_dir and getattr(self, "dump_cache_after_run", False):
@@ -2037,14 +2534,12 @@ class EricWebFileScraper:
                     **context_options
                 )
                 context = browser  # persistent context IS the context
-                page = await context.new_page()
             else:
                 browser = await playwright_instance.chromium.launch(
                     headless=not kwargs.get('headful', False),
                     args=browser_args
                 )
                 context = await browser.new_context(**context_options)
-                page = await context.new_page()
 
             # Add stealth scripts based on level
             basic_stealth_script = """
@@ -2245,8 +2740,9 @@ class EricWebFileScraper:
             context.set_default_navigation_timeout(kwargs.get('timeout_ms', 60000))
 
             
-            # Create page
-            page = await context.new_page()
+            # Create the single page once the init scripts are registered; a persistent
+            # context already opens a blank tab, so reuse that one
+            page = context.pages[0] if use_persistent and context.pages else await context.new_page()
             
             if not page:
                 print("Failed to create page")
@@ -2313,9 +2809,11 @@ class EricWebFileScraper:
         if move_duplicates:
             duplicates_folder = os.path.join(output_path, "_duplicates")
             os.makedirs(duplicates_folder, exist_ok=True)
+        self._duplicates_folder = duplicates_folder
 
         total_items = len(media_items_to_process)
         print(f"Processing download queue: {total_items} items found.")
+        base_domain = _netloc(kwargs.get('url', ''))
 
         for index, item_data in enumerate(media_items_to_process):
             # Check max files limit (considering files from previous run)
@@ -2337,32 +2835,21 @@ class EricWebFileScraper:
                 continue
 
             # Check domain restrictions if same_domain_only is enabled
+            item_domain = _netloc(item_url)
             if kwargs.get('same_domain_only', True):
-                item_domain = urlparse(item_url).netloc
-                base_url = kwargs.get('url', '')
-                base_domain = urlparse(base_url).netloc
                 
-                # Check if this is a trusted CDN URL marked by the handler
-                is_trusted_cdn = item_data.get('trusted_cdn', False)
+                # Same-host items (the common case) skip the CDN checks entirely
+                is_trusted_cdn = item_domain == base_domain or item_data.get('trusted_cdn', False)
                 
                 # Fallback: Check common CDN domains directly if not already marked
                 # This handles cases where items come from cache/network monitoring
-                if not is_trusted_cdn and item_domain != base_domain:
-                    cdn_domains = [
-                        'tildacdn.com', 'cloudfront.net', 'cloudflare.com', 
-                        'akamaihd.net', 'fastly.net', 'imgix.net', 'twimg.com',
-                        'cdninstagram.com', 'googleapis.com', 'gstatic.com',
-                        'photos.modelmayhem.com', 'assets.modelmayhem.com'  # ModelMayhem CDN domains
-                    ]
-                    is_trusted_cdn = any(cdn in item_domain.lower() for cdn in cdn_domains)
+                if not is_trusted_cdn:
+                    is_trusted_cdn = _is_trusted_cdn_domain(item_domain)
                     if is_trusted_cdn:
                         item_data['trusted_cdn'] = True  # Mark for future reference
+                    self._log_debug("  Domain check: %s vs %s, trusted_cdn=%s", item_domain, base_domain, is_trusted_cdn)
                 
-                # Debug: Show what's happening
-                if item_domain != base_domain:
-                    print(f"  Domain check: {item_domain} vs {base_domain}, trusted_cdn={is_trusted_cdn}")
-                
-                if item_domain != base_domain and not is_trusted_cdn:
+                if not is_trusted_cdn:
                     print(f"Skipping item {index + 1}/{total_items}: Off-domain URL {item_url}")
                     stats["skipped_platform"] += 1
                     self.mark_url_processed(item_url)
@@ -2394,6 +2881,9 @@ class EricWebFileScraper:
                         if "small" in download_error.lower(): stats["skipped_small"] += 1
                         elif "platform" in download_error.lower(): stats["skipped_platform"] += 1
                         elif "not media" in download_error.lower(): stats["skipped_not_media"] += 1
+                        elif "duplicate" in download_error.lower():
+                            stats["duplicates_removed"] += 1
+                            if download_error.startswith("Moved"): stats["duplicates_moved"] += 1
                         else: stats["failed_download"] += 1
                         self.mark_url_processed(item_url) # Mark as processed even if skipped/failed
                         continue
@@ -2402,9 +2892,11 @@ class EricWebFileScraper:
                     is_duplicate = False
                     duplicate_info = None
                     if file_type == 'image' and file_hash and IMAGEHASH_AVAILABLE and kwargs['hash_algorithm'] != 'none':
-                        if file_hash in downloaded_images_cache:
+                        existing_info = downloaded_images_cache.get(file_hash)
+                        # Same path means this URL was re-downloaded over its own earlier file
+                        if existing_info and existing_info['filepath'] != file_path:
                             is_duplicate = True
-                            duplicate_info = downloaded_images_cache[file_hash]
+                            duplicate_info = existing_info
                             print(f"  Duplicate detected: Hash {file_hash} matches {duplicate_info['filename']}")
                         else:
                             # Add to cache if not duplicate
@@ -2428,9 +2920,7 @@ class EricWebFileScraper:
                             # Delete or move the newly downloaded file
                             if move_duplicates:
                                 try:
-                                    new_filename = os.path.basename(file_path)
-                                    move_path = os.path.join(duplicates_folder, new_filename)
-                                    os.rename(file_path, move_path)
+                                    move_path = self._move_to_duplicates(file_path, duplicates_folder)
                                     print(f"  Moved new duplicate to: {move_path}")
                                     stats["duplicates_moved"] += 1
                                 except Exception as move_err:
@@ -2448,9 +2938,7 @@ class EricWebFileScraper:
                             old_filepath = duplicate_info['filepath']
                             if move_duplicates:
                                 try:
-                                    old_filename = os.path.basename(old_filepath)
-                                    move_path = os.path.join(duplicates_folder, old_filename)
-                                    os.rename(old_filepath, move_path)
+                                    move_path = self._move_to_duplicates(old_filepath, duplicates_folder)
                                     print(f"  Moved old duplicate to: {move_path}")
                                     stats["duplicates_moved"] += 1
                                 except Exception as move_err:
@@ -2511,7 +2999,8 @@ class EricWebFileScraper:
 
             except Exception as e:
                 print(f"  Error processing item {item_url}: {e}")
-                traceback.print_exc()
+                if self.debug_mode:
+                    traceback.print_exc()
                 stats["failed_other"] += 1
                 self.mark_url_processed(item_url) # Mark as processed on error
 
@@ -2567,19 +3056,25 @@ class EricWebFileScraper:
         
         return url
 
-    def download_file(self, url_or_dict, output_path, index, prefix, min_width, min_height, hash_algo, download_images, download_videos):
-        """Downloads a single file, checks dimensions, calculates hash, and returns details."""
+    def _prepare_download(self, url_or_dict, download_images, download_videos):
+        """
+        Validates a queue item and works out what kind of file it is.
+
+        Returns:
+            Tuple of (url, item, file_type, file_ext, error). On failure only
+            file_type (when known) and error are set.
+        """
         if isinstance(url_or_dict, dict):
             url = url_or_dict.get('url')
             if not url: 
                 print("Missing URL in item dictionary")
-                return None, None, None, None, None, "Missing URL"
+                return None, None, None, None, "Missing URL"
         else:
             url = url_or_dict # Assume it's just the URL string
 
         if not url:
             print("Empty URL provided")
-            return None, None, None, None, None, "Missing URL"
+            return None, None, None, None, "Missing URL"
         
         # Upgrade Tilda CDN URLs to full resolution
         url = self._upgrade_tilda_url(url)
@@ -2588,16 +3083,17 @@ class EricWebFileScraper:
         parsed_url = urlparse(url)
         if not parsed_url.scheme or not parsed_url.netloc:
             print(f"Invalid URL format: {url}")
-            return None, None, None, None, None, f"Invalid URL format: {url}"
+            return None, None, None, None, f"Invalid URL format: {url}"
 
         # Determine file type and check if we should download it
         file_ext = os.path.splitext(parsed_url.path)[1].lower()
+        url_lower = url.lower()
         
         # No extension? Try to guess from the URL or default to .jpg
         if not file_ext:
-            if 'image' in url.lower() or any(img_format in url.lower() for img_format in ['jpeg', 'jpg', 'png', 'webp']):
+            if 'image' in url_lower or any(img_format in url_lower for img_format in ('jpeg', 'jpg', 'png', 'webp')):
                 file_ext = '.jpg'
-            elif 'video' in url.lower() or any(vid_format in url.lower() for vid_format in ['mp4', 'webm', 'mov']):
+            elif 'video' in url_lower or any(vid_format in url_lower for vid_format in ('mp4', 'webm', 'mov')):
                 file_ext = '.mp4'
             else:
                 file_ext = '.jpg'  # Default to jpg
@@ -2608,10 +3104,10 @@ class EricWebFileScraper:
 
         # If extension detection failed, check if we can detect from the url keywords
         if not (is_image or is_video or is_audio):
-            if 'image' in url.lower():
+            if 'image' in url_lower:
                 is_image = True
                 file_ext = '.jpg'
-            elif 'video' in url.lower():
+            elif 'video' in url_lower:
                 is_video = True
                 file_ext = '.mp4'
 
@@ -2626,44 +3122,170 @@ class EricWebFileScraper:
             reason = "Unsupported file type"
             if is_image and not download_images: reason = "Image download disabled"
             if is_video and not download_videos: reason = "Video download disabled"
-            return None, None, None, None, None, f"Skipped ({reason}): {url}"
+            return None, None, None, None, f"Skipped ({reason}): {url}"
 
         # Get item dict for additional metadata (page_url, qualities, etc.)
         item = url_or_dict if isinstance(url_or_dict, dict) else {}
+        return url, item, file_type, file_ext, None
+
+    def _download_headers(self, url, item):
+        """Builds the request headers for downloading a media URL."""
+        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+        
+        # Add Referer header for Wix videos (required to avoid 403)
+        page_url = item.get('page_url', '')
+        if 'wixstatic.com' in url:
+            if page_url:
+                headers['Referer'] = page_url
+                headers['Origin'] = '/'.join(page_url.split('/')[:3])  # Extract origin
+            else:
+                # Try to construct a reasonable referer from the URL
+                headers['Referer'] = 'https://www.wix.com/'
+        return headers
+
+    def _wix_fallback_urls(self, url, item):
+        """Returns (quality, url) pairs to retry when a Wix video URL is refused."""
+        qualities = item.get('qualities', {})
+        original_url = item.get('original_url', '')
+        
+        # Try fallback qualities: 720p, 480p, then original
+        fallback_urls = []
+        if qualities:
+            for q in ['720p', '480p', '360p']:
+                if q in qualities and qualities[q] != url:
+                    fallback_urls.append((q, qualities[q]))
+        if original_url and original_url != url:
+            fallback_urls.append(('original', original_url))
+        return fallback_urls
+
+    def _content_type_mismatch(self, file_type, content_type, url):
+        """Returns a skip reason if the response Content-Type doesn't match the expected file type."""
+        # Further check content type if extension was ambiguous
+        if file_type in ('image', 'video', 'audio') and not content_type.startswith(f"{file_type}/"):
+            return f"Skipped (Content-Type not {file_type}: {content_type}): {url}"
+        return None
+
+    def _download_filepath(self, url, output_path, index, prefix, file_ext):
+        """Generates the (filename, filepath) pair a downloaded URL is saved under."""
+        # Use hash of URL for more uniqueness, fallback to index
+        try:
+            url_hash = hashlib.sha1(url.encode()).hexdigest()[:10]
+            filename = f"{prefix}{url_hash}{file_ext}"
+        except Exception:
+            filename = f"{prefix}{index:04d}{file_ext}"
+        return filename, os.path.join(output_path, filename)
+
+    def _save_image_content(self, content, url, filepath, filename, min_width, min_height, hash_algo):
+        """Checks dimensions, hashes and saves downloaded image bytes. Returns the download result tuple."""
+        file_type = 'image'
+
+        # Byte-identical mirrors are the common duplicate case; catch them by SHA1 before paying for PIL + imagehash
+        digest = hashlib.sha1(content).digest()
+        with self._sha1_lock:
+            existing_path = self._sha1_index.get(digest)
+            # A pending claim counts as saved: its file may not exist yet while the owner decodes it
+            if existing_path and existing_path != filepath and (digest in self._sha1_pending or os.path.exists(existing_path)):
+                print(f"  Exact duplicate of {os.path.basename(existing_path)}: {url}")
+                existing_name = os.path.basename(existing_path)
+                if self._duplicates_folder:
+                    # Same treatment as perceptual duplicates: keep a copy in _duplicates instead of dropping it
+                    move_path = os.path.join(self._duplicates_folder, filename)
+                    try:
+                        with open(move_path, 'wb') as f:
+                            f.write(content)
+                        print(f"  Moved new duplicate to: {move_path}")
+                        return None, file_type, 0, 0, None, f"Moved (Exact duplicate of {existing_name})"
+                    except OSError as move_err:
+                        print(f"  Error writing duplicate {move_path}: {move_err}. Skipping instead.")
+                return None, file_type, 0, 0, None, f"Skipped (Exact duplicate of {existing_name})"
+            # Claim the digest so a concurrent worker with the same bytes skips instead of racing us
+            self._sha1_index[digest] = filepath
+            self._sha1_pending.add(digest)
+
+        try:
+            # Create BytesIO object with proper closure
+            img_data = BytesIO(content)
+            try:
+                with Image.open(img_data) as img:
+                    width, height = img.size
+                    print(f"Checking image: {url} ({width}x{height}), min: {min_width}x{min_height}")
+                    # Check dimensions first before further processing
+                    if (min_width > 0 and width < min_width) or \
+                    (min_height > 0 and height < min_height):
+                        self._release_sha1(digest, filepath)
+                        return None, file_type, width, height, None, f"Skipped (Too small: {width}x{height})"
+
+                    # Calculate hash if library available and algo selected
+                    file_hash = None
+                    if IMAGEHASH_AVAILABLE and hash_algo != 'none':
+                        hash_func = getattr(imagehash, hash_algo, None)
+                        if hash_func:
+                            file_hash = hash_func(img)
+                        else:
+                            print(f"  Warning: Unknown hash algorithm '{hash_algo}'. Skipping hash.")
+                    
+                    # Save the image file immediately after processing
+                    with open(filepath, 'wb') as f:
+                        f.write(content)
+                    with self._sha1_lock:
+                        self._sha1_pending.discard(digest)
+                    print(f"  Saved image: {filename} ({width}x{height})")
+                    
+                    # Return successful result
+                    return filepath, file_type, width, height, file_hash, None
+
+            finally:
+                # Ensure BytesIO is closed
+                img_data.close()
+                
+        except Exception as img_err:
+            # Clean up potentially partially saved file on image error
+            self._release_sha1(digest, filepath)
+            if os.path.exists(filepath): 
+                os.remove(filepath)
+            print(f"  Error processing image: {img_err}")
+            if self.debug_mode:
+                traceback.print_exc()
+            return None, file_type, 0, 0, None, f"Failed (Image processing error: {img_err})"
+
+    def _move_to_duplicates(self, filepath, duplicates_folder):
+        """Moves a file into the duplicates folder and returns its new path."""
+        move_path = os.path.join(duplicates_folder, os.path.basename(filepath))
+        try:
+            # os.replace is a metadata-only rename and, unlike os.rename, overwrites on Windows too
+            os.replace(filepath, move_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # _duplicates lives on another filesystem (e.g. a mount point): copy then delete
+            shutil.move(filepath, move_path)
+        return move_path
+
+    def _release_sha1(self, digest, filepath):
+        """Drops a SHA1 claim made by _save_image_content when the image was not saved."""
+        with self._sha1_lock:
+            if self._sha1_index.get(digest) == filepath:
+                del self._sha1_index[digest]
+                self._sha1_pending.discard(digest)
+
+    def download_file(self, url_or_dict, output_path, index, prefix, min_width, min_height, hash_algo, download_images, download_videos):
+        """Downloads a single file, checks dimensions, calculates hash, and returns details."""
+        url, item, file_type, file_ext, error = self._prepare_download(url_or_dict, download_images, download_videos)
+        if error:
+            return None, None, None, None, None, error
 
         try:
             print(f"  Downloading {file_type}: {url}")
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+            headers = self._download_headers(url, item)
             
-            # Add Referer header for Wix videos (required to avoid 403)
-            page_url = item.get('page_url', '')
-            if 'wixstatic.com' in url:
-                if page_url:
-                    headers['Referer'] = page_url
-                    headers['Origin'] = '/'.join(page_url.split('/')[:3])  # Extract origin
-                else:
-                    # Try to construct a reasonable referer from the URL
-                    headers['Referer'] = 'https://www.wix.com/'
-            
-            response = requests.get(url, stream=True, timeout=30, headers=headers)
+            response = self._http.get(url, stream=True, timeout=30, headers=headers)
             
             # Handle Wix video 403 errors with quality fallback
             if response.status_code == 403 and 'video.wixstatic.com' in url:
-                qualities = item.get('qualities', {})
-                original_url = item.get('original_url', '')
-                
-                # Try fallback qualities: 720p, 480p, then original
-                fallback_urls = []
-                if qualities:
-                    for q in ['720p', '480p', '360p']:
-                        if q in qualities and qualities[q] != url:
-                            fallback_urls.append((q, qualities[q]))
-                if original_url and original_url != url:
-                    fallback_urls.append(('original', original_url))
-                
-                for quality, fallback_url in fallback_urls:
+                for quality, fallback_url in self._wix_fallback_urls(url, item):
                     print(f"  Trying {quality} fallback: {fallback_url}")
-                    response = requests.get(fallback_url, stream=True, timeout=30, headers=headers)
+                    response.close()  # Hand the connection back to the pool before retrying
+                    response = self._http.get(fallback_url, stream=True, timeout=30, headers=headers)
                     if response.status_code == 200:
                         url = fallback_url  # Update URL for filename generation
                         print(f"  Success with {quality} quality")
@@ -2680,79 +3302,25 @@ class EricWebFileScraper:
 
 
             content_type = response.headers.get('content-type', '').lower()
-            # Further check content type if extension was ambiguous
-            if file_type == 'image' and not content_type.startswith('image/'):
-                return None, None, None, None, None, f"Skipped (Content-Type not image: {content_type}): {url}"
-            if file_type == 'video' and not content_type.startswith('video/'):
-                return None, None, None, None, None, f"Skipped (Content-Type not video: {content_type}): {url}"
-            if file_type == 'audio' and not content_type.startswith('audio/'):
-                return None, None, None, None, None, f"Skipped (Content-Type not audio: {content_type}): {url}"
+            mismatch = self._content_type_mismatch(file_type, content_type, url)
+            if mismatch:
+                return None, None, None, None, None, mismatch
 
 
-            # Generate filename
-            # Use hash of URL for more uniqueness, fallback to index
-            try:
-                url_hash = hashlib.sha1(url.encode()).hexdigest()[:10]
-                filename = f"{prefix}{url_hash}{file_ext}"
-            except Exception:
-                filename = f"{prefix}{index:04d}{file_ext}"
-            filepath = os.path.join(output_path, filename)
+            filename, filepath = self._download_filepath(url, output_path, index, prefix, file_ext)
 
             width, height = 0, 0
             file_hash = None
 
             # Process Image
             if file_type == 'image':
-                try:
-                    # Read image content
-                    content = response.content
-                    
-                    # Create BytesIO object with proper closure
-                    img_data = BytesIO(content)
-                    try:
-                        with Image.open(img_data) as img:
-                            width, height = img.size
-                            print(f"Checking image: {url} ({width}x{height}), min: {min_width}x{min_height}")
-                            # Check dimensions first before further processing
-                            if (min_width > 0 and width < min_width) or \
-                            (min_height > 0 and height < min_height):
-                                return None, file_type, width, height, None, f"Skipped (Too small: {width}x{height})"
-
-                            # Calculate hash if library available and algo selected
-                            file_hash = None
-                            if IMAGEHASH_AVAILABLE and hash_algo != 'none':
-                                hash_func = getattr(imagehash, hash_algo, None)
-                                if hash_func:
-                                    file_hash = hash_func(img)
-                                else:
-                                    print(f"  Warning: Unknown hash algorithm '{hash_algo}'. Skipping hash.")
-                            
-                            # Save the image file immediately after processing
-                            with open(filepath, 'wb') as f:
-                                f.write(content)
-                            print(f"  Saved image: {filename} ({width}x{height})")
-                            
-                            # Return successful result
-                            return filepath, file_type, width, height, file_hash, None
-
-                    finally:
-                        # Ensure BytesIO is closed
-                        img_data.close()
-                        
-                except Exception as img_err:
-                    # Clean up potentially partially saved file on image error
-                    if os.path.exists(filepath): 
-                        os.remove(filepath)
-                    print(f"  Error processing image: {img_err}")
-                    if self.debug_mode:
-                        traceback.print_exc()
-                    return None, file_type, 0, 0, None, f"Failed (Image processing error: {img_err})"
+                return self._save_image_content(response.content, url, filepath, filename, min_width, min_height, hash_algo)
 
             # Process Video
             elif file_type == 'video':
                 # Save video file (no dimension check or hashing for videos currently)
                 with open(filepath, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
+                    for chunk in response.iter_content(chunk_size=_STREAM_CHUNK_SIZE):
                         f.write(chunk)
                 print(f"  Saved video: {filename}")
                 # Set width/height to 0 for videos as we don't extract them yet
@@ -2762,7 +3330,7 @@ class EricWebFileScraper:
             elif file_type == 'audio':
                 # same as video – just stream to disk
                 with open(filepath, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
+                    for chunk in response.iter_content(chunk_size=_STREAM_CHUNK_SIZE):
                         f.write(chunk)
                 print(f"  Saved audio: {filename}")
                 # Set width/height to 0 for audio as we don't extract them yet
@@ -2775,6 +3343,83 @@ class EricWebFileScraper:
         except Exception as e:
             return None, file_type, 0, 0, None, f"Failed (Unexpected error: {e})"
 
+    async def _download_file_async(self, session, fetch_slot, hash_executor, url_or_dict, output_path, index, prefix, min_width, min_height, hash_algo, download_images, download_videos):
+        """
+        aiohttp version of download_file used by the parallel download queue. Returns the same tuple.
+
+        The network part runs under fetch_slot; image bytes are decoded and hashed on
+        hash_executor after the slot is released, so the next download overlaps with it.
+        """
+        url, item, file_type, file_ext, error = self._prepare_download(url_or_dict, download_images, download_videos)
+        if error:
+            return None, None, None, None, None, error
+
+        try:
+            async with fetch_slot:
+                print(f"  Downloading {file_type}: {url}")
+                headers = self._download_headers(url, item)
+                timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=30)
+
+                response = await session.get(url, headers=headers, timeout=timeout)
+                try:
+                    # Handle Wix video 403 errors with quality fallback
+                    if response.status == 403 and 'video.wixstatic.com' in url:
+                        for quality, fallback_url in self._wix_fallback_urls(url, item):
+                            print(f"  Trying {quality} fallback: {fallback_url}")
+                            response.release()
+                            response = await session.get(fallback_url, headers=headers, timeout=timeout)
+                            if response.status == 200:
+                                url = fallback_url  # Update URL for filename generation
+                                print(f"  Success with {quality} quality")
+                                break
+                        else:
+                            # All fallbacks failed
+                            print(f"HTTP error {response.status} for {url} (all quality fallbacks failed)")
+                            return None, None, None, None, None, f"HTTP error {response.status}"
+                    elif response.status != 200:
+                        print(f"HTTP error {response.status} for {url}")
+                        return None, None, None, None, None, f"HTTP error {response.status}"
+
+                    content_type = response.headers.get('content-type', '').lower()
+                    mismatch = self._content_type_mismatch(file_type, content_type, url)
+                    if mismatch:
+                        return None, None, None, None, None, mismatch
+
+                    filename, filepath = self._download_filepath(url, output_path, index, prefix, file_ext)
+
+                    if file_type != 'image':
+                        # Videos and audio are streamed to disk (no dimension check or hashing)
+                        # Large chunks keep per-worker memory bounded; writes go to a thread so
+                        # disk stalls don't block the other downloads on the event loop
+                        loop = asyncio.get_running_loop()
+                        try:
+                            with open(filepath, 'wb') as f:
+                                async for chunk in response.content.iter_chunked(_STREAM_CHUNK_SIZE):
+                                    await loop.run_in_executor(None, f.write, chunk)
+                        except asyncio.CancelledError:
+                            # Don't leave a truncated file behind when the download is cancelled
+                            if os.path.exists(filepath):
+                                os.remove(filepath)
+                            raise
+                        print(f"  Saved {file_type}: {filename}")
+                        return filepath, file_type, 0, 0, None, None # Success
+
+                    content = await response.read()
+                finally:
+                    response.release()
+
+            # PIL decoding and perceptual hashing are CPU-bound, keep them off the event loop
+            return await asyncio.get_running_loop().run_in_executor(
+                hash_executor, self._save_image_content, content, url, filepath, filename, min_width, min_height, hash_algo
+            )
+
+        except aiohttp.ClientError as req_err:
+            return None, file_type, 0, 0, None, f"Failed (Download error: {req_err})"
+        except asyncio.TimeoutError:
+            return None, file_type, 0, 0, None, "Failed (Download error: timed out)"
+        except Exception as e:
+            return None, file_type, 0, 0, None, f"Failed (Unexpected error: {e})"
+
 
     def create_output_directory(self, base_dir, url, use_url_folder, handler=None):
         """Creates the output directory structure."""
@@ -2796,11 +3441,11 @@ class EricWebFileScraper:
                  # Fallback to domain/URL logic
                  parsed_url = urlparse(url)
                  domain = parsed_url.netloc
-                 sanitized_domain = handler._sanitize_directory_name(domain) if handler else re.sub(r'[<>:"/\\|?*]', '_', domain)
+                 sanitized_domain = handler._sanitize_directory_name(domain) if handler else domain.translate(_FS_BAD_TABLE)
                  if use_url_folder:
                      # Create a folder name from the URL path + query
-                     path_part = parsed_url.path.strip('/') + ('_' + parsed_url.query if parsed_url.query else '')
-                     sanitized_path = handler._sanitize_directory_name(path_part)[:50] if handler else re.sub(r'[<>:"/\\|?*]', '_', path_part)[:50]
+                     path_part = f"{parsed_url.path.strip('/')}_{parsed_url.query}" if parsed_url.query else parsed_url.path.strip('/')
+                     sanitized_path = handler._sanitize_directory_name(path_part)[:50] if handler else path_part.translate(_FS_BAD_TABLE)[:50]
                      dir_name_part = os.path.join(sanitized_domain, sanitized_path if sanitized_path else "root")
                  else:
                      dir_name_part = sanitized_domain
@@ -2809,10 +3454,10 @@ class EricWebFileScraper:
              # Fallback if no handler (shouldn't happen with Generic handler)
              parsed_url = urlparse(url)
              domain = parsed_url.netloc
-             sanitized_domain = re.sub(r'[<>:"/\\|?*]', '_', domain)
+             sanitized_domain = domain.translate(_FS_BAD_TABLE)
              if use_url_folder:
-                 path_part = parsed_url.path.strip('/') + ('_' + parsed_url.query if parsed_url.query else '')
-                 sanitized_path = re.sub(r'[<>:"/\\|?*]', '_', path_part)[:50]
+                 path_part = f"{parsed_url.path.strip('/')}_{parsed_url.query}" if parsed_url.query else parsed_url.path.strip('/')
+                 sanitized_path = path_part.translate(_FS_BAD_TABLE)[:50]
                  dir_name_part = os.path.join(sanitized_domain, sanitized_path if sanitized_path else "root")
              else:
                  dir_name_part = sanitized_domain
@@ -2844,7 +3489,7 @@ class EricWebFileScraper:
         image_cache = {}
 
         if os.path.exists(metadata_filepath):
-            print(f"Found previous metadata file: {metadata_filepath}")
+            logger.info("Found previous metadata file: %s", metadata_filepath)
             try:
                 with open(metadata_filepath, 'r', encoding='utf-8') as f:
                     data = json.load(f)
@@ -2852,7 +3497,7 @@ class EricWebFileScraper:
                     if isinstance(data, list):
                          loaded_files_data = data
                          stats["files_loaded_from_metadata"] = len(loaded_files_data)
-                         print(f"Loaded {len(loaded_files_data)} file records from previous run.")
+                         logger.info("Loaded %d file records from previous run.", len(loaded_files_data))
 
                          # Rebuild image hash cache from loaded data
                          if IMAGEHASH_AVAILABLE:
@@ -2870,19 +3515,19 @@ class EricWebFileScraper:
                                                  'url': item.get('url')
                                              }
                                          else:
-                                             print(f"  Warning: File {item['filename']} from metadata not found. Skipping cache entry.")
+                                             self._log_debug("  Warning: File %s from metadata not found. Skipping cache entry.", item['filename'])
                                      except Exception as cache_err:
-                                         print(f"  Error rebuilding cache for {item.get('filename')}: {cache_err}")
-                             print(f"Rebuilt image hash cache with {len(image_cache)} entries.")
+                                         logger.warning("  Error rebuilding cache for %s: %s", item.get('filename'), cache_err)
+                             logger.info("Rebuilt image hash cache with %d entries.", len(image_cache))
 
                     else:
-                         print("  Metadata file has unexpected format. Ignoring.")
+                         logger.warning("  Metadata file has unexpected format. Ignoring.")
             except json.JSONDecodeError:
-                print("  Error decoding metadata file. Ignoring.")
+                logger.warning("  Error decoding metadata file. Ignoring.")
             except Exception as e:
-                print(f"  Error loading metadata file: {e}")
+                logger.warning("  Error loading metadata file: %s", e)
         else:
-            print("No previous metadata file found to continue from.")
+            logger.info("No previous metadata file found to continue from.")
 
         return output_path, loaded_files_data, image_cache, stats
 
@@ -2891,15 +3536,15 @@ class EricWebFileScraper:
         """Saves the overall metadata for the run."""
         metadata_filepath = os.path.join(output_path, self.metadata_file)
         try:
-            # Ensure filepaths in metadata are relative to output_path for portability
+            # Ensure filepaths in metadata are relative to output_path for portability.
+            # Download records already carry 'filename', so only the full path is dropped.
             relative_files_data = []
             for item in files_data:
-                 new_item = item.copy()
-                 # Keep only filename, not full path
-                 if 'filepath' in new_item:
-                     new_item['filename'] = os.path.basename(new_item['filepath'])
-                     del new_item['filepath']
-                 relative_files_data.append(new_item)
+                 record = {k: v for k, v in item.items() if k != 'filepath'}
+                 if 'filename' not in record and 'filepath' in item:
+                     # Legacy record without a filename: derive it on the copy, not the caller's dict
+                     record['filename'] = os.path.basename(item['filepath'])
+                 relative_files_data.append(record)
 
             with open(metadata_filepath, 'w', encoding='utf-8') as f:
                 json.dump(relative_files_data, f, indent=4, ensure_ascii=False)
@@ -2923,41 +3568,41 @@ class EricWebFileScraper:
         elif fixed_times > 0:
             await self._scroll_down_fixed(page, fixed_times, delay_ms)
         else:
-            print("Scrolling disabled.")
+            self._log_debug("Scrolling disabled.")
 
         # --- Custom Interactions ---
         interaction_json = kwargs.get('interaction_sequence', "")
         if interaction_json:
             try:
-                interactions = json.loads(interaction_json)
+                interactions = _parse_interactions(interaction_json)
                 if not isinstance(interactions, list):
                     raise ValueError("Interaction sequence must be a JSON list.")
 
-                print(f"Performing {len(interactions)} custom interactions...")
+                logger.info("Performing %d custom interactions...", len(interactions))
                 for i, action in enumerate(interactions):
                     action_type = action.get('type', '').lower()
                     selector = action.get('selector')
                     value = action.get('value')
                     delay = action.get('delay_ms', 100)
 
-                    print(f"  Action {i+1}: Type='{action_type}', Selector='{selector}'")
+                    self._log_debug("  Action %d: Type='%s', Selector='%s'", i + 1, action_type, selector)
 
                     if not selector:
-                        print("    Skipping: Missing selector.")
+                        self._log_debug("    Skipping: Missing selector.")
                         continue
 
                     element = page.locator(selector).first
 
                     is_visible = await element.is_visible(timeout=5000)
                     if not is_visible:
-                        print(f"    Skipping: Element '{selector}' not visible.")
+                        self._log_debug("    Skipping: Element '%s' not visible.", selector)
                         continue
 
                     if action_type == 'click':
                         await element.click()
                     elif action_type == 'fill':
                         if value is None:
-                            print("    Skipping fill: Missing 'value'.")
+                            self._log_debug("    Skipping fill: Missing 'value'.")
                             continue
                         await element.fill(value)
                     elif action_type == 'check':
@@ -2966,21 +3611,20 @@ class EricWebFileScraper:
                         await element.uncheck()
                     elif action_type == 'select':
                         if value is None:
-                            print("    Skipping select: Missing 'value'.")
+                            self._log_debug("    Skipping select: Missing 'value'.")
                             continue
                         await element.select_option(value)
                     else:
-                        print(f"    Skipping: Unknown action type '{action_type}'.")
+                        self._log_debug("    Skipping: Unknown action type '%s'.", action_type)
                         continue
 
-                    print(f"    Action '{action_type}' performed. Waiting {delay}ms.")
+                    self._log_debug("    Action '%s' performed. Waiting %sms.", action_type, delay)
                     await page.wait_for_timeout(delay)
 
             except json.JSONDecodeError:
-                print(f"Error: Invalid JSON in interaction sequence: {interaction_json}")
+                logger.error("Error: Invalid JSON in interaction sequence: %s", interaction_json)
             except Exception as e:
-                print(f"Error performing custom interactions: {e}")
-                traceback.print_exc()
+                logger.error("Error performing custom interactions: %s", e, exc_info=self.debug_mode)
 
     async def take_screenshots(self, page: AsyncPage, output_path: str, elements_selector: str, full_page: bool, stats: dict):
         """Takes screenshots of the page or specific elements (async version)."""
@@ -3013,7 +3657,8 @@ class EricWebFileScraper:
 
         except Exception as e:
             print(f"Error taking screenshots: {e}")
-            traceback.print_exc()
+            if self.debug_mode:
+                traceback.print_exc()
 
 
     async def authenticate_with_site(self, page: AsyncPage, url: str, auth_config: dict, save_cookies: bool, output_path: str):
@@ -3026,11 +3671,11 @@ class EricWebFileScraper:
         if not site_config:
             return
 
-        print(f"Attempting authentication for domain: {domain}")
+        logger.info("Attempting authentication for domain: %s", domain)
         
         # --- STRATEGY 0: Try to use existing session ---
         if hasattr(self, 'session_manager') and self.session_manager.has_valid_session(domain):
-            print(f"Found valid stored session for {domain}, attempting to use it...")
+            logger.info("Found valid stored session for %s, attempting to use it...", domain)
             try:
                 current_context = page.context
                 current_browser = current_context.browser
@@ -3057,18 +3702,18 @@ class EricWebFileScraper:
                     is_logged_in = await self._verify_login_success(new_page, site_config)
                     
                     if is_logged_in:
-                        print(f"Successfully used stored session for {domain}")
+                        logger.info("Successfully used stored session for %s", domain)
                         
                         # Clean up old context
                         try:
                             if current_context and current_context != new_context:
                                 await current_context.close()
                         except Exception as e:
-                            print(f"Warning: Error closing old context: {e}")
+                            logger.warning("Warning: Error closing old context: %s", e)
                             
                         return  # Success!
                     else:
-                        print(f"Stored session for {domain} is no longer valid")
+                        logger.info("Stored session for %s is no longer valid", domain)
                         # Delete the invalid session
                         self.session_manager.delete_session(domain)
                         
@@ -3096,7 +3741,7 @@ class EricWebFileScraper:
                         await page.goto(url, timeout=60000, wait_until="domcontentloaded")
                 
             except Exception as e:
-                print(f"Error using stored session: {e}")
+                logger.warning("Error using stored session: %s", e)
         
         # --- Strategy 1: Load Cookies ---
         cookie_file = site_config.get('cookie_file')
@@ -3104,13 +3749,28 @@ class EricWebFileScraper:
         if cookie_file:
             cookie_path = os.path.join(output_path, cookie_file) if not os.path.isabs(cookie_file) else cookie_file
 
+        cookie_state = None
         if cookie_path and os.path.exists(cookie_path):
             try:
-                print(f"Loading cookies from: {cookie_path}")
+                # Re-read only when the file changes, so an updated cookie export is picked up
+                mtime_ns = os.stat(cookie_path).st_mtime_ns
+                cached = self._cookie_state_cache.get(cookie_path)
+                if cached and cached[0] == mtime_ns:
+                    cookie_state = cached[1]
+                else:
+                    cookie_state = _json_load_file(cookie_path)
+                    self._cookie_state_cache[cookie_path] = (mtime_ns, cookie_state)
+            except Exception as e:
+                logger.warning("Error reading cookie file %s: %s", cookie_path, e)
+
+        if cookie_state is not None:
+            try:
+                logger.info("Loading cookies from: %s", cookie_path)
                 current_context = page.context
                 current_browser = current_context.browser
                 
-                new_context = await current_browser.new_context(storage_state=cookie_path)
+                # Pass the parsed dict so Playwright doesn't re-read the file per URL
+                new_context = await current_browser.new_context(storage_state=cookie_state)
                 new_page = await new_context.new_page()
                 
                 pw_instance, _, _, _, user_data_dir = self.pw_resources        # unpack 5 items
@@ -3126,18 +3786,18 @@ class EricWebFileScraper:
                     if current_context and current_context != new_context:
                         await current_context.close()
                 except Exception as e:
-                    print(f"Warning: Error closing old context: {e}")
+                    logger.warning("Warning: Error closing old context: %s", e)
                 
                 await new_page.goto(url, timeout=60000, wait_until="domcontentloaded")
                 return
                 
             except Exception as e:
-                print(f"Error loading cookies: {e}")
+                logger.warning("Error loading cookies: %s", e)
 
         # --- Strategy 2: Perform Login Steps ---
         login_steps = site_config.get('login_steps')
         if isinstance(login_steps, list):
-            print("Performing login steps...")
+            logger.info("Performing login steps...")
             try:
                 for i, step in enumerate(login_steps):
                     step_type = step.get('type', '').lower()
@@ -3145,10 +3805,10 @@ class EricWebFileScraper:
                     value = step.get('value')
                     delay = step.get('delay_ms', 200)
 
-                    print(f"  Login Step {i+1}: Type='{step_type}', Selector='{selector}'")
+                    self._log_debug("  Login Step %d: Type='%s', Selector='%s'", i + 1, step_type, selector)
 
                     if not selector:
-                        print("    Skipping: Missing selector.")
+                        self._log_debug("    Skipping: Missing selector.")
                         continue
 
                     element = page.locator(selector).first
@@ -3158,7 +3818,7 @@ class EricWebFileScraper:
 
                     if step_type == 'fill':
                         if value is None:
-                            print("    Skipping fill: Missing 'value'.")
+                            self._log_debug("    Skipping fill: Missing 'value'.")
                             continue
                         actual_value = value
                         if '{username}' in value and site_config.get('username'):
@@ -3170,31 +3830,31 @@ class EricWebFileScraper:
                         await element.click()
                     elif step_type == 'wait':
                         wait_time = int(value) if value else delay
-                        print(f"    Waiting for {wait_time}ms...")
+                        self._log_debug("    Waiting for %dms...", wait_time)
                         await page.wait_for_timeout(wait_time)
                         continue
                     else:
-                        print(f"    Skipping: Unknown login step type '{step_type}'.")
+                        self._log_debug("    Skipping: Unknown login step type '%s'.", step_type)
                         continue
 
-                    print(f"    Step '{step_type}' performed. Waiting {delay}ms.")
+                    self._log_debug("    Step '%s' performed. Waiting %sms.", step_type, delay)
                     await page.wait_for_timeout(delay)
 
-                print("Login steps completed.")
+                logger.info("Login steps completed.")
 
                 # Save cookies after successful login steps if requested
                 if save_cookies and output_path:
                     cookie_file_to_save = site_config.get('cookie_file', f"{domain}_cookies.json")
                     save_path = os.path.join(output_path, cookie_file_to_save)
                     try:
-                        await page.context.storage_state(path=save_path)
-                        print(f"Saved session cookies to: {save_path}")
+                        saved_state = await page.context.storage_state(path=save_path)
+                        self._cookie_state_cache[save_path] = (os.stat(save_path).st_mtime_ns, saved_state)
+                        logger.info("Saved session cookies to: %s", save_path)
                     except Exception as e:
-                        print(f"Error saving cookies after login: {e}")
+                        logger.warning("Error saving cookies after login: %s", e)
 
             except Exception as e:
-                print(f"Error during login steps: {e}")
-                traceback.print_exc()
+                logger.error("Error during login steps: %s", e, exc_info=self.debug_mode)
         
         # After successful login, store the session if requested
         if save_cookies and hasattr(self, "session_manager"):
@@ -3209,30 +3869,46 @@ class EricWebFileScraper:
                 '[data-testid="user-menu"]', '.user-profile'
             ])
             
-            for selector in success_selectors:
-                try:
-                    elem = page.locator(selector).first
-                    is_visible = await elem.is_visible(timeout=2000)
-                    if is_visible:
-                        print(f"Login success confirmed with selector: {selector}")
-                        return True
-                except:
-                    continue
-            
             login_form_selectors = site_config.get('login_form_selectors', [
                 'form[action*="login"]', 'button:has-text("Log in")',
                 'button:has-text("Sign in")', 'a:has-text("Log in")'
             ])
-            
-            for selector in login_form_selectors:
+
+            # Check every selector's visibility in a single round-trip. Selectors the
+            # DOM can't parse (Playwright extensions like :has-text) come back as null
+            # and are checked individually through a locator below.
+            all_selectors = list(success_selectors) + list(login_form_selectors)
+            try:
+                visibility = await page.evaluate("""(sels) => sels.map(s => {
+                    let el;
+                    try { el = document.querySelector(s); } catch (e) { return null; }
+                    if (!el) return false;
+                    const r = el.getBoundingClientRect();
+                    return r.width > 0 && r.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+                })""", all_selectors)
+            except Exception:
+                visibility = [None] * len(all_selectors)
+
+            async def _is_visible(selector, batched_result):
+                if batched_result is not None:
+                    return batched_result
                 try:
-                    elem = page.locator(selector).first
-                    is_visible = await elem.is_visible(timeout=2000)
-                    if is_visible:
-                        return False
+                    return await page.locator(selector).first.is_visible(timeout=2000)
                 except:
-                    continue
-            
+                    return False
+
+            success_results = visibility[:len(success_selectors)]
+            form_results = visibility[len(success_selectors):]
+
+            for selector, batched_result in zip(success_selectors, success_results):
+                if await _is_visible(selector, batched_result):
+                    print(f"Login success confirmed with selector: {selector}")
+                    return True
+
+            for selector, batched_result in zip(login_form_selectors, form_results):
+                if await _is_visible(selector, batched_result):
+                    return False
+
             return True
             
         except Exception as e:
@@ -3270,8 +3946,21 @@ class EricWebFileScraper:
                 os.path.join(os.path.dirname(os.path.dirname(__file__)), "configs", "auth_config.json")
             ]
             
+            # Several candidates share a parent directory, so list each directory
+            # once and match by filename instead of stat'ing every path.
+            dir_listings = {}
             for path in possible_paths:
-                if os.path.exists(path):
+                dir_name, file_name = os.path.split(os.path.normpath(path))
+                if dir_name not in dir_listings:
+                    try:
+                        with os.scandir(dir_name) as entries:
+                            dir_listings[dir_name] = {entry.name for entry in entries if entry.is_file()}
+                    except FileNotFoundError:
+                        dir_listings[dir_name] = set()
+                    except OSError:
+                        dir_listings[dir_name] = None  # Unlistable, fall back to a direct check
+                names = dir_listings[dir_name]
+                if (file_name in names) if names is not None else os.path.exists(path):
                     config_file_path = path
                     print(f"Using auth config path: {config_file_path}")
                     break
@@ -3333,7 +4022,7 @@ class EricWebFileScraper:
         if not page: 
             return
         
-        print(f"Starting enhanced auto-scroll: max_scrolls={max_scrolls}, delay={delay_ms}ms")
+        logger.info("Starting enhanced auto-scroll: max_scrolls=%d, delay=%dms", max_scrolls, delay_ms)
         scroll_count = 0
         last_height = -1
         last_content_count = 0  # Initialize here
@@ -3353,7 +4042,7 @@ class EricWebFileScraper:
                 if current_height == last_height and current_content_count == last_content_count:
                     consecutive_no_change += 1
                     if consecutive_no_change >= no_change_threshold:
-                        print("  Stopping auto-scroll: Page content stable.")
+                        self._log_debug("  Stopping auto-scroll: Page content stable.")
                         
                         # Try to click "Load More" buttons before giving up
                         try:
@@ -3363,14 +4052,14 @@ class EricWebFileScraper:
                             
                             is_visible = await load_more.is_visible(timeout=1000)
                             if is_visible:
-                                print("  Found load more button, clicking...")
+                                self._log_debug("  Found load more button, clicking...")
                                 await load_more.click()
                                 await page.wait_for_timeout(delay_ms * 2)
                                 
                                 # Check if clicking worked
                                 new_content_count = await page.locator(content_selector).count()
                                 if new_content_count > current_content_count:
-                                    print(f"  Load more added {new_content_count - current_content_count} items")
+                                    self._log_debug("  Load more added %d items", new_content_count - current_content_count)
                                     consecutive_no_change = 0
                                     last_content_count = new_content_count
                                     continue
@@ -3397,110 +4086,35 @@ class EricWebFileScraper:
                     await self._ensure_lazy_images_loaded(page)
                 
             except Exception as scroll_err:
-                print(f"  Error during auto-scroll: {scroll_err}")
+                logger.warning("  Error during auto-scroll: %s", scroll_err)
                 break
         
-        print(f"Finished auto-scroll after {scroll_count} scrolls. Found {last_content_count} content elements.")
+        logger.info("Finished auto-scroll after %d scrolls. Found %d content elements.", scroll_count, last_content_count)
 
     async def _ensure_lazy_images_loaded(self, page: "AsyncPage"):
         """
         Ensures lazy-loaded images with various data-* attributes are swapped in.
         """
         try:
-            lazy_img_count = await page.evaluate("""
-                () => {
-                    const lazyImgs = document.querySelectorAll('img[data-src], img[data-lazy], img[loading="lazy"], img[data-original], img[data-srcset]');
-                    let count = 0;
-                    lazyImgs.forEach(img => {
-                        // Try all possible lazy attributes
-                        const dataSrc = img.getAttribute('data-src') || img.getAttribute('data-lazy') || img.getAttribute('data-original');
-                        if (dataSrc && (!img.src || img.src.includes('placeholder'))) {
-                            img.src = dataSrc;
-                            count++;
-                        }
-                        // Handle data-srcset
-                        const dataSrcset = img.getAttribute('data-srcset');
-                        if (dataSrcset && !img.srcset) {
-                            img.srcset = dataSrcset;
-                            count++;
-                        }
-                    });
-                    return count;
-                }
-            """)
+            lazy_img_count = await page.evaluate(_JS_LOAD_LAZY_IMAGES)
             if lazy_img_count > 0 and self.debug_mode:
                 print(f"  Helped load {lazy_img_count} lazy images")
         except Exception as e:
             if self.debug_mode:
                 print(f"  Error ensuring images loaded: {e}")
-    def _detect_and_handle_content_blocker(self, page):
-        """Detect and handle common content blockers like cookie notices and modals."""
-        try:
-            # Common cookie consent selectors
-            cookie_selectors = [
-                "button:has-text('Accept')", 
-                "button:has-text('Accept All')",
-                "button:has-text('I Accept')",
-                "button:has-text('Agree')",
-                "[aria-label='Accept cookies']",
-                ".cookie-accept",
-                ".consent-accept"
-            ]
-            
-            # Try each selector
-            for selector in cookie_selectors:
-                button = page.locator(selector).first
-                if button.is_visible(timeout=1000):
-                    print(f"  Found cookie consent button: {selector}, clicking...")
-                    button.click()
-                    page.wait_for_timeout(1000)
-                    return True
-                    
-            # Check for modal overlays
-            modal_selectors = [
-                ".modal button:has-text('Close')",
-                "[aria-label='Close modal']",
-                ".modal-close",
-                ".close-button"
-            ]
-            
-            for selector in modal_selectors:
-                button = page.locator(selector).first
-                if button.is_visible(timeout=1000):
-                    print(f"  Found modal close button: {selector}, clicking...")
-                    button.click()
-                    page.wait_for_timeout(1000)
-                    return True
-                    
-            return False
-        except Exception as e:
-            print(f"Error handling content blockers: {e}")
-            return False
 
     def _extract_links_from_page(self, page, current_url, required_domain=None):
         """Extract links from a page, optionally filtering by domain."""
         try:
             # Run JavaScript to extract all links
-            links = page.evaluate("""() => {
-                const uniqueLinks = new Set();
-                
-                // Get links from <a> tags
-                document.querySelectorAll('a[href]').forEach(a => {
-                    if (a.href && a.href.startsWith('http')) {
-                        uniqueLinks.add(a.href);
-                    }
-                });
-                
-                return Array.from(uniqueLinks);
-            }""")
+            links = page.evaluate(_JS_EXTRACT_LINKS)
             
             # Filter links if required_domain is specified
             if required_domain:
                 filtered_links = []
                 for link in links:
                     try:
-                        link_domain = urlparse(link).netloc
-                        if link_domain == required_domain:
+                        if _netloc(link) == required_domain:
                             filtered_links.append(link)
                     except:
                         continue
@@ -3510,14 +4124,7 @@ class EricWebFileScraper:
             filtered_links = []
             for link in links:
                 # Skip URLs that are unlikely to contain media content
-                if any(pattern in link.lower() for pattern in [
-                    '/login', '/signup', '/signin', '/register', 
-                    '/terms', '/privacy', '/about', '/contact',
-                    '/help', '/faq', '/support', '/legal',
-                    '/settings', '/account', '/profile',
-                    'javascript:', 'mailto:', 'tel:', '/tag/',
-                    '/category/', '/search?', '/logout', '/password'
-                ]):
+                if _NON_CONTENT_LINK_RE.search(link):
                     continue
                     
                 # Make sure the link isn't the current URL
@@ -3528,189 +4135,22 @@ class EricWebFileScraper:
         except Exception as e:
             print(f"Error extracting links: {e}")
             return []
-    def _extract_media_metadata(self, page, element_locator):
-        """
-        Extract rich metadata for a media element.
+
+    def _rate_limit_delay(self, domain):
+        """Returns the minimum delay in seconds between requests to a domain."""
+        # Default delay of 2 seconds between requests to same domain
+        default_delay = 2.0  
         
-        Args:
-            page: Playwright page
-            element_locator: Locator for the media element
-            
-        Returns:
-            Dictionary of metadata
-        """
-        metadata = {}
-        
-        try:
-            # Get element attributes
-            alt = element_locator.get_attribute("alt") or ""
-            title_attr = element_locator.get_attribute("title") or ""
-            aria_label = element_locator.get_attribute("aria-label") or ""
-            
-            # Basic metadata
-            metadata["alt"] = alt
-            metadata["title_attr"] = title_attr
-            metadata["aria_label"] = aria_label
-            
-            # Look for parent containers with more metadata
-            try:
-                # Check for figure/figcaption pattern
-                figure = element_locator.locator("xpath=ancestor::figure[1]").first
-                if figure.is_visible(timeout=500):
-                    figcaption = figure.locator("figcaption").first
-                    if figcaption.is_visible(timeout=500):
-                        metadata["caption"] = figcaption.inner_text().strip()
-                    
-                    # Look for credit elements
-                    credit_elem = figure.locator(".credit, .author, .byline, [rel='author']").first
-                    if credit_elem.is_visible(timeout=500):
-                        metadata["credits"] = credit_elem.inner_text().strip()
-            except Exception:
-                pass
-                
-            # Try to find a heading/title near the element
-            try:
-                # Look upward for heading
-                parent_container = element_locator.locator("xpath=ancestor::div[position() <= 3]").first
-                if parent_container.is_visible(timeout=500):
-                    heading = parent_container.locator("h1, h2, h3, .title").first
-                    if heading.is_visible(timeout=500):
-                        metadata["heading"] = heading.inner_text().strip()
-            except Exception:
-                pass
-                
-            # Create a final title from the best available information
-            title_candidates = [
-                metadata.get("caption", ""),
-                metadata.get("heading", ""),
-                metadata.get("aria_label", ""),
-                metadata.get("alt", ""),
-                metadata.get("title_attr", "")
-            ]
-            
-            metadata["final_title"] = next((t for t in title_candidates if t), "Untitled")
-            
-            return metadata
-            
-        except Exception as e:
-            print(f"Error extracting metadata: {e}")
-            return {
-                "final_title": "Untitled",
-                "alt": alt if 'alt' in locals() else ""
-            }
-
-    def _extract_video_sources(self, page, video_element):
-        """
-        Extract all available video sources from a video element.
-        
-        Args:
-            page: Playwright page
-            video_element: Locator for the video element
-            
-        Returns:
-            List of video source URLs
-        """
-        sources = []
+        # Domain-specific delays (add more as needed)
+        domain_delays = {
+            'reddit.com': 3.0,
+            'artstation.com': 2.5,
+            'behance.net': 2.0
+        }
         
-        try:
-            # Get direct src attribute
-            src = video_element.get_attribute("src")
-            if src and not src.startswith('data:'):
-                sources.append(src)
-                
-            # Get source elements inside the video
-            source_locator = video_element.locator("source")
-            for i in range(source_locator.count()):
-                source = source_locator.nth(i)
-                source_src = source.get_attribute("src")
-                if source_src and not source_src.startswith('data:'):
-                    sources.append(source_src)
-                    
-            # Check for poster attribute (thumbnail)
-            poster = video_element.get_attribute("poster")
-            if poster and not poster.startswith('data:'):
-                sources.append({"thumbnail": poster})
-                
-            # Try to evaluate video.currentSrc which may contain the resolved source
-            try:
-                current_src = page.evaluate("""(video) => {
-                    return video.currentSrc || null;
-                }""", video_element)
-                
-                if current_src and not current_src.startswith('data:'):
-                    sources.append(current_src)
-            except Exception:
-                pass
-                
-            return sources
-                
-        except Exception as e:
-            print(f"Error extracting video sources: {e}")
-            return []
+        # Get appropriate delay
+        return domain_delays.get(domain, default_delay)
 
-# Add to EricWebFileScraper class
-    def _detect_special_content_structure(self, page, url):
-        """
-        Detect and handle special content structures like image galleries, sliders, etc.
-        
-        Args:
-            page: Playwright page
-            url: Page URL
-            
-        Returns:
-            List of extracted media items or None if no special structures detected
-        """
-        try:
-            # Check for common gallery structures
-            gallery_selectors = [
-                ".gallery", ".slider", ".carousel", 
-                "[role='listbox']", "[data-testid='carousel']",
-                ".image-gallery", ".lightbox-gallery"
-            ]
-            
-            for selector in gallery_selectors:
-                gallery = page.locator(selector).first
-                if gallery.is_visible(timeout=1000):
-                    print(f"  Detected gallery structure: {selector}")
-                    
-                    # Extract gallery items
-                    items_locator = gallery.locator("img, .gallery-item, .carousel-item")
-                    items_count = items_locator.count()
-                    
-                    if items_count > 0:
-                        print(f"  Found {items_count} gallery items, extracting...")
-                        
-                        media_items = []
-                        for i in range(items_count):
-                            item = items_locator.nth(i)
-                            if not item.is_visible(timeout=500):
-                                continue
-                                
-                            # Check if it contains an image
-                            img = item.locator("img").first
-                            if img.is_visible(timeout=500):
-                                src = img.get_attribute("src")
-                                if src and not src.startswith('data:'):
-                                    # Get metadata
-                                    metadata = self._extract_media_metadata(page, img)
-                                    
-                                    media_items.append({
-                                        'url': src,
-                                        'alt': metadata.get("alt", ""),
-                                        'title': metadata.get("final_title", "Gallery Image"),
-                                        'credits': metadata.get("credits", ""),
-                                        'source_url': url,
-                                        'type': 'image',
-                                        'category': 'gallery'
-                                    })
-                                    
-                        return media_items
-            
-            return None  # No special structures detected
-            
-        except Exception as e:
-            print(f"Error detecting special content structure: {e}")
-            return None
     def _rate_limit(self, domain):
         """
         Implements domain-specific rate limiting to avoid being blocked.
@@ -3720,22 +4160,11 @@ class EricWebFileScraper:
         if not hasattr(self, 'last_request_times'):
             self.last_request_times = {}
             
-        # Default delay of 2 seconds between requests to same domain
-        default_delay = 2.0  
-        
-        # Domain-specific delays (add more as needed)
-        domain_delays = {
-            'reddit.com': 3.0,
-            'artstation.com': 2.5,
-            'behance.net': 2.0
-        }
-        
-        # Get appropriate delay
-        delay = domain_delays.get(domain, default_delay)
+        delay = self._rate_limit_delay(domain)
         
         # Check if we need to wait
-        current_time = time.time()
-        last_time = self.last_request_times.get(domain, 0)
+        current_time = time.monotonic()
+        last_time = self.last_request_times.get(domain, float('-inf'))
         elapsed = current_time - last_time
         
         if elapsed < delay:
@@ -3745,77 +4174,27 @@ class EricWebFileScraper:
             time.sleep(wait_time)
         
         # Update the last request time
-        self.last_request_times[domain] = time.time()
-    def _analyze_image_quality(self, image_url, min_width, min_height):
+        self.last_request_times[domain] = time.monotonic()
+
+    async def _async_rate_limit(self, domain):
         """
-        Analyze image quality to determine if it should be downloaded.
-        
-        Args:
-            image_url: URL of the image
-            min_width: Minimum width threshold
-            min_height: Minimum height threshold
-            
-        Returns:
-            Tuple of (should_download, reason, metadata)
+        Async counterpart of _rate_limit for the parallel download queue.
+        The next free slot for the domain is reserved before sleeping, so concurrent
+        workers queue up behind each other without blocking the event loop.
         """
-        try:
-            # Send a HEAD request first to check content type
-            head_response = requests.head(image_url, timeout=5)
-            
-            # Check if it's an image
-            content_type = head_response.headers.get('content-type', '')
-            if not content_type.startswith('image/'):
-                return False, f"Not an image (Content-Type: {content_type})", {}
-                
-            # Check content length if available
-            content_length = head_response.headers.get('content-length')
-            if content_length and int(content_length) < 10000:  # Less than 10KB
-                return False, f"Image too small (Size: {content_length} bytes)", {}
-                
-            # Only download full content if we need to check dimensions
-            if min_width > 0 or min_height > 0:
-                response = requests.get(image_url, stream=True, timeout=10)
-                response.raise_for_status()
-                
-                with Image.open(BytesIO(response.content)) as img:
-                    width, height = img.size
-                    
-                    if (min_width > 0 and width < min_width) or (min_height > 0 and height < min_height):
-                        return False, f"Image too small (Dimensions: {width}x{height})", {}
-                        
-                    # Get additional metadata while we have the image open
-                    metadata = {
-                        'width': width,
-                        'height': height,
-                        'format': img.format,
-                        'aspect_ratio': width / height if height > 0 else 0
-                    }
-                    
-                    # Skip likely icons or tiny images
-                    if width < 50 or height < 50:
-                        return False, "Image too small (likely an icon)", metadata
-                    
-                    # Skip transparent/blank images
-                    if 'A' in img.getbands() and self._is_mostly_transparent(img):
-                        return False, "Image mostly transparent", metadata
-                        
-                    return True, "", metadata
-            
-            # If no dimension checks needed, assume it's good
-            return True, "", {}
-            
-        except Exception as e:
-            return False, f"Error analyzing image: {e}", {}
-            
-    def _is_mostly_transparent(self, img):
-        """Check if an image is mostly transparent."""
-        # Extract alpha channel and calculate transparency
-        alpha = img.getchannel('A')
-        transparent_pixels = sum(1 for pixel in alpha.getdata() if pixel < 128)
-        total_pixels = alpha.width * alpha.height
-        
-        # If more than 80% transparent, consider it mostly transparent
-        return transparent_pixels > (total_pixels * 0.8)
+        if not hasattr(self, 'last_request_times'):
+            self.last_request_times = {}
+
+        delay = self._rate_limit_delay(domain)
+        current_time = time.monotonic()
+        scheduled_time = max(current_time, self.last_request_times.get(domain, float('-inf')) + delay)
+        self.last_request_times[domain] = scheduled_time
+
+        wait_time = scheduled_time - current_time
+        if wait_time > 0:
+            if self.debug_mode:
+                print(f"Rate limiting: waiting {wait_time:.2f}s for {domain}")
+            await asyncio.sleep(wait_time)
 
     def save_metadata_file(self, media_filepath, metadata, output_path):
         """Saves a comprehensive .json file alongside the media file."""
@@ -3861,16 +4240,21 @@ class EricWebFileScraper:
 
 
     async def _process_download_queue_parallel(self, media_items_to_process, output_path, stats, **kwargs):
-        """Downloads files from the queue in parallel with improved thread safety."""
-        from concurrent.futures import ThreadPoolExecutor
-        import threading
-        import asyncio
-        
+        """
+        Downloads files from the queue concurrently on the event loop.
+
+        Uses a shared aiohttp session with at most max_workers downloads in flight; image
+        decoding/hashing runs on a separate thread pool so it overlaps the next fetch. All
+        shared state (stats, hash cache, processed URLs) is only touched on the event
+        loop between awaits, so no locking is needed.
+        """
         downloaded_files_data = []
         initial_file_count = kwargs.get('initial_file_count', 0)
         max_files = kwargs.get('max_files', 0)
         downloaded_images_cache = kwargs.get('downloaded_images_cache', {})
-        max_workers = kwargs.get('max_workers', 4)
+        max_workers = kwargs.get('max_workers', DEFAULT_MAX_WORKERS)
+        loop = asyncio.get_running_loop()
+        session = None
         
         # Create duplicates folder if needed
         move_duplicates = kwargs.get('move_duplicates', False)
@@ -3878,86 +4262,75 @@ class EricWebFileScraper:
         if move_duplicates:
             duplicates_folder = os.path.join(output_path, "_duplicates")
             os.makedirs(duplicates_folder, exist_ok=True)
+        self._duplicates_folder = duplicates_folder
         
         total_items = len(media_items_to_process)
         print(f"Processing download queue in parallel: {total_items} items found, using {max_workers} workers")
         print(f"  Note: Files will be saved immediately as they download (progress saved every {self.save_batch_size} files)")
-        
-        # Create a single lock for all synchronized operations
-        global_lock = threading.RLock()  # Reentrant lock to avoid deadlocks
-        
+        base_domain = _netloc(kwargs.get('url', ''))
+        respect_robots_txt = kwargs.get('respect_robots_txt', False)
 
-        def download_worker(item_index, item_data):
-            nonlocal stats, downloaded_images_cache, downloaded_files_data
-            
+        # Set by the worker whose file reaches max_files; queued workers then return at entry
+        max_files_reached = asyncio.Event()
+
+        async def download_worker(item_index, item_data):
             # Check for cancellation first
             if self.cancellation_requested or self._check_cancellation():
                 print(f"\n🛑 Download cancelled by user (worker {item_index})")
                 return None
+
+            # Check max files limit before the URL is claimed, so it stays available to a later run
+            if max_files_reached.is_set():
+                return None
             
             item_url = item_data.get('url')
             if not item_url:
-                with global_lock:
-                    stats["skipped_not_media"] += 1
+                stats["skipped_not_media"] += 1
                 return None
             
             # Debug the URL we're trying to download
             print(f"Attempting to download: {item_url}")
             
-            # Check if already processed - needs synchronization
-            with global_lock:
-                if self.check_url_processed(item_url):
-                    stats["skipped_already_processed"] += 1
-                    return None
-                
-                # Mark as being processed immediately to prevent race condition
-                self.mark_url_processed(item_url)
+            # Check if already processed
+            if self.check_url_processed(item_url):
+                stats["skipped_already_processed"] += 1
+                return None
+            
+            # Mark as being processed immediately so no other worker picks it up
+            self.mark_url_processed(item_url)
                 
-                # Check max files limit under lock
-                current_count = initial_file_count + len(downloaded_files_data)
-                if max_files > 0 and current_count >= max_files:
-                    return None
-                    
-                stats["downloads_attempted"] += 1
+            stats["downloads_attempted"] += 1
             
             # Check domain restrictions - if "same_domain_only" is enabled, check if URL domain matches
             # or is a trusted CDN domain
+            item_domain = _netloc(item_url)
             if kwargs.get('same_domain_only', True):
-                item_domain = urlparse(item_url).netloc
-                base_url = kwargs.get('url', '')
-                base_domain = urlparse(base_url).netloc
-                
-                # Check if this is a trusted CDN URL marked by the handler
-                is_trusted_cdn = item_data.get('trusted_cdn', False)
+                # Same-host items (the common case) skip the CDN checks entirely
+                is_trusted_cdn = item_domain == base_domain or item_data.get('trusted_cdn', False)
                 
                 # Fallback: check common CDN domains directly (handles items from DevTools cache)
                 if not is_trusted_cdn:
-                    cdn_domains = ['tildacdn.com', 'cloudfront.net', 'cloudflare.com', 'akamaized.net', 
-                                   'fastly.net', 'cdn.', 'assets.', 'static.', 'media.', 'images.',
-                                   'photos.modelmayhem.com', 'assets.modelmayhem.com']  # ModelMayhem CDN
-                    is_trusted_cdn = any(cdn in item_domain.lower() for cdn in cdn_domains)
-                    if is_trusted_cdn:
-                        with global_lock:
-                            print(f"  Auto-trusted CDN domain: {item_domain}")
-                
-                # Debug: Show what's happening
-                if item_domain != base_domain:
-                    with global_lock:
-                        print(f"  Domain check: {item_domain} vs {base_domain}, trusted_cdn={is_trusted_cdn}")
+                    is_trusted_cdn = _is_trusted_cdn_domain(item_domain, allow_host_markers=True)
+                    self._log_debug("  Domain check: %s vs %s, trusted_cdn=%s", item_domain, base_domain, is_trusted_cdn)
                 
-                if item_domain != base_domain and not is_trusted_cdn:
-                    with global_lock:
-                        stats["skipped_platform"] += 1
-                        print(f"Skipping off-domain URL: {item_url}")
+                if not is_trusted_cdn:
+                    stats["skipped_platform"] += 1
+                    print(f"Skipping off-domain URL: {item_url}")
                     return None
 
             try:
-                # Rate limit by domain to be polite (doesn't need the lock)
-                domain = urlparse(item_url).netloc
-                self._rate_limit(domain)
+                # Skip URLs the host disallows; robots.txt is fetched once per host in a worker thread
+                if respect_robots_txt:
+                    robots = await loop.run_in_executor(None, _robots_parser, urlparse(item_url).scheme, item_domain)
+                    if robots is not None and not robots.can_fetch("*", item_url):
+                        stats["skipped_robots"] += 1
+                        print(f"Skipping URL disallowed by robots.txt: {item_url}")
+                        return None
+
+                # Rate limit by domain to be polite (sleeps without blocking other workers)
+                await self._async_rate_limit(item_domain)
                 
-                # Download the file (no lock needed for downloading)
-                download_result = self.download_file(
+                download_args = (
                     item_data,
                     output_path,
                     item_index,
@@ -3968,19 +4341,28 @@ class EricWebFileScraper:
                     kwargs.get('download_images', True),
                     kwargs.get('download_videos', True)
                 )
+                if session is not None:
+                    download_result = await self._download_file_async(session, fetch_slots, hash_executor, *download_args)
+                else:
+                    # aiohttp unavailable: run the blocking requests download in a worker thread
+                    async with fetch_slots:
+                        download_result = await loop.run_in_executor(None, self.download_file, *download_args)
                 
                 # Handle download errors
                 if not download_result:
-                    with global_lock:
-                        stats["failed_download"] += 1
-                        print(f"Download failed for {item_url}: No result returned")
+                    stats["failed_download"] += 1
+                    print(f"Download failed for {item_url}: No result returned")
                     return None
                 
                 file_path, file_type, width, height, file_hash, download_error = download_result
                 
                 if download_error:
-                    with global_lock:
-                        print(f"Download error for {item_url}: {download_error}")
+                    print(f"Download error for {item_url}: {download_error}")
+                    if "duplicate" in download_error.lower():
+                        stats["duplicates_removed"] += 1
+                        if download_error.startswith("Moved"):
+                            stats["duplicates_moved"] += 1
+                    else:
                         stats["failed_download"] += 1
                     return None
                     
@@ -3988,295 +4370,296 @@ class EricWebFileScraper:
                 print(f"Successfully downloaded: {item_url} to {file_path}")
                 
                 # Track file immediately for cancellation recovery
-                with global_lock:
-                    self.files_saved_this_session.append(file_path)
-                    
-                    # Save progress periodically (every N files)
-                    if len(self.files_saved_this_session) % self.save_batch_size == 0:
-                        print(f"  💾 Progress saved: {len(self.files_saved_this_session)} files downloaded so far")
+                self.files_saved_this_session.append(file_path)
                 
-                # All operations that modify shared state need locking
-                with global_lock:
-                    # Handle deduplication
-                    is_duplicate = False
-                    duplicate_info = None
-                    
-                    if file_type == 'image' and file_hash and IMAGEHASH_AVAILABLE and kwargs['hash_algorithm'] != 'none':
-                        if file_hash in downloaded_images_cache:
-                            is_duplicate = True
-                            duplicate_info = downloaded_images_cache[file_hash]
-                            stats["duplicates_removed"] += 1
-                        else:
-                            # Add to cache if not duplicate
-                            downloaded_images_cache[file_hash] = {
-                                'filename': os.path.basename(file_path),
-                                'filepath': file_path,
-                                'width': width,
-                                'height': height,
-                                'url': item_url
-                            }
+                # Save progress periodically (every N files)
+                if len(self.files_saved_this_session) % self.save_batch_size == 0:
+                    print(f"  💾 Progress saved: {len(self.files_saved_this_session)} files downloaded so far")
+                
+                # Handle deduplication
+                is_duplicate = False
+                duplicate_info = None
+                
+                if file_type == 'image' and file_hash and IMAGEHASH_AVAILABLE and kwargs['hash_algorithm'] != 'none':
+                    existing_info = downloaded_images_cache.get(file_hash)
+                    # Same path means this URL was re-downloaded over its own earlier file
+                    if existing_info and existing_info['filepath'] != file_path:
+                        is_duplicate = True
+                        duplicate_info = existing_info
+                        stats["duplicates_removed"] += 1
+                    else:
+                        # Add to cache if not duplicate
+                        downloaded_images_cache[file_hash] = {
+                            'filename': os.path.basename(file_path),
+                            'filepath': file_path,
+                            'width': width,
+                            'height': height,
+                            'url': item_url
+                        }
+                
+                # Handle duplicate resolution
+                if is_duplicate and duplicate_info:
+                    existing_res = duplicate_info['width'] * duplicate_info['height']
+                    current_res = width * height
+                    keep_existing = existing_res >= current_res
                     
-                    # Handle duplicate resolution
-                    if is_duplicate and duplicate_info:
-                        existing_res = duplicate_info['width'] * duplicate_info['height']
-                        current_res = width * height
-                        keep_existing = existing_res >= current_res
-                        
-                        if keep_existing:
-                            # Delete or move the newly downloaded file
-                            if move_duplicates:
-                                try:
-                                    new_filename = os.path.basename(file_path)
-                                    move_path = os.path.join(duplicates_folder, new_filename)
-                                    os.rename(file_path, move_path)
-                                    stats["duplicates_moved"] += 1
-                                except Exception:
-                                    os.remove(file_path)
-                            else:
+                    if keep_existing:
+                        # Delete or move the newly downloaded file
+                        if move_duplicates:
+                            try:
+                                self._move_to_duplicates(file_path, duplicates_folder)
+                                stats["duplicates_moved"] += 1
+                            except Exception:
                                 os.remove(file_path)
-                            return None
                         else:
-                            # Replace existing with new higher-res version
-                            old_filepath = duplicate_info['filepath']
-                            if move_duplicates:
-                                try:
-                                    old_filename = os.path.basename(old_filepath)
-                                    move_path = os.path.join(duplicates_folder, old_filename)
-                                    os.rename(old_filepath, move_path)
-                                    stats["duplicates_moved"] += 1
-                                except Exception:
-                                    if os.path.exists(old_filepath): 
-                                        os.remove(old_filepath)
-                            else:
-                                if os.path.exists(old_filepath):
+                            os.remove(file_path)
+                        return None
+                    else:
+                        # Replace existing with new higher-res version
+                        old_filepath = duplicate_info['filepath']
+                        if move_duplicates:
+                            try:
+                                self._move_to_duplicates(old_filepath, duplicates_folder)
+                                stats["duplicates_moved"] += 1
+                            except Exception:
+                                if os.path.exists(old_filepath): 
                                     os.remove(old_filepath)
-                            
-                            # Update cache with the new, larger file
-                            downloaded_images_cache[file_hash] = {
-                                'filename': os.path.basename(file_path),
-                                'filepath': file_path,
-                                'width': width,
-                                'height': height,
-                                'url': item_url
-                            }
-                    
-                    # Build file metadata
-                    file_metadata = {
-                        'filename': os.path.basename(file_path),
-                        'filepath': file_path,
-                        'url': item_url,
-                        'type': file_type,
-                        'width': width,
-                        'height': height,
-                        'hash': str(file_hash) if file_hash else None,
-                        'source_page_url': kwargs.get('url', ''),
-                        'alt': item_data.get('alt') if kwargs.get('extract_metadata') else None,
-                        'title': item_data.get('title') if kwargs.get('extract_metadata') else None,
-                        'credits': item_data.get('credits') if kwargs.get('extract_metadata') else None,
-                        'original_source_url': item_data.get('source_url')
-                    }
-                    
-                    if file_type == 'image':
-                        stats["downloads_succeeded_image"] += 1
-                    elif file_type == 'video':
-                        stats["downloads_succeeded_video"] += 1
-                    elif file_type == 'audio':
-                        stats["downloads_succeeded_audio"] += 1
-                    
-                    # Save individual metadata file if requested
-                    if kwargs.get('save_metadata_json', True):
-                        self.save_metadata_file(file_path, file_metadata, output_path)
-                        stats["metadata_files_saved"] += 1
-                    
-                    return file_metadata
+                        else:
+                            if os.path.exists(old_filepath):
+                                os.remove(old_filepath)
+                        
+                        # Update cache with the new, larger file
+                        downloaded_images_cache[file_hash] = {
+                            'filename': os.path.basename(file_path),
+                            'filepath': file_path,
+                            'width': width,
+                            'height': height,
+                            'url': item_url
+                        }
+                
+                # Build file metadata
+                file_metadata = {
+                    'filename': os.path.basename(file_path),
+                    'filepath': file_path,
+                    'url': item_url,
+                    'type': file_type,
+                    'width': width,
+                    'height': height,
+                    'hash': str(file_hash) if file_hash else None,
+                    'source_page_url': kwargs.get('url', ''),
+                    'alt': item_data.get('alt') if kwargs.get('extract_metadata') else None,
+                    'title': item_data.get('title') if kwargs.get('extract_metadata') else None,
+                    'credits': item_data.get('credits') if kwargs.get('extract_metadata') else None,
+                    'original_source_url': item_data.get('source_url')
+                }
+                
+                if file_type == 'image':
+                    stats["downloads_succeeded_image"] += 1
+                elif file_type == 'video':
+                    stats["downloads_succeeded_video"] += 1
+                elif file_type == 'audio':
+                    stats["downloads_succeeded_audio"] += 1
+                
+                # Save individual metadata file if requested
+                if kwargs.get('save_metadata_json', True):
+                    self.save_metadata_file(file_path, file_metadata, output_path)
+                    stats["metadata_files_saved"] += 1
+                
+                # Record immediately and stop the remaining workers once the limit is hit
+                downloaded_files_data.append(file_metadata)
+                if max_files > 0 and initial_file_count + len(downloaded_files_data) >= max_files:
+                    max_files_reached.set()
+                    # Every file slot is now held by a saved file; the rest would wait on file_slots forever
+                    current_task = asyncio.current_task()
+                    for task in tasks:
+                        if task is not current_task:
+                            task.cancel()
+                return file_metadata
                         
             except Exception as e:
                 print(f"  Error processing item {item_url}: {e}")
-                with global_lock:
-                    stats["failed_other"] += 1
+                stats["failed_other"] += 1
                 return None
-        
-        # Process in batches using event loop with ThreadPoolExecutor
-        loop = asyncio.get_event_loop()
-
-        # Filter items before processing to avoid unnecessary work
-        with global_lock:
-            # Check max files limit before starting
-            if max_files > 0 and initial_file_count >= max_files:
-                print(f"Already reached max files limit ({max_files}). No additional downloads needed.")
-                return downloaded_files_data, downloaded_images_cache
-                
-            # Filter out items that have already been processed
-            filtered_items = []
-            for index, item_data in enumerate(media_items_to_process):
-                item_url = item_data.get('url')
-                if item_url and not self.check_url_processed(item_url):
-                    filtered_items.append((index, item_data))
+
+        # Check max files limit before starting
+        if max_files > 0 and initial_file_count >= max_files:
+            print(f"Already reached max files limit ({max_files}). No additional downloads needed.")
+            return downloaded_files_data, downloaded_images_cache
+            
+        # Filter out items that have already been processed
+        filtered_items = []
+        for index, item_data in enumerate(media_items_to_process):
+            item_url = item_data.get('url')
+            if item_url and not self.check_url_processed(item_url):
+                filtered_items.append((index, item_data))
         
         # If all items were already processed, return early
         if not filtered_items:
             print("All items have already been processed, skipping download.")
             return downloaded_files_data, downloaded_images_cache
-        
-        # Process in batches for better control
-        batch_size = max(1, min(max_workers * 2, len(filtered_items)))  # Ensure batch_size is at least 1
-        for i in range(0, len(filtered_items), batch_size):
-            # Check for cancellation before each batch
-            if self.cancellation_requested or self._check_cancellation():
-                print(f"\n🛑 Download cancelled by user after {len(downloaded_files_data)} files")
-                break
-                
-            batch = filtered_items[i:i+batch_size]
-            print(f"  Processing batch {i//batch_size + 1}/{(len(filtered_items) + batch_size - 1)//batch_size} ({len(batch)} items)")
-            
-            # Create a thread pool for this batch
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Submit batch to thread pool and run via asyncio
-                futures = [loop.run_in_executor(executor, download_worker, index, item_data) 
-                        for index, item_data in batch]
-                
-                # Wait for all futures to complete
-                batch_results = await asyncio.gather(*futures, return_exceptions=True)
-                
-                # Process the results with proper locking
-                with global_lock:
-                    for result in batch_results:
-                        if isinstance(result, Exception):
-                            print(f"Error in download worker: {result}")
-                            continue
-                            
-                        if result:  # If we got a valid result
-                            downloaded_files_data.append(result)
-                            
-                    # Check if we've reached the max files limit
-                    current_count = initial_file_count + len(downloaded_files_data)
-                    if max_files > 0 and current_count >= max_files:
-                        print(f"Reached max files limit ({max_files}). Stopping after current batch.")
-                        break
+
+        # Round-robin across domains so a worker's next item is usually on a host whose
+        # rate-limit slot is free, instead of every worker queuing behind one domain
+        by_domain = defaultdict(list)
+        for pair in filtered_items:
+            by_domain[_netloc(pair[1]['url'])].append(pair)
+        if len(by_domain) > 1:
+            filtered_items = [pair for group in zip_longest(*by_domain.values()) for pair in group if pair is not None]
+
+        # Two-stage pipeline: at most max_workers downloads on the wire, while up to
+        # max_workers more fetched bodies wait for (or run) decode/hash on the thread pool
+        fetch_slots = asyncio.Semaphore(max_workers)
+        window = asyncio.Semaphore(max_workers * 2)
+        if self._hash_executor is None:
+            self._hash_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=os.cpu_count() or 1, thread_name_prefix='scraper-hash'
+            )
+        hash_executor = self._hash_executor
+
+        # One permit per file still allowed under max_files, taken before fetching and kept on
+        # success, so downloads already in flight can't push the total past the limit
+        file_slots = asyncio.Semaphore(max_files - initial_file_count) if max_files > 0 else None
+
+        async def bounded_worker(index, item_data):
+            async with window:
+                if file_slots is None:
+                    return await download_worker(index, item_data)
+                await file_slots.acquire()
+                result = None
+                try:
+                    result = await download_worker(index, item_data)
+                finally:
+                    if result is None:
+                        file_slots.release()
+                return result
+
+        if AIOHTTP_AVAILABLE:
+            # Cache DNS for the whole run (aiohttp's default is 10s) since the queue hits the same few hosts
+            session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=100, limit_per_host=max_workers, ttl_dns_cache=300))
+        tasks = [asyncio.ensure_future(bounded_worker(index, item_data)) for index, item_data in filtered_items]
+        cancel_event = asyncio.Event()
+
+        async def cancel_watcher():
+            # Poll the cancel flag while downloads run and abort in-flight ones right away,
+            # rather than letting every queued worker notice it at its next entry check
+            while not all(task.done() for task in tasks):
+                if self.cancellation_requested or self._check_cancellation():
+                    cancel_event.set()
+                    for task in tasks:
+                        task.cancel()
+                    return
+                await asyncio.sleep(0.25)
+
+        watcher = asyncio.ensure_future(cancel_watcher())
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            watcher.cancel()
+            if session is not None:
+                await session.close()
+
+        for result in results:
+            if isinstance(result, Exception) and not isinstance(result, asyncio.CancelledError):
+                print(f"Error in download worker: {result}")
+
+        if cancel_event.is_set() or self._check_cancellation():
+            print(f"\n🛑 Download cancelled by user after {len(downloaded_files_data)} files")
+        elif max_files_reached.is_set():
+            print(f"Reached max files limit ({max_files}).")
         
         print(f"Parallel download complete. Downloaded {len(downloaded_files_data)} new files.")
         return downloaded_files_data, downloaded_images_cache
 
-    def _filter_urls(self, urls, base_url, same_domain_only=True, **kwargs):
-        """
-        Filter URLs based on domain, patterns, and exclusions.
-        
-        Args:
-            urls: List of URLs to filter
-            base_url: Base URL for making relative URLs absolute
-            same_domain_only: Whether to restrict to same domain
-            **kwargs: Additional filtering options
-            
-        Returns:
-            Filtered list of URLs
-        """
-        if not urls:
-            return []
-        
-        filtered_urls = []
-        base_domain = urlparse(base_url).netloc
-        
-        # Additional filters
-        exclude_patterns = kwargs.get('exclude_patterns', [
-            r'/ads/', r'/advertisement', r'/pixel', r'/tracker', r'/tracking',
-            r'/cdn-cgi/', r'/favicon', r'/icon', r'/logo', r'/avatar'
-        ])
-        
-        include_patterns = kwargs.get('include_patterns', [])
-        min_url_length = kwargs.get('min_url_length', 10)
-        
-        # Get trusted domains from handler if available
-        trusted_domains = []
-        if hasattr(self, 'site_handlers'):
-            for handler_name, handler_class in self.site_handlers.items():
-                try:
-                    handler_instance = handler_class(base_url, self)
-                    if hasattr(handler_instance, 'get_trusted_domains'):
-                        trusted_domains.extend(handler_instance.get_trusted_domains())
-                except Exception as e:
-                    if self.debug_mode:
-                        print(f"Error getting trusted domains from handler {handler_name}: {e}")
-        
-        # Convert patterns to compiled regex
-        exclude_regex = [re.compile(pattern, re.IGNORECASE) for pattern in exclude_patterns]
-        include_regex = [re.compile(pattern, re.IGNORECASE) for pattern in include_patterns]
-        
-        # Track seen URLs to avoid duplicates
-        seen_urls = set()
-        
-        for url in urls:
-            # Skip empty URLs
-            if not url or len(url) < min_url_length:
-                continue
-            
-            # Make URL absolute if relative
-            if url.startswith('/'):
-                parsed_base = urlparse(base_url)
-                url = f"{parsed_base.scheme}://{parsed_base.netloc}{url}"
-            elif url.startswith('./') or url.startswith('../'):
-                url = urljoin(base_url, url)
-            elif not url.startswith(('http://', 'https://')):
-                # Skip non-http URLs (like data:, javascript:, etc.)
-                continue
-            
-            # Skip if already seen
-            if url in seen_urls:
-                continue
-            
-            # Check domain restriction
-            parsed_url = urlparse(url)
-            url_domain = parsed_url.netloc
-            
-            is_trusted_domain = False
-            if trusted_domains:
-                # Check if this URL matches any trusted domain
-                is_trusted_domain = any(trusted_domain in url_domain for trusted_domain in trusted_domains)
-            
-            # If same_domain_only is enabled, check domain unless it's a trusted domain
-            if same_domain_only and url_domain != base_domain and not is_trusted_domain:
-                continue
-            
-            # Check exclusion patterns
-            if any(pattern.search(url) for pattern in exclude_regex):
-                continue
-            
-            # Check inclusion patterns if specified
-            if include_regex and not any(pattern.search(url) for pattern in include_regex):
-                continue
-            
-            # URL passed all filters
-            filtered_urls.append(url)
-            seen_urls.add(url)
-        
-        return filtered_urls
+    def _log_debug(self, msg, *args):
+        """Logs a debug message only when this node runs with debug_mode on."""
+        if self.debug_mode:
+            logger.debug(msg, *args)
 
     def _get_random_user_agent(self):
         """
         Returns a random realistic user agent to avoid detection.
         """
-        # Define a list of modern, realistic user agents
-        user_agents = [
-            # Chrome on Windows
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/97.0.4692.99 Safari/537.36",
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36",
-            # Chrome on macOS
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/97.0.4692.99 Safari/537.36",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36",
-            # Firefox on Windows
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:96.0) Gecko/20100101 Firefox/96.0",
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:95.0) Gecko/20100101 Firefox/95.0",
-            # Firefox on macOS
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:96.0) Gecko/20100101 Firefox/96.0",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:95.0) Gecko/20100101 Firefox/95.0",
-            # Safari on macOS
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.2 Safari/605.1.15",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.1 Safari/605.1.15",
-            # Edge on Windows
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/97.0.4692.99 Safari/537.36 Edg/97.0.1072.69",
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36 Edg/96.0.1054.62"
-        ]
+        return random.choice(_USER_AGENTS)
+
+    async def _get_shared_browser(self, browser_args):
+        """
+        Return (playwright, browser) for a non-persistent scrape, launching Chromium only if
+        there is no live browser from an earlier run on this event loop with the same args.
+        """
+        loop = asyncio.get_running_loop()
+        if self._pw_lock is None or self._pw_lock[0] is not loop:
+            self._pw_lock = (loop, asyncio.Lock())
         
-        return random.choice(user_agents)
+        async with self._pw_lock[1]:
+            shared = self._pw_shared
+            if shared and shared[0] is loop and shared[1] == browser_args and shared[3].is_connected():
+                print("Reusing running Chromium instance")
+                return shared[2], shared[3]
+            
+            if shared and shared[0] is loop:
+                # Disconnected, or launched with different args
+                await self._close_shared_browser()
+            elif shared:
+                # Launched on an earlier event loop; its objects can't be awaited from this one
+                self._discard_shared_browser()
+            
+            playwright_instance = await async_playwright().start()
+            browser = await playwright_instance.chromium.launch(headless=True, args=list(browser_args))
+            self._pw_shared = (loop, browser_args, playwright_instance, browser)
+            _SHARED_BROWSER_OWNERS.add(self)
+            return playwright_instance, browser
+
+    async def _close_shared_browser(self):
+        """Close the Chromium process kept alive by _get_shared_browser."""
+        if not self._pw_shared:
+            return
+        _, _, playwright_instance, browser = self._pw_shared
+        self._pw_shared = None
+        await self._close_playwright_pair(playwright_instance, browser)
+
+    def _discard_shared_browser(self):
+        """Best-effort shutdown of the shared browser from outside its event loop. (Sync)"""
+        shared, self._pw_shared = self._pw_shared, None
+        if not shared:
+            return
+        old_loop, _, playwright_instance, browser = shared
+        try:
+            if old_loop.is_running():
+                # Loop is alive in another thread: let it close its own objects
+                asyncio.run_coroutine_threadsafe(self._close_playwright_pair(playwright_instance, browser), old_loop)
+                return
+            if not old_loop.is_closed():
+                # An idle loop can be driven from a helper thread even while this thread runs another loop
+                closer = Thread(target=old_loop.run_until_complete,
+                                args=(self._close_playwright_pair(playwright_instance, browser),), daemon=True)
+                closer.start()
+                closer.join(timeout=30)
+                return
+            # Loop already closed: kill the Playwright driver, Chromium exits with its pipe
+            transport = getattr(getattr(playwright_instance, '_connection', None), '_transport', None)
+            driver_proc = getattr(transport, '_proc', None)
+            if driver_proc is not None:
+                driver_proc.kill()
+        except Exception as e:
+            print(f"Error discarding shared browser: {e}")
+
+    def __del__(self):
+        try:
+            self._discard_shared_browser()
+        except Exception:
+            pass
+
+    @staticmethod
+    async def _close_playwright_pair(playwright_instance, browser):
+        """Close a browser and stop the Playwright driver that launched it."""
+        try:
+            await browser.close()
+        except Exception as e:
+            print(f"Error closing shared browser: {e}")
+        try:
+            await playwright_instance.stop()
+        except Exception as e:
+            print(f"Error stopping Playwright: {e}")
 
     async def _init_direct_playwright(self, **kwargs):
         """Initializes an async Playwright instance with full stealth functionality."""
@@ -4284,138 +4667,47 @@ class EricWebFileScraper:
             print("Playwright library not available.")
             return None
 
+        shared_browser = False
         try:
             print("Initializing Playwright (async)...")
-            playwright_instance = await async_playwright().start()
-            if not playwright_instance:
-                print("Failed to start Playwright")
-                return None
-
             user_agent = self._get_random_user_agent()
             print(f"Using user agent: {user_agent[:50]}...")
 
-            browser_args = []
-            if self.use_stealth_mode:
-                browser_args = [
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-features=IsolateOrigins,site-per-process',
-                    '--disable-site-isolation-trials',
-                    '--disable-features=BlockInsecurePrivateNetworkRequests',
-                    '--disable-web-security',
-                    '--no-sandbox'
-                ]
+            browser_args = _STEALTH_BROWSER_ARGS if self.use_stealth_mode else ()
 
             # Define context options BEFORE launching browser
-            context_options = {
-                "user_agent": user_agent,
-                "viewport": {"width": 5120, "height": 2880},
-                "device_scale_factor": 1.0
-            }
+            context_options = dict(_BASE_CONTEXT_OPTIONS, user_agent=user_agent)
             if self.use_stealth_mode:
-                context_options.update({
-                    "locale": "en-US",
-                    "timezone_id": "America/New_York",
-                    "has_touch": False,
-                    "is_mobile": False,
-                    "color_scheme": 'light'
-                })
+                context_options.update(_STEALTH_CONTEXT_OPTIONS)
 
             use_persistent = kwargs.get("dump_cache_after_run", False)
             user_data_dir = None
 
             if use_persistent:
+                # A persistent profile is per run (its cache is carved afterwards), so it gets its own browser
+                playwright_instance = await async_playwright().start()
+                if not playwright_instance:
+                    print("Failed to start Playwright")
+                    return None
                 user_data_dir = pathlib.Path(tempfile.mkdtemp(prefix="pwprof_"))
                 browser = await playwright_instance.chromium.launch_persistent_context(
                     user_data_dir=str(user_data_dir),
                     headless=True,
-                    args=browser_args,
+                    args=list(browser_args),
                     **context_options
                 )
                 context = browser  # persistent context IS the context
-                page = await context.new_page()
             else:
-                browser = await playwright_instance.chromium.launch(
-                    headless=True, args=browser_args
-                )
+                # Reuse the Chromium process from earlier scrapes; a fresh context keeps runs isolated
+                playwright_instance, browser = await self._get_shared_browser(browser_args)
+                shared_browser = True
                 context = await browser.new_context(**context_options)
-                page = await context.new_page()
 
             self.pw_user_data_dir = str(user_data_dir) if user_data_dir else None
 
             # Add stealth mode script to avoid detection
             print("Adding stealth script...")
-            stealth_js = """
-            () => {
-                // Pass WebDriver test
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => false,
-                });
-                
-                // Pass Chrome test
-                window.chrome = {
-                    runtime: {},
-                };
-                
-                // Pass permissions test
-                const originalQuery = window.navigator.permissions.query;
-                window.navigator.permissions.query = (parameters) => (
-                    parameters.name === 'notifications' ?
-                        Promise.resolve({ state: Notification.permission }) :
-                        originalQuery(parameters)
-                );
-                
-                // Prevent iframe detection
-                const iframe = document.createElement('iframe');
-                iframe.srcdoc = "<!DOCTYPE html><html><head></head><body></body></html>";
-                document.head.appendChild(iframe);
-                window.navigator.plugins = iframe.contentWindow.navigator.plugins;
-                document.head.removeChild(iframe);
-                
-                // Use webGL renderer
-                const getParameter = WebGLRenderingContext.prototype.getParameter;
-                WebGLRenderingContext.prototype.getParameter = function(parameter) {
-                    // UNMASKED_VENDOR_WEBGL
-                    if (parameter === 37445) {
-                        return 'Intel Inc.';
-                    }
-                    // UNMASKED_RENDERER_WEBGL
-                    if (parameter === 37446) {
-                        return 'Intel Iris OpenGL Engine';
-                    }
-                    return getParameter.apply(this, arguments);
-                };
-                
-                // Add language and platform overrides
-                Object.defineProperty(navigator, 'platform', {
-                    get: () => 'Win32',
-                });
-                
-                Object.defineProperty(navigator, 'hardwareConcurrency', {
-                    get: () => 8,
-                });
-                
-                // Mock plugins for more authenticity
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => {
-                        const plugins = [
-                            { name: 'Chrome PDF Plugin', filename: 'internal-pdf-viewer', description: 'Portable Document Format' },
-                            { name: 'Chrome PDF Viewer', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai', description: '' },
-                            { name: 'Native Client', filename: 'internal-nacl-plugin', description: '' }
-                        ];
-                        
-                        plugins.__proto__ = window.PluginArray.prototype;
-                        
-                        plugins.item = idx => plugins[idx];
-                        plugins.namedItem = name => plugins.find(plugin => plugin.name === name);
-                        
-                        return plugins;
-                    }
-                });
-            }
-            """
-            
-            # Explicitly await script injection
-            await context.add_init_script(stealth_js)
+            await context.add_init_script(_STEALTH_JS)
             
             # Set navigation timeout
             print("Setting navigation timeout...")
@@ -4423,15 +4715,16 @@ class EricWebFileScraper:
             
             # Create page with proper error handling
             print("Creating page...")
-            page = await context.new_page()
+            page = context.pages[0] if use_persistent and context.pages else await context.new_page()
             if not page:
                 print("Failed to create page")
                 if context:
                     await context.close()
-                if browser:
-                    await browser.close()
-                if playwright_instance:
-                    await playwright_instance.stop()
+                if not shared_browser:
+                    if browser:
+                        await browser.close()
+                    if playwright_instance:
+                        await playwright_instance.stop()
                 return None
             
             # Handle dialogs automatically
@@ -4459,66 +4752,23 @@ class EricWebFileScraper:
                     await context.close()
             except Exception as ctx_err:
                 print(f"Error closing context: {ctx_err}")
-                
-            try:
-                if 'browser' in locals() and browser:
-                    await browser.close()
-            except Exception as browser_err:
-                print(f"Error closing browser: {browser_err}")
-                
-            try:
-                if 'playwright_instance' in locals() and playwright_instance:
-                    await playwright_instance.stop()
-            except Exception as pw_err:
-                print(f"Error stopping Playwright: {pw_err}")
+            
+            # The shared browser outlives this run; only tear down one launched just for it
+            if not shared_browser:
+                try:
+                    if 'browser' in locals() and browser:
+                        await browser.close()
+                except Exception as browser_err:
+                    print(f"Error closing browser: {browser_err}")
+                    
+                try:
+                    if 'playwright_instance' in locals() and playwright_instance:
+                        await playwright_instance.stop()
+                except Exception as pw_err:
+                    print(f"Error stopping Playwright: {pw_err}")
                 
             return None
 
-    def _verify_content_integrity(self, url, headers=None):
-        """
-        Verify if content at URL is valid and accessible.
-        
-        Args:
-            url: URL to verify
-            headers: Optional HTTP headers
-            
-        Returns:
-            tuple: (is_valid, content_type, status_code, content_length)
-        """
-        try:
-            if not headers:
-                headers = {'User-Agent': self._get_random_user_agent()}
-            
-            # Make a HEAD request to check basics without downloading content
-            response = requests.head(url, timeout=10, headers=headers, allow_redirects=True)
-            
-            # Check status code
-            if response.status_code != 200:
-                return False, None, response.status_code, 0
-            
-            # Check content type
-            content_type = response.headers.get('content-type', '').lower()
-            content_length = int(response.headers.get('content-length', 0))
-            
-            # Basic validation by content type
-            is_valid = False
-            
-            # For images
-            if any(ct in content_type for ct in ['image/jpeg', 'image/png', 'image/gif', 'image/webp']):
-                # Check reasonable size
-                is_valid = content_length >= 5000 and content_length < 20000000  # 5KB to 20MB
-            
-            # For videos
-            elif any(ct in content_type for ct in ['video/mp4', 'video/webm', 'video/quicktime']):
-                # Check reasonable size
-                is_valid = content_length >= 50000 and content_length < 200000000  # 50KB to 200MB
-            
-            return is_valid, content_type, response.status_code, content_length
-            
-        except requests.exceptions.RequestException as e:
-            print(f"Error verifying content at {url}: {e}")
-            return False, None, 0, 0
-
     async def _scroll_down_fixed(self, page: AsyncPage, times: int, delay_ms: int):
         """Scrolls down the page a fixed number of times (async version)."""
         if not page: return
@@ -4537,62 +4787,77 @@ class EricWebFileScraper:
     async def _extract_media_from_pw_page(self, page: AsyncPage, url: str, **kwargs):
         """Generic extraction of media items using Playwright page (async version)."""
         print("Using generic Playwright extraction...")
+        media_items = await self._extract_media_from_frame(page, url, **kwargs)
+        
+        # --- Extract images from iframes ---
+        # page.frames is already flat (nested iframes included), so each child frame gets
+        # one extraction pass and they all run concurrently
+        child_frames = [
+            frame for frame in getattr(page, 'frames', ())
+            if frame != page.main_frame and not frame.is_detached()
+        ]
+        if child_frames:
+            print(f"Extracting images from {len(child_frames)} iframe(s)...")
+            frame_results = await asyncio.gather(
+                *(self._extract_media_from_frame(frame, frame.url, **kwargs) for frame in child_frames),
+                return_exceptions=True
+            )
+            for frame_items in frame_results:
+                if isinstance(frame_items, Exception):
+                    print(f"Error extracting from iframe: {frame_items}")
+                elif frame_items:
+                    media_items.extend(frame_items)
+        
+        print(f"Generic Playwright extraction found {len(media_items)} media items")
+        return media_items
+
+    async def _extract_media_from_frame(self, frame, url: str, **kwargs):
+        """Run the generic media extraction on a single Playwright page or frame."""
         media_items = []
         
         try:
+            # Collect every <img>, data-* URL, <video>/<source> and <picture> srcset in one
+            # evaluate instead of several locator round-trips per element
+            page_media = await frame.evaluate(_JS_PAGE_MEDIA, {
+                'images': kwargs.get('download_images', True),
+                'videos': kwargs.get('download_videos', False),
+                'dataAttrs': _MEDIA_DATA_ATTRS,
+            })
+            parsed = urlparse(url)
+            page_origin = f"{parsed.scheme}://{parsed.netloc}"
+            image_title = f"Image from {parsed.netloc}"
+            video_title = f"Video from {parsed.netloc}"
+
             # Extract images
             if kwargs.get('download_images', True):
-                img_locator = page.locator("img:not([width='16']):not([width='24']):not([width='32'])")
-                img_count = await img_locator.count()
-                print(f"Found {img_count} potential image elements")
+                print(f"Found {page_media['imageCount']} potential image elements")
                 
-                for i in range(img_count):
-                    img = img_locator.nth(i)
-                    
-                    # Skip if not visible
-                    is_visible = await img.is_visible(timeout=500)
-                    if not is_visible:
-                        continue
-                        
+                for img in page_media['images']:
                     # Get image attributes - check data-src first for lazy-loaded/full-res images
-                    src = await img.get_attribute("src")
-                    data_src = await img.get_attribute("data-src")
-                    data_original = await img.get_attribute("data-original")
-                    data_lazy_src = await img.get_attribute("data-lazy-src")
-                    data_full_src = await img.get_attribute("data-full-src")
-                    # Tilda CDN specific: data-img-zoom-url contains full-res URL for zoomable images
-                    data_img_zoom_url = await img.get_attribute("data-img-zoom-url")
-                    srcset = await img.get_attribute("srcset")
-                    alt = await img.get_attribute("alt") or ""
-                    title_attr = await img.get_attribute("title") or ""
+                    src = img['src']
+                    srcset_best = img['srcsetBest']
+                    alt = img['alt'] or ""
+                    title_attr = img['title'] or ""
                     
                     # Prefer data-src attributes as they often contain full-resolution URLs
                     # (e.g., Tilda CDN uses data-original or data-img-zoom-url for full-res, src for thumbnails)
-                    full_res_url = data_img_zoom_url or data_original or data_src or data_lazy_src or data_full_src
+                    full_res_url = img['dataImgZoomUrl'] or img['dataOriginal'] or img['dataSrc'] or img['dataLazySrc'] or img['dataFullSrc']
                     
                     # Skip common non-content images
                     if not src and not full_res_url:
                         continue
-                    if src and any(x in src.lower() for x in ['spacer.gif', 'pixel.gif', 'transparent.gif', 'icon']):
+                    if src and _PLACEHOLDER_IMAGE_RE.search(src):
                         continue
                         
                     # Determine the best URL to use
                     # Priority: data-src (full-res) > srcset highest res > src
                     image_url = src
                     
-                    # Check if src is a thumbnail/resized version (common CDN patterns)
-                    src_is_thumbnail = src and any(pattern in src for pattern in [
-                        '/resize/', '/-/empty/', '/thb.', '_thumb', '_small', 
-                        '/optim.', '/thumbnail', 'w_100', 'h_100'
-                    ])
-                    
                     # If we have a full-res data attribute, prefer that
                     if full_res_url and full_res_url.startswith('http'):
                         image_url = full_res_url
-                    elif srcset:
-                        high_res = self._get_highest_res_from_srcset(srcset)
-                        if high_res:
-                            image_url = high_res
+                    elif srcset_best:
+                        image_url = srcset_best
                     
                     # Skip data URLs
                     if not image_url or image_url.startswith('data:'):
@@ -4600,33 +4865,13 @@ class EricWebFileScraper:
                         
                     # Make absolute URL
                     if image_url.startswith('/'):
-                        parsed = urlparse(url)
-                        base = f"{parsed.scheme}://{parsed.netloc}"
-                        image_url = urljoin(base, image_url)
+                        image_url = urljoin(page_origin, image_url)
                     
-                    # Look for parent containers
-                    caption = ""
-                    credits = ""
-                    try:
-                        figure = img.locator("xpath=ancestor::figure[1]").first
-                        figure_visible = await figure.is_visible(timeout=500)
-                        
-                        if figure_visible:
-                            figcaption = figure.locator("figcaption").first
-                            figcaption_visible = await figcaption.is_visible(timeout=500)
-                            if figcaption_visible:
-                                caption = await figcaption.inner_text()
-                                caption = caption.strip()
-                            
-                            credit_elem = figure.locator(".credit, .author, [rel='author']").first
-                            credit_visible = await credit_elem.is_visible(timeout=500)
-                            if credit_visible:
-                                credits = await credit_elem.inner_text()
-                                credits = credits.strip()
-                    except Exception:
-                        pass
+                    # Caption/credits come from a visible parent <figure>, if any
+                    caption = img['caption']
+                    credits = img['credits']
                     
-                    title = caption or alt or title_attr or "Image from " + urlparse(url).netloc
+                    title = caption or alt or title_attr or image_title
                     
                     media_items.append({
                         'url': image_url,
@@ -4637,7 +4882,7 @@ class EricWebFileScraper:
                         'type': 'image'
                     })
             
-            bg_imgs = await page.evaluate("""
+            bg_imgs = await frame.evaluate("""
                 () => Array.from(document.querySelectorAll('*'))
                     .map(el => getComputedStyle(el).backgroundImage)
                     .filter(bg => bg && bg.startsWith('url('))
@@ -4651,86 +4896,104 @@ class EricWebFileScraper:
                         'source_url': url,
                         'type': 'image'
                     })
-            # --- Extract images from iframes ---
-            iframe_elements = await page.query_selector_all("iframe")
-            for iframe in iframe_elements:
-                try:
-                    frame = await iframe.content_frame()
-                    if frame:
-                        print("Extracting images from iframe...")
-                        iframe_items = await self._extract_media_from_pw_page(frame, frame.url, **kwargs)
-                        if iframe_items:
-                            media_items.extend(iframe_items)
-                except Exception as e:
-                    print(f"Error extracting from iframe: {e}")
-
             # --- Extract images from data-* attributes on any element ---
-            # Include data-src for lazy-loaded images (Tilda, many other CMSes)
-            # data-img-zoom-url is Tilda CDN's attribute for full-resolution zoomable images
-            data_attrs = ["data-img-zoom-url", "data-original", "data-src", "data-large", 
-                          "data-image", "data-url", "data-lazy-src", "data-full-src", 
-                          "data-hi-res", "data-zoom-image"]
-            for attr in data_attrs:
-                elements = await page.locator(f"[{attr}]").all()
-                for el in elements:
-                    attr_url = await el.get_attribute(attr)
-                    if attr_url and attr_url.startswith("http"):
-                        media_items.append({
-                            'url': attr_url,
-                            'title': f"Image from {attr}",
-                            'source_url': url,
-                            'type': 'image'
-                        })
+            for attr, attr_url in page_media['dataAttrs']:
+                if attr_url.startswith("http"):
+                    media_items.append({
+                        'url': attr_url,
+                        'title': f"Image from {attr}",
+                        'source_url': url,
+                        'type': 'image'
+                    })
 
             # Extract videos if enabled
             if kwargs.get('download_videos', False):
-                video_locator = page.locator("video, source[type*='video']")
-                video_count = await video_locator.count()
-                print(f"Found {video_count} potential video elements")
+                print(f"Found {len(page_media['videos'])} potential video elements")
                 
-                for i in range(video_count):
-                    video = video_locator.nth(i)
-                    
-                    video_url = await video.get_attribute("src")
+                for video_url in page_media['videos']:
                     if not video_url or video_url.startswith('data:'):
                         continue
                         
                     # Make URL absolute if relative
                     if video_url.startswith('/'):
-                        parsed = urlparse(url)
-                        base = f"{parsed.scheme}://{parsed.netloc}"
-                        video_url = urljoin(base, video_url)
+                        video_url = urljoin(page_origin, video_url)
                     
                     media_items.append({
                         'url': video_url,
-                        'title': "Video from " + urlparse(url).netloc,
+                        'title': video_title,
                         'source_url': url,
                         'type': 'video'
                     })
 
-            picture_locator = page.locator("picture source")
-            picture_count = await picture_locator.count()
-            for i in range(picture_count):
-                source = picture_locator.nth(i)
-                srcset = await source.get_attribute("srcset")
-                if srcset:
-                    high_res = self._get_highest_res_from_srcset(srcset)
-                    if high_res and not high_res.startswith('data:'):
-                        media_items.append({
-                            'url': high_res,
-                            'title': "Responsive Image",
-                            'source_url': url,
-                            'type': 'image'
-                        })
+            for high_res in page_media['pictureUrls']:
+                if not high_res.startswith('data:'):
+                    media_items.append({
+                        'url': high_res,
+                        'title': "Responsive Image",
+                        'source_url': url,
+                        'type': 'image'
+                    })
             
-            print(f"Generic Playwright extraction found {len(media_items)} media items")
             return media_items
             
         except Exception as e:
             print(f"Error during generic Playwright extraction: {e}")
-            traceback.print_exc()
+            if self.debug_mode:
+                traceback.print_exc()
             return []
 
+    def _scan_html_media(self, html_content, base_url):
+        """
+        Collect image and video URLs from raw HTML with lxml.
+        Handles unquoted attributes, lazy-load data-* attributes and picks the largest srcset
+        candidate; relative URLs are resolved against base_url. Returns (image_urls, video_urls), or None if parsing fails.
+        """
+        try:
+            tree = lxml_html.fromstring(html_content)
+        except (lxml_etree.LxmlError, ValueError) as e:
+            print(f"lxml could not parse page HTML, using regex scan: {e}")
+            return None
+        
+        def absolute(raw):
+            if not raw:
+                return None
+            raw = raw.strip()
+            if raw.startswith('data:'):
+                return None
+            full = urljoin(base_url, raw)
+            return full if full.startswith(('http://', 'https://')) else None
+        
+        # One walk over img/source/video elements instead of a query per element kind
+        image_urls = []
+        video_urls = []
+        for el in tree.iter('img', 'source', 'video'):
+            if el.tag == 'video':
+                candidates, target = (el.get('src'),), video_urls
+            elif el.tag == 'source':
+                full = absolute(el.get('src'))
+                if full:
+                    video_urls.append(full)
+                candidates, target = (self._get_highest_res_from_srcset(el.get('srcset')),), image_urls
+            else:
+                # Lazy loaders keep the real image in a data-* attribute and a placeholder in src
+                candidates = [el.get('src'), self._get_highest_res_from_srcset(el.get('srcset'))]
+                candidates.extend(el.get(attr) for attr in _LAZY_IMG_ATTRS)
+                target = image_urls
+            for candidate in candidates:
+                full = absolute(candidate)
+                if full:
+                    target.append(full)
+        
+        # CSS backgrounds, from inline style attributes and <style> blocks
+        css_chunks = tree.xpath('//@style[contains(., "url(")] | //style/text()')
+        for css in css_chunks:
+            for raw in _CSS_URL_RE.findall(css):
+                full = absolute(raw)
+                if full:
+                    image_urls.append(full)
+        
+        return image_urls, video_urls
+
     async def _extract_media_from_scrapling_page(self, response, url, **kwargs):
         """
         Generic extraction of media items using Scrapling response (async version).
@@ -4756,67 +5019,74 @@ class EricWebFileScraper:
                 print("Could not get HTML content from Scrapling response")
                 return []
                 
-            # Extract image URLs
-            img_patterns = [
-                r'<img[^>]+src=["\'](https?://[^"\']+)["\']',
-                r'<img[^>]+srcset=["\'](https?://[^"\']+)["\']',
-                r'url\(["\']?(https?://[^"\'()]+)["\']?\)',  # CSS background images
-            ]
-            
             seen_urls = set()
+            page_domain = urlparse(url).netloc
+            image_title = f"Image from {page_domain}"
+            video_title = f"Video from {page_domain}"
             
-            # Process patterns based on what we want to download
-            if kwargs.get('download_images', True):
-                for pattern in img_patterns:
-                    matches = re.findall(pattern, html_content)
-                    for img_url in matches:
-                        # Skip duplicates and invalid URLs
-                        if img_url in seen_urls or not img_url or img_url.startswith('data:'):
-                            continue
-                        
-                        seen_urls.add(img_url)
+            download_images = kwargs.get('download_images', True)
+            download_videos = kwargs.get('download_videos', False)
+            
+            # Parse the document once with lxml; fall back to the regex scan if it is unavailable or fails
+            scanned = self._scan_html_media(html_content, url) if LXML_AVAILABLE else None
+            if scanned:
+                image_urls, video_urls = scanned
+            else:
+                image_urls = (
+                    [u for match in _HTML_IMAGE_URL_RE.finditer(html_content) for u in match.groups()]
+                    if download_images else []
+                )
+                video_urls = _HTML_VIDEO_URL_RE.findall(html_content) if download_videos else []
+            
+            if download_images:
+                for img_url in image_urls:
+                    # Skip duplicates (compared in normalized form) and invalid URLs
+                    if not img_url or img_url.startswith('data:'):
+                        continue
+                    url_key = _media_url_key(img_url)
+                    if url_key in seen_urls:
+                        continue
+                    
+                    seen_urls.add(url_key)
+                    
+                    # Skip common non-content images
+                    if _PLACEHOLDER_IMAGE_RE.search(img_url):
+                        continue
                         
-                        # Skip common non-content images
-                        if any(x in img_url.lower() for x in ['spacer.gif', 'pixel.gif', 'transparent.gif', 'icon']):
-                            continue
-                            
-                        # Add to media items
-                        media_items.append({
-                            'url': img_url,
-                            'title': "Image from " + urlparse(url).netloc,
-                            'source_url': url,
-                            'type': 'image'
-                        })
+                    # Add to media items
+                    media_items.append({
+                        'url': img_url,
+                        'title': image_title,
+                        'source_url': url,
+                        'type': 'image'
+                    })
             
             # Extract video URLs if enabled
-            if kwargs.get('download_videos', False):
-                video_patterns = [
-                    r'<video[^>]+src=["\'](https?://[^"\']+)["\']',
-                    r'<source[^>]+src=["\'](https?://[^"\']+)["\']'
-                ]
-                
-                for pattern in video_patterns:
-                    matches = re.findall(pattern, html_content)
-                    for video_url in matches:
-                        if video_url in seen_urls or not video_url:
-                            continue
-                            
-                        seen_urls.add(video_url)
+            if download_videos:
+                for video_url in video_urls:
+                    if not video_url:
+                        continue
+                    url_key = _media_url_key(video_url)
+                    if url_key in seen_urls:
+                        continue
                         
-                        # Add to media items
-                        media_items.append({
-                            'url': video_url,
-                            'title': "Video from " + urlparse(url).netloc,
-                            'source_url': url,
-                            'type': 'video'
-                        })
+                    seen_urls.add(url_key)
+                    
+                    # Add to media items
+                    media_items.append({
+                        'url': video_url,
+                        'title': video_title,
+                        'source_url': url,
+                        'type': 'video'
+                    })
                     
             print(f"Generic Scrapling extraction found {len(media_items)} media items")
             return media_items
             
         except Exception as e:
             print(f"Error during generic Scrapling extraction: {e}")
-            traceback.print_exc()
+            if self.debug_mode:
+                traceback.print_exc()
             return []
 
 
@@ -4848,7 +5118,8 @@ class EricWebFileScraper:
                         except Exception as rec_err:
                             print(f"Recovery action failed: {rec_err}")
                 else:
-                    traceback.print_exc() if self.debug_mode else None
+                    if self.debug_mode:
+                        traceback.print_exc()
                     return None
 
     # ---  Advanced Media types ---
@@ -4857,39 +5128,20 @@ class EricWebFileScraper:
         audio_items = []
         
         try:
-            audio_locator = page.locator("audio, audio source")
-            audio_count = await audio_locator.count()
-            print(f"Found {audio_count} potential audio elements")
+            # src and parent title text for every audio element in one evaluate, instead of
+            # ~5 Playwright round-trips per element
+            audio_sources = await page.evaluate(_JS_AUDIO_SOURCES)
+            print(f"Found {len(audio_sources)} potential audio elements")
             
-            for i in range(audio_count):
-                audio = audio_locator.nth(i)
-                
-                audio_url = await audio.get_attribute("src")
-                if not audio_url or audio_url.startswith('data:'):
-                    continue
-                    
-                if audio_url.startswith('/'):
-                    parsed = urlparse(page.url)
-                    base = f"{parsed.scheme}://{parsed.netloc}"
-                    audio_url = urljoin(base, audio_url)
-                
-                title = ""
-                try:
-                    parent = audio.locator("xpath=./parent::*").first
-                    title_elem = parent.locator(".title, [title], [aria-label]").first
-                    title_visible = await title_elem.is_visible(timeout=500)
-                    if title_visible:
-                        text = await title_elem.inner_text()
-                        title_attr = await title_elem.get_attribute("title")
-                        aria = await title_elem.get_attribute("aria-label")
-                        title = text or title_attr or aria
-                except:
-                    pass
-                
+            # The browser already resolved src against the page (and dropped data: URLs)
+            page_url = page.url
+            audio_title = f"Audio from {urlparse(page_url).netloc}"
+            
+            for audio_url, title in audio_sources:
                 audio_items.append({
                     'url': audio_url,
-                    'title': title or "Audio from " + urlparse(page.url).netloc,
-                    'source_url': page.url,
+                    'title': title or audio_title,
+                    'source_url': page_url,
                     'type': 'audio'
                 })
         
@@ -4913,43 +5165,44 @@ class EricWebFileScraper:
         if not metadata_items:
             return None
         
+        export_format = format.lower()
         try:
-            if format.lower() == "json":
-                # Export as JSON
+            if export_format == "json":
+                # Export as JSON, one item per line; each item is encoded on its own (orjson if
+                # installed) and written as it is produced instead of building the whole document first
                 output_file = os.path.join(output_path, "metadata_export.json")
-                with open(output_file, "w", encoding="utf-8") as f:
-                    json.dump(metadata_items, f, indent=2)
+                with open(output_file, "w", encoding="utf-8", buffering=_EXPORT_BUFFER_SIZE) as f:
+                    f.write("[\n")
+                    for i, item in enumerate(metadata_items):
+                        if i:
+                            f.write(",\n")
+                        f.write("  ")
+                        f.write(_json_dumps(item))
+                    f.write("\n]\n")
                 
-            elif format.lower() == "csv":
+            elif export_format == "csv":
                 # Export as CSV
                 import csv
                 output_file = os.path.join(output_path, "metadata_export.csv")
                 
-                # Get all possible fields
-                fields = set()
-                for item in metadata_items:
-                    fields.update(item.keys())
-                
-                # Sort fields to ensure consistent output
-                fields = sorted(list(fields))
+                # Get all possible fields, sorted to ensure consistent output
+                fields = sorted(set().union(*(item.keys() for item in metadata_items)))
                 
-                with open(output_file, "w", encoding="utf-8", newline="") as f:
+                with open(output_file, "w", encoding="utf-8", newline="", buffering=_EXPORT_BUFFER_SIZE) as f:
                     writer = csv.DictWriter(f, fieldnames=fields)
                     writer.writeheader()
-                    for item in metadata_items:
-                        writer.writerow(item)
+                    writer.writerows(metadata_items)
                 
-            elif format.lower() == "md":
+            elif export_format == "md":
                 # Export as Markdown
                 output_file = os.path.join(output_path, "metadata_export.md")
-                with open(output_file, "w", encoding="utf-8") as f:
+                with open(output_file, "w", encoding="utf-8", buffering=_EXPORT_BUFFER_SIZE) as f:
                     f.write("# Media Metadata Export\n\n")
                     f.write(f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
                     
                     for i, item in enumerate(metadata_items):
                         f.write(f"## Item {i+1}\n\n")
-                        for key, value in item.items():
-                            f.write(f"- **{key}**: {value}\n")
+                        f.writelines(f"- **{key}**: {value}\n" for key, value in item.items())
                         f.write("\n")
             
             else:
@@ -4963,6 +5216,84 @@ class EricWebFileScraper:
             print(f"Error exporting metadata: {e}")
             return None
 
+class ImageHashCache:
+    """
+    Perceptual-hash dedup cache persisted in a SQLite file next to the downloads.
+
+    Supports the dict operations the download queues use (get, in, [], []=) so it
+    can stand in for the in-memory downloaded_images_cache. Entries whose file no
+    longer exists on disk are treated as missing.
+    """
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA mmap_size=268435456")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS image_hashes ("
+            "hash BLOB PRIMARY KEY, filename TEXT, filepath TEXT, width INTEGER, height INTEGER, url TEXT)"
+        )
+
+    @staticmethod
+    def _key(file_hash):
+        """Stores hashes as raw bytes; ImageHash objects and their hex strings map to the same key."""
+        hex_hash = str(file_hash)
+        try:
+            return bytes.fromhex(hex_hash)
+        except ValueError:
+            return hex_hash.encode()
+
+    def get(self, file_hash, default=None):
+        row = self.conn.execute(
+            "SELECT filename, filepath, width, height, url FROM image_hashes WHERE hash = ?",
+            (self._key(file_hash),)
+        ).fetchone()
+        if row is None:
+            return default
+        if not os.path.exists(row[1]):
+            # File was removed since it was cached, forget it
+            self.conn.execute("DELETE FROM image_hashes WHERE hash = ?", (self._key(file_hash),))
+            return default
+        return {'filename': row[0], 'filepath': row[1], 'width': row[2], 'height': row[3], 'url': row[4]}
+
+    def __contains__(self, file_hash):
+        return self.get(file_hash) is not None
+
+    def __getitem__(self, file_hash):
+        info = self.get(file_hash)
+        if info is None:
+            raise KeyError(file_hash)
+        return info
+
+    def __setitem__(self, file_hash, info):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO image_hashes (hash, filename, filepath, width, height, url) VALUES (?, ?, ?, ?, ?, ?)",
+            (self._key(file_hash), info.get('filename'), info.get('filepath'),
+             info.get('width', 0), info.get('height', 0), info.get('url'))
+        )
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM image_hashes").fetchone()[0]
+
+    def update(self, entries):
+        """Bulk-inserts entries from a {hash: info} dict (e.g. rebuilt from previous run metadata)."""
+        self.conn.execute("BEGIN")
+        try:
+            for file_hash, info in entries.items():
+                self[file_hash] = info
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def close(self):
+        try:
+            self.conn.close()
+        except Exception as e:
+            print(f"Error closing image hash cache: {e}")
+
+
 class SessionManager:
     """
     Manages browser sessions and authentication state with clear async/sync separation.
@@ -4971,34 +5302,48 @@ class SessionManager:
         self.base_path = base_path
         self.active_sessions = {}
         self.session_metadata = {}
+        self._metadata_dirty = False
+        # domain -> (session file mtime_ns, parsed storage state), so repeated loads skip the JSON decode
+        self._storage_state_cache = {}
         
         # Create sessions directory if it doesn't exist
         os.makedirs(self.base_path, exist_ok=True)
         self._load_session_metadata()
+        
+        # Session files on disk, listed once so has_valid_session needs no stat per request;
+        # store_session/delete_session keep it in sync
+        with os.scandir(self.base_path) as entries:
+            self._existing_sessions = {
+                entry.name for entry in entries
+                if entry.name.endswith('_session.json') and entry.is_file()
+            }
     
     def _get_domain_session_path(self, domain):
         """Get path to session storage for a domain. (Sync)"""
-        # Sanitize domain for filename
-        safe_domain = re.sub(r'[^\w\-\.]', '_', domain)
-        return os.path.join(self.base_path, f"{safe_domain}_session.json")
+        return os.path.join(self.base_path, _session_file_name(domain))
     
     def _load_session_metadata(self):
         """Load metadata about all stored sessions. (Sync)"""
         metadata_path = os.path.join(self.base_path, "sessions_metadata.json")
         if os.path.exists(metadata_path):
             try:
-                with open(metadata_path, 'r') as f:
-                    self.session_metadata = json.load(f)
+                self.session_metadata = _json_load_file(metadata_path)
             except Exception as e:
                 print(f"Error loading session metadata: {e}")
                 self.session_metadata = {}
     
     def _save_session_metadata(self):
-        """Save metadata about all stored sessions. (Sync)"""
+        """Save metadata about all stored sessions if it changed since the last save. (Sync)"""
+        if not self._metadata_dirty:
+            return
         metadata_path = os.path.join(self.base_path, "sessions_metadata.json")
+        tmp_path = metadata_path + ".tmp"
         try:
-            with open(metadata_path, 'w') as f:
-                json.dump(self.session_metadata, f, indent=2)
+            # Write a temp file and swap it in, so a crash mid-write can't leave truncated JSON
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(_json_dumps(self.session_metadata))
+            os.replace(tmp_path, metadata_path)
+            self._metadata_dirty = False
         except Exception as e:
             print(f"Error saving session metadata: {e}")
     
@@ -5009,8 +5354,7 @@ class SessionManager:
             expiry = self.session_metadata[domain].get('expires_at', 0)
             if expiry == 0 or expiry > time.time():
                 # Check if session file exists
-                session_path = self._get_domain_session_path(domain)
-                return os.path.exists(session_path)
+                return _session_file_name(domain) in self._existing_sessions
         return False
     
     def get_session_path(self, domain):
@@ -5033,7 +5377,9 @@ class SessionManager:
             session_path = self._get_domain_session_path(domain)
             
             # Save browser state - this needs to be awaited (async operation)
-            await context.storage_state(path=session_path)
+            state = await context.storage_state(path=session_path)
+            self._storage_state_cache[domain] = (os.stat(session_path).st_mtime_ns, state)
+            self._existing_sessions.add(_session_file_name(domain))
             
             # Update metadata (sync operation)
             self.session_metadata[domain] = {
@@ -5041,6 +5387,7 @@ class SessionManager:
                 'expires_at': time.time() + expiry_seconds,
                 'path': session_path
             }
+            self._metadata_dirty = True
             
             # Save metadata (sync operation)
             self._save_session_metadata()
@@ -5066,24 +5413,37 @@ class SessionManager:
             return None
         
         try:
-            session_path = self._get_domain_session_path(domain)
             # This needs to be awaited (async operation)
-            context = await browser.new_context(storage_state=session_path)
+            context = await browser.new_context(storage_state=self._get_storage_state(domain))
             print(f"Loaded session for {domain}")
             return context
         except Exception as e:
             print(f"Error loading session for {domain}: {e}")
             return None
     
+    def _get_storage_state(self, domain):
+        """Parsed storage state for a domain, re-read only when the session file changes. (Sync)"""
+        session_path = self._get_domain_session_path(domain)
+        mtime_ns = os.stat(session_path).st_mtime_ns
+        cached = self._storage_state_cache.get(domain)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        state = _json_load_file(session_path)
+        self._storage_state_cache[domain] = (mtime_ns, state)
+        return state
+    
     def delete_session(self, domain):
         """Delete a stored session for a domain. (Sync)"""
         try:
+            self._storage_state_cache.pop(domain, None)
+            self._existing_sessions.discard(_session_file_name(domain))
             session_path = self._get_domain_session_path(domain)
             if os.path.exists(session_path):
                 os.remove(session_path)
             
             if domain in self.session_metadata:
                 del self.session_metadata[domain]
+                self._metadata_dirty = True
                 self._save_session_metadata()
             
             print(f"Deleted session for {domain}")
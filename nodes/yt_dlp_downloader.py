@@ -43,20 +43,136 @@ Version: 1.0.0
 Date: January 2025
 """
 
+import errno
+import importlib.util
 import os
+import queue
 import re
-import shutil
 import json
 import subprocess
 import tempfile
+import threading
+import time
 import urllib.parse
 import folder_paths
 
-from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# yt-dlp as a library, so downloads run in-process instead of spawning a new Python per run.
+# The yt-dlp executable is still used when only the standalone binary is installed.
+# The package is only located here; it is imported on first download to keep node loading fast.
+YT_DLP_AVAILABLE = importlib.util.find_spec("yt_dlp") is not None
+
+# Hosts of the sites _build_command reports as targets, matched as a whole host name
+_SITE_RE = re.compile(
+    r'(?:^|[/.@])(youtube\.com|youtu\.be|twitter\.com|x\.com|tiktok\.com|instagram\.com|twitch\.tv)(?=[:/?#]|$)',
+    re.IGNORECASE,
+)
+_HOST_TO_SITE = {
+    'youtube.com': 'youtube',
+    'youtu.be': 'youtube',
+    'twitter.com': 'twitter',
+    'x.com': 'twitter',
+    'tiktok.com': 'tiktok',
+    'instagram.com': 'instagram',
+    'twitch.tv': 'twitch',
+}
+
+# The yt-dlp executable is stopped after printing nothing for this many seconds
+_STALL_TIMEOUT = 600
+# Prefix of the line yt-dlp prints (--print after_move:...) for every finished file,
+# followed by '<original URL>\t<file path>'
+_DOWNLOADED_PREFIX = "downloaded="
+# '[download]  42.0% of ...' lines from --newline progress output
+_PROGRESS_LINE_RE = re.compile(r'\[download\]\s+[\d.]+%')
+
+# Package root; relative config and cookie file paths are resolved against it
+_PDF_TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Per-output-directory record of URLs whose files are already on disk
+_URL_CACHE_FILE = ".ytdlp_cache.sqlite3"
+
+# Metadata, config, temp and cookie files that are never counted or organized as downloads
+_SKIP_RE = re.compile(r'\.(?:json|txt|log|tmp)$|^tmp|cookie', re.IGNORECASE)
+
+# File extension -> organization subfolder ('.webm' can also be audio-only, see _organize_files_by_type)
+_EXT_CATEGORY = {
+    **dict.fromkeys(('.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma', '.opus'), 'audio'),
+    **dict.fromkeys(('.mp4', '.webm', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.m4v', '.3gp', '.ogv',
+                     '.mpg', '.mpeg', '.ts', '.m2ts'), 'videos'),
+    **dict.fromkeys(('.srt', '.vtt', '.ass', '.ssa', '.sub', '.idx', '.smi', '.rt', '.sbv'), 'subtitles'),
+}
+
+
+@lru_cache(maxsize=4)
+def _abs_output_dir(output_directory: str) -> str:
+    """Absolute form of ComfyUI's output directory (cached per value, so a changed setting is honoured)."""
+    return os.path.abspath(output_directory)
+
+
+def _url_key(url: str) -> str:
+    """Key for spotting duplicate URLs: scheme and host lowercased, trailing '/' removed."""
+    try:
+        parts = urllib.parse.urlsplit(url)
+    except ValueError:
+        return url
+    return urllib.parse.urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), parts.query, parts.fragment)
+    )
+
+
+class _DebugLog:
+    """
+    Debug lines for the node summary, formatted only when the summary is built.
+
+    append() takes a finished string like a list; add() stores a %-style format and its
+    arguments, so messages written in loops cost a tuple instead of a formatted string.
+    """
+
+    def __init__(self):
+        self._records = []
+
+    def append(self, message: str) -> None:
+        self._records.append((message, ()))
+
+    def add(self, fmt: str, *args: Any) -> None:
+        self._records.append((fmt, args))
+
+    def __iter__(self) -> Iterator[str]:
+        for fmt, args in self._records:
+            yield fmt % args if args else fmt
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class _YtDlpLogCollector:
+    """yt-dlp logger that collects output in place of the subprocess stdout/stderr pipes."""
+
+    def __init__(self):
+        self.stdout_lines = []
+        self.stderr_lines = []
+
+    def debug(self, msg):
+        self.stdout_lines.append(msg)
+
+    def info(self, msg):
+        self.stdout_lines.append(msg)
+
+    def warning(self, msg):
+        self.stderr_lines.append(msg)
+
+    def error(self, msg):
+        self.stderr_lines.append(msg)
 
 
 class YtDlpDownloader:
+    # Results of the yt-dlp / ffmpeg availability probes, kept for the Python session
+    _tool_available: Dict[str, bool] = {}
+
     def __init__(
         self,
         url_list: List[str] = None,
@@ -77,10 +193,13 @@ class YtDlpDownloader:
         embed_subtitles: bool = False,
         write_info_json: bool = True,
         organize_files: bool = True,
+        legacy_organize: bool = False,
+        verbose: bool = False,
         # Advanced options
         extra_options: str = "",
         rate_limit: str = "",
-        concurrent_fragments: str = "1",
+        concurrent_fragments: int = 4,
+        max_parallel_videos: int = 4,
         playlist_start: str = "",
         playlist_end: str = "",
     ):
@@ -102,37 +221,53 @@ class YtDlpDownloader:
         self.embed_subtitles = embed_subtitles
         self.write_info_json = write_info_json
         self.organize_files = organize_files
+        self.legacy_organize = legacy_organize  # move files after download instead of placing them directly
+        self.verbose = verbose  # per-file lines in debug_info (summaries are always logged)
         self.extra_options = extra_options
         self.rate_limit = rate_limit
-        self.concurrent_fragments = concurrent_fragments
+        # Workflows saved before this input became an INT hold one of the old "1"/"2"/"4"/"8" combo strings
+        try:
+            concurrent_fragments = int(concurrent_fragments or 1)
+        except (TypeError, ValueError):
+            concurrent_fragments = 4
+        self.concurrent_fragments = str(min(16, max(1, concurrent_fragments)))
+        self.max_parallel_videos = max(1, int(max_parallel_videos or 1))
         self.playlist_start = playlist_start
         self.playlist_end = playlist_end
         
         # Initialize debug info
-        self.debug_info = []  # Store debug information for status reporting
+        self.debug_info = _DebugLog()  # Store debug information for status reporting
+
+    @classmethod
+    def _probe_tool(cls, executable: str, version_flag: str) -> bool:
+        """Run '<executable> <version_flag>' once per session and cache whether it succeeded."""
+        if executable not in cls._tool_available:
+            try:
+                result = subprocess.run(
+                    [executable, version_flag], capture_output=True, text=True, timeout=10
+                )
+                cls._tool_available[executable] = result.returncode == 0
+            except (subprocess.TimeoutExpired, FileNotFoundError):
+                cls._tool_available[executable] = False
+        return cls._tool_available[executable]
+
+    @classmethod
+    def invalidate_tool_cache(cls) -> None:
+        """Forget the cached yt-dlp / ffmpeg probes, e.g. after installing one of them."""
+        cls._tool_available.clear()
 
     def _check_yt_dlp_installed(self) -> bool:
         """Check if yt-dlp is installed and accessible."""
-        try:
-            result = subprocess.run(
-                ["yt-dlp", "--version"], capture_output=True, text=True, timeout=10
-            )
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
+        if YT_DLP_AVAILABLE:
+            return True
+        return self._probe_tool("yt-dlp", "--version")
 
     def _check_ffmpeg_installed(self) -> bool:
         """Check if ffmpeg is installed (needed for audio extraction and format conversion)."""
-        try:
-            result = subprocess.run(
-                ["ffmpeg", "-version"], capture_output=True, text=True, timeout=10
-            )
-            if result.returncode == 0:
-                self.debug_info.append("✅ FFmpeg is available for audio extraction and merging")
-                return True
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-        
+        if self._probe_tool("ffmpeg", "-version"):
+            self.debug_info.append("✅ FFmpeg is available for audio extraction and merging")
+            return True
+
         self.debug_info.append("⚠️ FFmpeg not found - audio extraction and format merging may not work")
         return False
 
@@ -140,23 +275,29 @@ class YtDlpDownloader:
         command = ["yt-dlp"]
 
         # Output directory
-        command += ["-o", f"{self.output_dir}/%(uploader)s/%(title)s.%(ext)s"]
+        if self.organize_files and not self.legacy_organize:
+            # Let yt-dlp write each file straight into its type subfolder of the profile directory.
+            # Audio-only formats report vcodec 'none'; media_dir is only set for those.
+            profile_dir = f"{self.output_dir}/%(uploader)s"
+            media_dir = "audio" if self.extract_audio else "%(media_dir&audio|videos)s"
+            command += [
+                "-o", f"{profile_dir}/{media_dir}/%(title)s.%(ext)s",
+                "-o", f"subtitle:{profile_dir}/subtitles/%(title)s.%(ext)s",
+                "-o", f"thumbnail:{profile_dir}/other/%(title)s.%(ext)s",
+                "-o", f"description:{profile_dir}/other/%(title)s.%(ext)s",
+                "-o", f"infojson:{profile_dir}/%(title)s.%(ext)s",
+                "--parse-metadata", "video:%(vcodec)s:(?P<media_dir>none)",
+            ]
+        else:
+            command += ["-o", f"{self.output_dir}/%(uploader)s/%(title)s.%(ext)s"]
         self.debug_info.append(f"📁 Output directory: {self.output_dir}")
 
         # Detect target sites for better configuration
         target_sites = set()
         for url in urls:
-            if 'youtube.com' in url or 'youtu.be' in url:
-                target_sites.add('youtube')
-            elif 'twitter.com' in url or 'x.com' in url:
-                target_sites.add('twitter')
-            elif 'tiktok.com' in url:
-                target_sites.add('tiktok')
-            elif 'instagram.com' in url:
-                target_sites.add('instagram')
-            elif 'twitch.tv' in url:
-                target_sites.add('twitch')
-            # Add more site detection as needed
+            match = _SITE_RE.search(url)
+            if match:
+                target_sites.add(_HOST_TO_SITE[match.group(1).lower()])
         
         if target_sites:
             self.debug_info.append(f"🎯 Detected target sites: {', '.join(target_sites)}")
@@ -213,10 +354,9 @@ class YtDlpDownloader:
             command += ["--limit-rate", self.rate_limit]
             self.debug_info.append(f"⚡ Rate limit: {self.rate_limit}")
 
-        # Concurrent fragments
-        if self.concurrent_fragments and self.concurrent_fragments != "1":
-            command += ["--concurrent-fragments", self.concurrent_fragments]
-            self.debug_info.append(f"⚡ Concurrent fragments: {self.concurrent_fragments}")
+        # Concurrent fragments (always passed so HLS/DASH fragments download in parallel)
+        command += ["--concurrent-fragments", self.concurrent_fragments]
+        self.debug_info.append(f"⚡ Concurrent fragments: {self.concurrent_fragments}")
 
         # Playlist options
         if self.playlist_start:
@@ -231,8 +371,9 @@ class YtDlpDownloader:
         command += ["--no-warnings"]  # Reduce noise
         command += ["--ignore-errors"]  # Continue on errors
         command += ["--retries", "3"]  # Retry failed downloads
+        command += ["--buffer-size", "64K"]  # Start from 64 KiB writes instead of 1 KiB
         
-        self.debug_info.append("🔧 Added standard options: no-warnings, ignore-errors, 3 retries")
+        self.debug_info.append("🔧 Added standard options: no-warnings, ignore-errors, 3 retries, 64K buffer")
 
         # Parse any extra options from the extra_options field
         if self.extra_options:
@@ -249,6 +390,14 @@ class YtDlpDownloader:
 
         return command
 
+    @staticmethod
+    def _iter_urls(lines: Iterable[str]) -> Iterator[str]:
+        """Yield the stripped lines that are neither empty nor '#' comments."""
+        for line in lines:
+            line = line.strip()
+            if line and line[0] != '#':
+                yield line
+
     def _parse_extra_options(self, extra_options: str) -> List[str]:
         """Parse extra command-line options for yt-dlp."""
         try:
@@ -319,18 +468,24 @@ class YtDlpDownloader:
         except Exception as e:
             self.debug_info.append(f"❌ Browser cookie test failed: {str(e)}")
 
-    def _organize_files_by_type(self, downloaded_files: List[str]) -> None:
-        """Sort downloaded files into subfolders by type (videos, audio, etc.) within each profile directory"""
+    def _organize_files_by_type(self, downloaded_files: List[str]) -> Dict[str, str]:
+        """
+        Sort downloaded files into subfolders by type (videos, audio, etc.) within each profile directory.
+
+        Returns a mapping of each file that still exists to its path after organization (files that
+        were not moved map to their own path).
+        """
         if not downloaded_files:
             self.debug_info.append("📂 No files to organize")
-            return
-            
+            return {}
+
+        # Final location of each file, updated as files are moved
+        final_paths = dict.fromkeys(downloaded_files)
+
+        # webm is only worth probing when the download could be audio-only
+        webm_may_be_audio = self.extract_audio or (self.format_selector or "").startswith("bestaudio")
+
         try:
-            # Define file type categories
-            video_extensions = {'.mp4', '.webm', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.m4v', '.3gp', '.ogv', '.mpg', '.mpeg', '.ts', '.m2ts'}
-            audio_extensions = {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma', '.opus', '.webm'}  # webm can be audio-only
-            subtitle_extensions = {'.srt', '.vtt', '.ass', '.ssa', '.sub', '.idx', '.smi', '.rt', '.sbv'}
-            
             # Group files by their parent directory (profile/channel directories)
             files_by_profile = {}
             
@@ -341,10 +496,7 @@ class YtDlpDownloader:
                     
                 # Skip files that shouldn't be organized
                 filename = os.path.basename(file_path)
-                if (filename.endswith((".json", ".txt", ".log", ".tmp")) or 
-                    filename.startswith("tmp") or 
-                    "cookie" in filename.lower() or
-                    filename.startswith(".")):
+                if _SKIP_RE.search(filename) or filename.startswith("."):
                     continue
                     
                 # Get the relative path from output_dir
@@ -359,13 +511,15 @@ class YtDlpDownloader:
                         if profile_dir not in files_by_profile:
                             files_by_profile[profile_dir] = []
                         files_by_profile[profile_dir].append(file_path)
-                        self.debug_info.append(f"📄 Queued {filename} for organization in {os.path.relpath(profile_dir, self.output_dir)}")
+                        if self.verbose:
+                            self.debug_info.add("📄 Queued %s for organization in %s", filename, os.sep.join(path_parts[:-1]))
                     else:
                         # File is at root level - organize in root level folders
                         if self.output_dir not in files_by_profile:
                             files_by_profile[self.output_dir] = []
                         files_by_profile[self.output_dir].append(file_path)
-                        self.debug_info.append(f"📄 Queued {filename} for organization in root")
+                        if self.verbose:
+                            self.debug_info.add("📄 Queued %s for organization in root", filename)
                         
                 except Exception as e:
                     self.debug_info.append(f"⚠️ Error processing path {file_path}: {e}")
@@ -376,9 +530,15 @@ class YtDlpDownloader:
             
             if not files_by_profile:
                 self.debug_info.append("📂 No valid files found for organization")
-                return
+                return {p: p for p in downloaded_files if os.path.exists(p)}
                 
             total_files_moved = {'videos': 0, 'audio': 0, 'subtitles': 0, 'other': 0}
+
+            webm_categories = {}
+            if webm_may_be_audio:
+                webm_categories = self._classify_webm_files(
+                    [p for files_list in files_by_profile.values() for p in files_list if p.lower().endswith('.webm')]
+                )
             
             # Organize files within each profile directory
             for profile_dir, files_list in files_by_profile.items():
@@ -386,80 +546,70 @@ class YtDlpDownloader:
                     continue
                     
                 profile_name = os.path.relpath(profile_dir, self.output_dir) if profile_dir != self.output_dir else "root"
-                self.debug_info.append(f"📂 Processing {len(files_list)} files in {profile_name}")
-                
-                # Create type-specific subdirectories within this profile directory
-                type_dirs = {
-                    'videos': os.path.join(profile_dir, "videos"),
-                    'audio': os.path.join(profile_dir, "audio"), 
-                    'subtitles': os.path.join(profile_dir, "subtitles"),
-                    'other': os.path.join(profile_dir, "other")
-                }
-                
-                profile_files_moved = {'videos': 0, 'audio': 0, 'subtitles': 0, 'other': 0}
+                self.debug_info.add("📂 Processing %d files in %s", len(files_list), profile_name)
                 
+                # Categorize the files first so only the subdirectories this profile needs are created
+                categorized = []
                 for file_path in files_list:
-                    if not os.path.exists(file_path):
-                        self.debug_info.append(f"⚠️ File disappeared during organization: {os.path.basename(file_path)}")
-                        continue
-                        
-                    # Get file extension and determine category
                     ext = os.path.splitext(file_path)[1].lower()
-                    filename = os.path.basename(file_path)
-                    
-                    # Special handling for webm files - check if they're audio-only
-                    if ext == '.webm':
-                        # Try to determine if it's audio-only by checking with ffprobe if available
-                        try:
-                            result = subprocess.run(
-                                ["ffprobe", "-v", "quiet", "-show_streams", "-select_streams", "v", file_path],
-                                capture_output=True, text=True, timeout=5
-                            )
-                            if result.returncode == 0 and result.stdout.strip():
-                                # Has video stream
-                                category = 'videos'
-                            else:
-                                # No video stream, likely audio-only
-                                category = 'audio'
-                        except (subprocess.TimeoutExpired, FileNotFoundError):
-                            # Can't determine, default based on extract_audio setting
-                            category = 'audio' if self.extract_audio else 'videos'
-                    else:
-                        # Determine target directory
-                        if ext in video_extensions:
-                            category = 'videos'
-                        elif ext in audio_extensions:
-                            category = 'audio'
-                        elif ext in subtitle_extensions:
-                            category = 'subtitles'
-                        else:
-                            category = 'other'
-                    
-                    target_dir = type_dirs[category]
-                    
-                    # Create target directory if it doesn't exist
+                    # webm files may be audio-only, classified before the loop
+                    categorized.append((file_path, webm_categories.get(file_path) or _EXT_CATEGORY.get(ext, 'other')))
+
+                # Create type-specific subdirectories within this profile directory up front, reading
+                # the names already in each one for conflict handling
+                type_dirs = {}
+                taken_names = {}
+                next_suffix = {}  # (category, filename) -> next counter for name conflicts
+                for category in dict.fromkeys(category for _, category in categorized):
+                    target_dir = os.path.join(profile_dir, category)
                     try:
                         os.makedirs(target_dir, exist_ok=True)
+                        with os.scandir(target_dir) as entries:
+                            taken_names[category] = {entry.name for entry in entries}
                     except Exception as e:
                         self.debug_info.append(f"❌ Failed to create directory {target_dir}: {e}")
                         continue
-                    
-                    # Move file to appropriate subfolder
-                    target_path = os.path.join(target_dir, filename)
-                    
-                    # Handle name conflicts
-                    counter = 1
-                    base_name, extension = os.path.splitext(filename)
-                    while os.path.exists(target_path):
+                    type_dirs[category] = target_dir
+
+                profile_files_moved = {'videos': 0, 'audio': 0, 'subtitles': 0, 'other': 0}
+                
+                for file_path, category in categorized:
+                    # Existence was checked while grouping; a file that vanished since fails the move below
+                    if category not in type_dirs:
+                        continue  # directory could not be created
+                    target_dir = type_dirs[category]
+                    filename = os.path.basename(file_path)
+
+                    # Handle name conflicts against the directory listing instead of probing each name;
+                    # repeated names continue from the last suffix used instead of counting from 1 again
+                    taken = taken_names[category]
+                    target_filename = filename
+                    if target_filename in taken:
+                        counter = next_suffix.get((category, filename), 1)
+                        base_name, extension = os.path.splitext(filename)
                         target_filename = f"{base_name}_{counter}{extension}"
-                        target_path = os.path.join(target_dir, target_filename)
-                        counter += 1
-                    
+                        while target_filename in taken:
+                            counter += 1
+                            target_filename = f"{base_name}_{counter}{extension}"
+                        next_suffix[(category, filename)] = counter + 1
+                    taken.add(target_filename)
+
+                    # Move file to appropriate subfolder (same filesystem, so a plain rename)
+                    target_path = os.path.join(target_dir, target_filename)
                     try:
-                        shutil.move(file_path, target_path)
+                        try:
+                            os.replace(file_path, target_path)
+                        except OSError as e:
+                            if e.errno != errno.EXDEV:
+                                raise
+                            # output_dir spans mount points
+                            import shutil
+                            shutil.move(file_path, target_path)
+                        final_paths[file_path] = target_path
                         profile_files_moved[category] += 1
                         total_files_moved[category] += 1
-                        self.debug_info.append(f"📁 Moved {filename} to {profile_name}/{category}/ folder")
+                        if self.verbose:
+                            self.debug_info.add("📁 Moved %s to %s/%s/ folder", filename, profile_name, category)
                     except Exception as e:
                         self.debug_info.append(f"❌ Failed to move {filename}: {e}")
                         continue
@@ -467,12 +617,12 @@ class YtDlpDownloader:
                 # Log summary for this profile
                 profile_total = sum(profile_files_moved.values())
                 if profile_total > 0:
-                    self.debug_info.append(f"📂 Organized {profile_total} files in {profile_name}:")
+                    self.debug_info.add("📂 Organized %d files in %s:", profile_total, profile_name)
                     for category, count in profile_files_moved.items():
                         if count > 0:
-                            self.debug_info.append(f"   📁 {category}: {count} files")
+                            self.debug_info.add("   📁 %s: %d files", category, count)
                 else:
-                    self.debug_info.append(f"⚠️ No files were moved in {profile_name}")
+                    self.debug_info.add("⚠️ No files were moved in %s", profile_name)
             
             # Overall summary
             total_moved = sum(total_files_moved.values())
@@ -489,6 +639,277 @@ class YtDlpDownloader:
             import traceback
             self.debug_info.append(f"❌ Traceback: {traceback.format_exc()}")
 
+        return {path: moved or path for path, moved in final_paths.items() if moved or os.path.exists(path)}
+
+    def _classify_webm_files(self, webm_paths: List[str]) -> Dict[str, str]:
+        """
+        Decide whether each webm file is a video or audio-only.
+
+        Uses the vcodec from the yt-dlp .info.json written next to the file; ffprobe is only run
+        for files without one.
+        """
+        categories = {}
+        unknown = []
+        for file_path in webm_paths:
+            try:
+                with open(os.path.splitext(file_path)[0] + ".info.json", "r", encoding="utf-8") as f:
+                    vcodec = json.load(f).get("vcodec")
+            except (OSError, ValueError):
+                vcodec = None
+            if vcodec:
+                categories[file_path] = 'audio' if vcodec == 'none' else 'videos'
+            else:
+                unknown.append(file_path)
+
+        for file_path in unknown:
+            # Try to determine if it's audio-only by checking with ffprobe if available
+            try:
+                result = subprocess.run(
+                    ["ffprobe", "-v", "quiet", "-show_streams", "-select_streams", "v", file_path],
+                    capture_output=True, text=True, timeout=5
+                )
+                if result.returncode == 0 and result.stdout.strip():
+                    # Has video stream
+                    categories[file_path] = 'videos'
+                else:
+                    # No video stream, likely audio-only
+                    categories[file_path] = 'audio'
+            except (subprocess.TimeoutExpired, FileNotFoundError):
+                # Can't determine, default based on extract_audio setting
+                categories[file_path] = 'audio' if self.extract_audio else 'videos'
+
+        return categories
+
+    def _run_in_process(self, option_args: List[str], urls: Iterable[str]) -> Tuple[bool, int, str, str, List[Tuple[str, str]]]:
+        """
+        Run the download through the yt_dlp package.
+
+        The CLI arguments from _build_command go through yt_dlp.parse_options, so config files,
+        cookies and extra_options behave exactly as they do for the executable. Output files
+        are reported by yt-dlp's progress and postprocessor hooks as (original URL, path) pairs.
+        """
+        import yt_dlp
+
+        log = _YtDlpLogCollector()
+        produced = []
+
+        def on_progress(d):
+            if d.get("status") == "finished" and d.get("filename"):
+                produced.append((d.get("info_dict", {}).get("original_url", ""), d["filename"]))
+
+        def on_postprocess(d):
+            info = d.get("info_dict", {})
+            if d.get("status") == "finished" and info.get("filepath"):
+                produced.append((info.get("original_url", ""), info["filepath"]))
+
+        try:
+            _, _, _, ydl_opts = yt_dlp.parse_options(option_args)
+            ydl_opts["logger"] = log
+            ydl_opts["noprogress"] = True  # progress bars would only fill the collected log
+            ydl_opts["progress_hooks"] = [on_progress]
+            ydl_opts["postprocessor_hooks"] = [on_postprocess]
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                # One URL at a time so urls can be a queue shared with other workers; keep the
+                # worst return code so an earlier failure is not hidden by a later success
+                returncode = 0
+                for url in urls:
+                    returncode = max(returncode, ydl.download([url]))
+            success = True
+        except SystemExit as e:
+            # Older yt-dlp versions exit from parse_options on invalid arguments
+            success = False
+            returncode = e.code if isinstance(e.code, int) else 2
+            log.error(f"Invalid yt-dlp options: {e}")
+        except Exception as e:
+            success = False
+            returncode = -1
+            log.error(f"Download process failed: {str(e)}")
+            self.debug_info.append(f"❌ Download failed: {e}, but continuing with file organization...")
+
+        return success, returncode, "\n".join(log.stdout_lines), "\n".join(log.stderr_lines), produced
+
+    def _run_subprocess(self, option_args: List[str], targets: List[str]) -> Tuple[bool, int, str, str, List[Tuple[str, str]]]:
+        """
+        Run the download through the yt-dlp executable.
+
+        Output is read line by line while yt-dlp runs, and the process is only stopped when it
+        prints nothing for 10 minutes, so long but live downloads are not killed. yt-dlp prints the
+        final path of every downloaded file, so the output directory does not need to be rescanned.
+        Files sharing a downloaded file's name (subtitles, thumbnails) are picked up from the same
+        directory.
+        """
+        process_success = True
+        process_returncode = 0
+        stdout_lines = []
+        stderr_lines = []
+        downloaded_paths = []
+        last_output = time.monotonic()
+        finished = threading.Event()
+        stalled = False
+
+        def read_stderr(stream):
+            nonlocal last_output
+            for line in stream:
+                last_output = time.monotonic()
+                stderr_lines.append(line.rstrip("\n"))
+
+        def watch_for_stall(process):
+            nonlocal stalled
+            while not finished.wait(5):
+                if time.monotonic() - last_output > _STALL_TIMEOUT:
+                    stalled = True
+                    process.kill()
+                    return
+
+        try:
+            process = subprocess.Popen(
+                ["yt-dlp", *option_args, "--newline", "--progress",
+                 "--print", f"after_move:{_DOWNLOADED_PREFIX}%(original_url)s\t%(filepath)s", *targets],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                universal_newlines=True,
+                bufsize=1,  # line buffered
+                cwd=self.output_dir,  # Set working directory
+            )
+            stderr_reader = threading.Thread(target=read_stderr, args=(process.stderr,), daemon=True)
+            stderr_reader.start()
+            threading.Thread(target=watch_for_stall, args=(process,), daemon=True).start()
+
+            for line in process.stdout:
+                last_output = time.monotonic()
+                line = line.rstrip("\n")
+                if line.startswith(_DOWNLOADED_PREFIX):
+                    source_url, _, path = line[len(_DOWNLOADED_PREFIX):].partition("\t")
+                    downloaded_paths.append((source_url, path))
+                elif not _PROGRESS_LINE_RE.match(line):
+                    # Progress lines only matter while the download is running
+                    stdout_lines.append(line)
+
+            process_returncode = process.wait()
+            stderr_reader.join()
+        except Exception as e:
+            process_success = False
+            process_returncode = -1
+            stderr_lines.append(f"Download process failed: {str(e)}")
+            self.debug_info.append(f"❌ Download failed: {e}, but continuing with file organization...")
+        finally:
+            finished.set()
+
+        if stalled:
+            process_success = False
+            process_returncode = -1
+            stderr_lines.append(f"Download process stalled: no output for {_STALL_TIMEOUT // 60} minutes")
+            self.debug_info.append("⏰ Download stalled, but continuing with file organization...")
+
+        # Sidecar files written next to a media file share its name up to the extension
+        stems_by_dir = {}
+        for source_url, path in downloaded_paths:
+            file_path = os.path.join(self.output_dir, path)
+            if os.path.isfile(file_path):
+                folder, filename = os.path.split(file_path)
+                stems_by_dir.setdefault(folder, {})[os.path.splitext(filename)[0] + "."] = source_url
+
+        # One scandir per directory; DirEntry name and type come from the directory read
+        produced = []
+        for folder, stems in stems_by_dir.items():
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    for stem, source_url in stems.items():
+                        if entry.name.startswith(stem) and entry.is_file():
+                            produced.append((source_url, entry.path))
+                            break
+
+        return process_success, process_returncode, "\n".join(stdout_lines), "\n".join(stderr_lines), produced
+
+    def _run_subprocess_batch(self, option_args: List[str], urls: List[str]) -> Tuple[bool, int, str, str, List[Tuple[str, str]]]:
+        """
+        Run one yt-dlp process for all urls, read from a temporary batch file rather than the
+        command line (Windows caps command lines at 32K characters).
+        """
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8", buffering=1 << 16) as f:
+            f.write("\n".join(urls))
+        try:
+            return self._run_subprocess(option_args, ["--batch-file", f.name])
+        finally:
+            os.remove(f.name)
+
+    def _run_parallel(self, option_args: List[str], urls: List[str]) -> Tuple[bool, int, str, str, List[Tuple[str, str]]]:
+        """
+        Download the URLs with up to max_parallel_videos yt-dlp runs at a time.
+
+        In-process, each worker keeps one YoutubeDL and takes the next URL from a shared queue,
+        so a long video does not hold up the others. The executable gets a round-robin share
+        of the URLs per process, spreading each site's URLs over the processes.
+
+        Downloads are network-bound, so threads are enough. yt-dlp locks the archive file
+        while appending, so concurrent runs can share it.
+        """
+        workers = min(self.max_parallel_videos, len(urls))
+        self.debug_info.append(f"⚡ Downloading {len(urls)} URLs, {workers} at a time")
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="yt-dlp") as executor:
+            if YT_DLP_AVAILABLE:
+                pending = queue.SimpleQueue()
+                for url in urls:
+                    pending.put(url)
+
+                def take_urls():
+                    while True:
+                        try:
+                            yield pending.get_nowait()
+                        except queue.Empty:
+                            return
+
+                futures = [executor.submit(self._run_in_process, option_args, take_urls()) for _ in range(workers)]
+            else:
+                futures = [
+                    executor.submit(self._run_subprocess_batch, option_args, urls[i::workers])
+                    for i in range(workers)
+                ]
+            results = [future.result() for future in futures]
+
+        success = all(r[0] for r in results)
+        returncode = next((r[1] for r in results if r[1] != 0), 0)
+        stdout = "\n".join(r[2] for r in results if r[2])
+        stderr = "\n".join(r[3] for r in results if r[3])
+        produced = [item for r in results for item in r[4]]
+        return success, returncode, stdout, stderr, produced
+
+    def _load_url_cache(self, urls: List[str]) -> set:
+        """Return the keys of the URLs whose recorded files all still exist on disk."""
+        import sqlite3
+        done = set()
+        try:
+            with closing(sqlite3.connect(os.path.join(self.output_dir, _URL_CACHE_FILE))) as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS downloads (url TEXT PRIMARY KEY, paths TEXT, mtime REAL)")
+                for url in urls:
+                    key = _url_key(url)
+                    row = conn.execute("SELECT paths FROM downloads WHERE url = ?", (key,)).fetchone()
+                    if row:
+                        paths = json.loads(row[0])
+                        if paths and all(os.path.isfile(p) for p in paths):
+                            done.add(key)
+        except (sqlite3.Error, ValueError) as e:
+            self.debug_info.append(f"⚠️ URL cache unavailable: {e}")
+        return done
+
+    def _save_url_cache(self, files_by_url: Dict[str, List[str]]) -> None:
+        """Record the files downloaded for each URL key."""
+        if not files_by_url:
+            return
+        import sqlite3
+        now = time.time()
+        try:
+            with closing(sqlite3.connect(os.path.join(self.output_dir, _URL_CACHE_FILE))) as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS downloads (url TEXT PRIMARY KEY, paths TEXT, mtime REAL)")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO downloads (url, paths, mtime) VALUES (?, ?, ?)",
+                    [(key, json.dumps(paths), now) for key, paths in files_by_url.items()],
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            self.debug_info.append(f"⚠️ Could not update URL cache: {e}")
+
     def run(self) -> Dict[str, Any]:
         """Execute the yt-dlp download process."""
         # Check if yt-dlp is installed
@@ -506,107 +927,92 @@ class YtDlpDownloader:
         if self.batch_file:
             if not os.path.exists(self.batch_file):
                 raise FileNotFoundError(f"Batch file not found: {self.batch_file}")
-            with open(self.batch_file, "r", encoding="utf-8") as f:
-                urls = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+            with open(self.batch_file, "r", encoding="utf-8", buffering=1 << 20) as f:
+                url_lines = list(self._iter_urls(f))
         else:
-            urls = [url.strip() for url in self.url_list if url.strip() and not url.strip().startswith('#')]
+            url_lines = list(self._iter_urls(self.url_list))
+
+        # Drop duplicate URLs, keeping the first occurrence
+        unique_urls = {}
+        for url in url_lines:
+            unique_urls.setdefault(_url_key(url), url)
+        urls = list(unique_urls.values())
+        if len(urls) < len(url_lines):
+            self.debug_info.append(f"🔁 Skipped {len(url_lines) - len(urls)} duplicate URLs")
 
         if not urls:
             raise ValueError("No URLs provided for download.")
 
-        # Create output directory and record existing files
+        # Create output directory
         os.makedirs(self.output_dir, exist_ok=True)
-        
-        # Get list of files before download to track new files
-        existing_files = set()
-        if os.path.exists(self.output_dir):
-            for root, dirs, files in os.walk(self.output_dir):
-                for file in files:
-                    if not file.endswith((".json", ".txt")):  # Skip metadata files
-                        existing_files.add(os.path.join(root, file))
+
+        # Skip URLs whose files are already on disk from an earlier run (only when the
+        # download archive is on, i.e. re-downloading is not wanted)
+        cached_keys = self._load_url_cache(urls) if self.use_download_archive else set()
+        if cached_keys:
+            urls = [url for url in urls if _url_key(url) not in cached_keys]
+            self.debug_info.append(f"⏭️ Skipped {len(cached_keys)} URLs already downloaded")
+            if not urls:
+                return {
+                    "command": "",
+                    "stdout": "",
+                    "stderr": "",
+                    "returncode": 0,
+                    "output_dir": self.output_dir,
+                    "downloaded_files": [],
+                    "download_count": 0,
+                    "success": True,
+                }
 
         # Build and execute command
         command = self._build_command(urls)
 
-        # Execute download process with timeout handling
-        process_success = True
-        process_returncode = 0
-        stdout = ""
-        stderr = ""
-        
-        try:
-            process = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                cwd=self.output_dir,  # Set working directory
-            )
-            stdout, stderr = process.communicate(timeout=600)  # 10 minute timeout
-            process_returncode = process.returncode
-        except subprocess.TimeoutExpired:
-            process.kill()
-            process_success = False
-            process_returncode = -1
-            stderr = "Download process timed out after 10 minutes"
-            stdout = ""
-            self.debug_info.append("⏰ Download timed out, but continuing with file organization...")
-        except Exception as e:
-            process_success = False
-            process_returncode = -1
-            stderr = f"Download process failed: {str(e)}"
-            stdout = ""
-            self.debug_info.append(f"❌ Download failed: {e}, but continuing with file organization...")
+        # Options without the trailing URLs / batch file, for runs that pass their own URLs
+        option_args = command[1:-2] if self.batch_file else command[1:len(command) - len(urls)]
 
-        # Count only newly downloaded files (files that weren't there before)
-        new_downloaded_files = []
-        all_current_files = set()
-        if os.path.exists(self.output_dir):
-            for root, dirs, files in os.walk(self.output_dir):
-                for file in files:
-                    # Skip metadata, config, and cookie files more comprehensively
-                    if file.endswith((".json", ".txt", ".log", ".tmp")) or file.startswith("tmp") or "cookie" in file.lower():
-                        continue
-                    file_path = os.path.join(root, file)
-                    all_current_files.add(file_path)
-                    if file_path not in existing_files:
-                        new_downloaded_files.append(file_path)
+        # Execute download: one run per URL in parallel when there are several, otherwise a
+        # single run in-process when the yt_dlp package is importable, else via the CLI
+        if self.max_parallel_videos > 1 and len(urls) > 1:
+            process_success, process_returncode, stdout, stderr, produced = self._run_parallel(option_args, urls)
+        elif YT_DLP_AVAILABLE:
+            process_success, process_returncode, stdout, stderr, produced = self._run_in_process(option_args, urls)
+        else:
+            # The user's batch file is passed as is unless cached URLs were removed from the list
+            if self.batch_file and not cached_keys:
+                process_success, process_returncode, stdout, stderr, produced = self._run_subprocess(
+                    option_args, command[len(option_args) + 1:]
+                )
+            else:
+                process_success, process_returncode, stdout, stderr, produced = self._run_subprocess_batch(option_args, urls)
+
+        # Files reported by yt-dlp that still exist (merged formats and embedded subtitles
+        # are deleted again), skipping metadata, config, and cookie files
+        source_urls = {}  # file path -> URL it was downloaded from
+        for source_url, file_path in produced:
+            file_path = os.path.abspath(file_path)
+            if file_path in source_urls or _SKIP_RE.search(os.path.basename(file_path)):
+                continue
+            if os.path.isfile(file_path):
+                source_urls[file_path] = source_url
+        new_downloaded_files = list(source_urls)
 
-        self.debug_info.append(f"📊 Files before download: {len(existing_files)}")
-        self.debug_info.append(f"📊 Files after download: {len(all_current_files)}")
         self.debug_info.append(f"📊 New files this run: {len(new_downloaded_files)}")
 
         # Always attempt file organization if enabled, even if there were errors
         organization_attempted = False
-        if self.organize_files:
+        if self.organize_files and not self.legacy_organize:
+            self.debug_info.append("📂 Files were written directly into type subfolders (videos/, audio/, subtitles/, other/)")
+        elif self.organize_files:
             self.debug_info.append("📂 Starting file organization by type...")
             organization_attempted = True
             try:
                 # Only organize if we have files to organize
                 if new_downloaded_files:
-                    # Track original filenames to match after organization
-                    original_filenames = set()
-                    for file_path in new_downloaded_files:
-                        original_filenames.add(os.path.basename(file_path))
-                    
                     self.debug_info.append(f"📋 Files to organize: {len(new_downloaded_files)}")
                     
-                    self._organize_files_by_type(new_downloaded_files)
-                    
-                    # Re-scan for organized files to update paths
-                    organized_files = []
-                    if os.path.exists(self.output_dir):
-                        for root, dirs, files in os.walk(self.output_dir):
-                            for file in files:
-                                # Skip metadata, config, and cookie files
-                                if file.endswith((".json", ".txt", ".log", ".tmp")) or file.startswith("tmp") or "cookie" in file.lower():
-                                    continue
-                                # Check if this file was one of the newly downloaded files by filename
-                                if file in original_filenames:
-                                    file_path = os.path.join(root, file)
-                                    organized_files.append(file_path)
-                    
-                    new_downloaded_files = organized_files
+                    organized = self._organize_files_by_type(new_downloaded_files)
+                    source_urls = {organized[p]: u for p, u in source_urls.items() if p in organized}
+                    new_downloaded_files = list(organized.values())
                     self.debug_info.append(f"📂 Organization completed successfully. Final file count: {len(new_downloaded_files)}")
                 else:
                     self.debug_info.append("📂 No files to organize")
@@ -617,6 +1023,17 @@ class YtDlpDownloader:
                 self.debug_info.append(f"❌ Traceback: {traceback.format_exc()}")
                 # Continue with unorganized files rather than failing completely
 
+        # Remember which files each requested URL produced (playlist entries report their own
+        # URL, so playlists are always checked again for new videos)
+        if self.use_download_archive:
+            requested = {_url_key(url) for url in urls}
+            files_by_url = {}
+            for file_path, source_url in source_urls.items():
+                key = _url_key(source_url)
+                if key in requested:
+                    files_by_url.setdefault(key, []).append(file_path)
+            self._save_url_cache(files_by_url)
+
         result = {
             "command": " ".join(command),
             "stdout": stdout,
@@ -721,13 +1138,29 @@ class YtDlpNode:
                     "default": True,
                     "tooltip": "Sort downloaded files into subfolders (videos/, audio/, subtitles/, other/)"
                 }),
+                "legacy_organize": ("BOOLEAN", {
+                    "default": False,
+                    "tooltip": "Download into the channel folder and move files into type subfolders afterwards, instead of letting yt-dlp write them there directly"
+                }),
+                "verbose": ("BOOLEAN", {
+                    "default": False,
+                    "tooltip": "List every queued and moved file in the debug summary (totals are always shown)"
+                }),
                 "rate_limit": ("STRING", {
                     "default": "",
                     "tooltip": "Maximum download rate (e.g., '1M' for 1MB/s, '500K' for 500KB/s)"
                 }),
-                "concurrent_fragments": (["1", "2", "4", "8"], {
-                    "default": "1",
-                    "tooltip": "Number of fragments to download concurrently"
+                "concurrent_fragments": ("INT", {
+                    "default": 4,
+                    "min": 1,
+                    "max": 16,
+                    "tooltip": "Number of fragments of a single video (HLS/DASH) to download concurrently"
+                }),
+                "max_parallel_videos": ("INT", {
+                    "default": 4,
+                    "min": 1,
+                    "max": 16,
+                    "tooltip": "Number of URLs to download at the same time (1 = one after another). High values may get throttled by some sites"
                 }),
                 "playlist_start": ("STRING", {
                     "default": "",
@@ -771,8 +1204,11 @@ class YtDlpNode:
         embed_subtitles: bool = False,
         write_info_json: bool = True,
         organize_files: bool = True,
+        legacy_organize: bool = False,
+        verbose: bool = False,
         rate_limit: str = "",
-        concurrent_fragments: str = "1",
+        concurrent_fragments: int = 4,
+        max_parallel_videos: int = 4,
         playlist_start: str = "",
         playlist_end: str = "",
         extra_options: str = "",
@@ -801,7 +1237,7 @@ class YtDlpNode:
                 playlist_end = None
 
             # Sanitize output directory
-            base_output_dir = os.path.abspath(folder_paths.get_output_directory())
+            base_output_dir = _abs_output_dir(folder_paths.get_output_directory())
             
             if not output_dir or output_dir.strip() == "":
                 output_dir = base_output_dir
@@ -814,14 +1250,13 @@ class YtDlpNode:
                 output_dir = os.path.normpath(output_dir)
                 output_dir = os.path.abspath(output_dir)
                 
-                # Security check: Ensure path is within base_output_dir
-                try:
-                    if os.path.commonpath([base_output_dir, output_dir]) != base_output_dir:
-                        print(f"Warning: Path '{output_dir}' is outside the allowed output directory. Reverting to default.")
-                        output_dir = base_output_dir
-                except ValueError:
-                    # Can happen on Windows if paths are on different drives
-                    print(f"Warning: Path '{output_dir}' is on a different drive. Reverting to default.")
+                # Security check: Ensure path is within base_output_dir. Both paths are absolute and
+                # normalized, so a prefix test on the case-normalized strings is enough (a path on
+                # another Windows drive simply fails it)
+                base_cmp = os.path.normcase(base_output_dir)
+                output_cmp = os.path.normcase(output_dir)
+                if output_cmp != base_cmp and not output_cmp.startswith(base_cmp.rstrip(os.sep) + os.sep):
+                    print(f"Warning: Path '{output_dir}' is outside the allowed output directory. Reverting to default.")
                     output_dir = base_output_dir
 
             if archive_file:
@@ -829,14 +1264,12 @@ class YtDlpNode:
             if config_path:
                 # Handle relative paths relative to PDF_tools directory
                 if not os.path.isabs(config_path):
-                    pdf_tools_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-                    config_path = os.path.join(pdf_tools_dir, config_path)
+                    config_path = os.path.join(_PDF_TOOLS_DIR, config_path)
                 config_path = os.path.abspath(config_path)
             if cookie_file:
                 # Handle relative paths relative to PDF_tools directory (same as config_path)
                 if not os.path.isabs(cookie_file):
-                    pdf_tools_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-                    cookie_file = os.path.join(pdf_tools_dir, cookie_file)
+                    cookie_file = os.path.join(_PDF_TOOLS_DIR, cookie_file)
                 cookie_file = os.path.abspath(cookie_file)
             if batch_file:
                 batch_file = os.path.abspath(batch_file)
@@ -861,8 +1294,11 @@ class YtDlpNode:
                 embed_subtitles=embed_subtitles,
                 write_info_json=write_info_json,
                 organize_files=organize_files,
+                legacy_organize=legacy_organize,
+                verbose=verbose,
                 rate_limit=rate_limit,
                 concurrent_fragments=concurrent_fragments,
+                max_parallel_videos=max_parallel_videos,
                 playlist_start=playlist_start,
                 playlist_end=playlist_end,
                 extra_options=extra_options,
@@ -1136,7 +1136,7 @@ class ArtsyHandler(BaseSiteHandler):
         try:
             # get XAPP token
             print("[ArtsyHandler] Fetching XAPP token from Artsy API...")
-            r = requests.post(
+            r = self.http.post(
                 "https://api.artsy.net/api/tokens/xapp_token",
                 data={"client_id": client_id, "client_secret": client_secret},
                 timeout=15
@@ -1190,7 +1190,7 @@ class ArtsyHandler(BaseSiteHandler):
 
             print(f"[ArtsyHandler] Found artist ID: {artist_id}, now fetching artworks...")
             url_artworks = f"https://api.artsy.net/api/artworks?artist_id={artist_id}&size=20"
-            resp = requests.get(url_artworks, headers=headers, timeout=15)
+            resp = self.http.get(url_artworks, headers=headers, timeout=15)
             data = resp.json()
             if "_embedded" in data and "artworks" in data["_embedded"]:
                 for aw in data["_embedded"]["artworks"]:
@@ -1203,7 +1203,7 @@ class ArtsyHandler(BaseSiteHandler):
             # Usually, the 'id' is different from the slug, but we can try the slug first
             print(f"[ArtsyHandler] Getting single artwork by slug: {slug}")
             single_url = f"https://api.artsy.net/api/artworks/{slug}"
-            resp = requests.get(single_url, headers=headers, timeout=15)
+            resp = self.http.get(single_url, headers=headers, timeout=15)
             aw = resp.json()
             if "id" in aw and "title" in aw:
                 item = self._convert_artwork_to_media_item(aw)
@@ -1244,7 +1244,7 @@ class ArtsyHandler(BaseSiteHandler):
         """
         try:
             url = f"https://api.artsy.net/api/artists/{slug}"
-            resp = requests.get(url, headers=headers, timeout=15)
+            resp = self.http.get(url, headers=headers, timeout=15)
             data = resp.json()
             # If successful, data should have an 'id' field
             if "id" in data:
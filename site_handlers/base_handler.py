@@ -32,9 +32,13 @@ import json
 import asyncio
 import time
 import random
+import requests
 from urllib.parse import urlparse
 from typing import Optional, List, Dict, Any, Union
 
+# Characters that are invalid in Windows/POSIX file and directory names
+_FS_BAD_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
 
 class BaseSiteHandler:
     """
@@ -43,6 +47,9 @@ class BaseSiteHandler:
     Site handlers allow customized scraping logic for specific websites
     that may have unique structures or requirements.
     """
+
+    # Domains allowed even when same_domain_only is enabled (see get_trusted_domains)
+    TRUSTED_DOMAINS = ()
     
     @classmethod
     def can_handle(cls, url):
@@ -68,6 +75,11 @@ class BaseSiteHandler:
         self.url = url
         self.scraper = scraper
         self.domain = self._extract_domain(url)
+
+    @property
+    def http(self):
+        """The scraper's pooled keep-alive requests.Session, or the requests module without one."""
+        return getattr(self.scraper, '_http', None) or requests
         
     def _extract_domain(self, url):
         """Extract domain from URL"""
@@ -226,7 +238,7 @@ class BaseSiteHandler:
         sanitized = name.replace(' ', '_')
         
         # Remove invalid characters for directory names
-        sanitized = re.sub(r'[<>:"/\\|?*]', '_', sanitized)
+        sanitized = sanitized.translate(_FS_BAD_TABLE)
         
         # Collapse multiple underscores
         sanitized = re.sub(r'_+', '_', sanitized)
@@ -379,9 +391,11 @@ class BaseSiteHandler:
         Return a list of domains that should be considered 'trusted' and allowed
         even when same_domain_only is enabled.
         
-        Override this method in site-specific handlers to add trusted domains.
+        Site-specific handlers list them in the TRUSTED_DOMAINS class attribute, which
+        the scraper can read without creating a handler. Handlers whose domains depend
+        on the URL set TRUSTED_DOMAINS = None and override this method instead.
         """
-        return []
+        return list(self.TRUSTED_DOMAINS or ())
 
 
     def get_highest_resolution_url(self, url: str) -> str:
@@ -132,6 +132,8 @@ class BellazonHandler(BaseSiteHandler):
     # ------------------------------------------------------------------
     # Trusted domains
     # ------------------------------------------------------------------
+    TRUSTED_DOMAINS = None  # Depends on the forum's own domain
+
     def get_trusted_domains(self) -> list:
         """IPS forums host uploads on the same domain."""
         return [self.domain, f"www.{self.domain}"]
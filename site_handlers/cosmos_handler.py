@@ -28,7 +28,7 @@ Cosmos.so-specific handler for the Web Image Scraper
 Handles multi-level gallery navigation and authentication.
 """
 
-from site_handlers.base_handler import BaseSiteHandler
+from site_handlers.base_handler import BaseSiteHandler, _FS_BAD_TABLE
 from urllib.parse import urljoin, urlparse, parse_qs
 from typing import List, Dict, Any, Optional, Union
 import os
@@ -371,7 +371,7 @@ class CosmosHandler(BaseSiteHandler):
         
         # Remove or replace unsafe characters
         import re
-        name = re.sub(r'[<>:"/\\|?*]', '_', name)
+        name = name.translate(_FS_BAD_TABLE)
         name = re.sub(r'[^\w\-_.]', '_', name)
         
         # Remove multiple underscores and clean up
@@ -380,9 +380,8 @@ class CosmosHandler(BaseSiteHandler):
         # Limit length
         return name[:50] if len(name) > 50 else name
 
-    def get_trusted_domains(self) -> list:
-        """Return trusted domains for Cosmos content"""
-        return ["cdn.cosmos.so", "cosmos.so", "www.cosmos.so", "cosmos-images.s3.amazonaws.com"]
+    # Trusted domains for Cosmos content
+    TRUSTED_DOMAINS = ("cdn.cosmos.so", "cosmos.so", "www.cosmos.so", "cosmos-images.s3.amazonaws.com")
 
     def _load_api_credentials(self):
         """
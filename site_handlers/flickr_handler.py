@@ -503,7 +503,7 @@ def can_handle(url):
                 # A more robust solution would verify these URLs with HEAD requests
                 if suffix == '_o':  # Original size typically needs verification
                     try:
-                        response = requests.head(high_res_url, timeout=2)
+                        response = self.http.head(high_res_url, timeout=2)
                         if response.status_code == 200:
                             return high_res_url
                         # If original size failed, continue with other sizes
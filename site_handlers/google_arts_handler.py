@@ -628,7 +628,7 @@ class GoogleArtsHandler(BaseSiteHandler):
                         headers['Cookie'] = cookie_str
                     
                     # Make request with proper headers
-                    response = requests.get(image_url, stream=True, timeout=30, headers=headers)
+                    response = self.http.get(image_url, stream=True, timeout=30, headers=headers)
                     response.raise_for_status()
                     
                     # Save the file
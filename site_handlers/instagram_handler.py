@@ -75,18 +75,17 @@ class InstagramHandler(BaseSiteHandler):
         self.processed_items = set()
         self.download_dir = None
     
-    def get_trusted_domains(self):
-        """Return list of trusted CDN domains for Instagram"""
-        return [
-            "scontent-lhr8-1.cdninstagram.com",
-            "scontent-lhr8-2.cdninstagram.com", 
-            "scontent.cdninstagram.com",
-            "scontent.fbcdn.net",
-            "scontent-lhr.xx.fbcdn.net",
-            "instagram.com",
-            "cdninstagram.com",
-            "fbcdn.net"
-        ]
+    # Trusted CDN domains for Instagram
+    TRUSTED_DOMAINS = (
+        "scontent-lhr8-1.cdninstagram.com",
+        "scontent-lhr8-2.cdninstagram.com",
+        "scontent.cdninstagram.com",
+        "scontent.fbcdn.net",
+        "scontent-lhr.xx.fbcdn.net",
+        "instagram.com",
+        "cdninstagram.com",
+        "fbcdn.net",
+    )
         
     def _initialize_instaloader(self) -> bool:
         """Initialize Instaloader with optimal settings"""
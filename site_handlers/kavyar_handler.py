@@ -80,13 +80,12 @@ class KavyarHandler(BaseSiteHandler):
                 "kavyar_state.json"
             )
     
-    def get_trusted_domains(self):
-        """Return list of trusted CDN domains for Kavyar"""
-        return [
-            "dfocupmdlnlkc.cloudfront.net",  # Kavyar's CloudFront CDN
-            "kavyar.com",                    # Main domain
-            "cloudfront.net"                 # General CloudFront (for safety)
-        ]
+    # Trusted CDN domains for Kavyar
+    TRUSTED_DOMAINS = (
+        "dfocupmdlnlkc.cloudfront.net",  # Kavyar's CloudFront CDN
+        "kavyar.com",                    # Main domain
+        "cloudfront.net",  # General CloudFront (for safety)
+    )
         
     def _load_api_credentials(self):
         """Load credentials from the auth_config if available"""
@@ -102,14 +102,13 @@ class ModelMayhemHandler(BaseSiteHandler):
         
         print(f"ModelMayhemHandler initialized for URL: {url}")
     
-    def get_trusted_domains(self) -> List[str]:
-        """Return list of trusted CDN domains for ModelMayhem"""
-        return [
-            "photos.modelmayhem.com",      # Main photo CDN
-            "assets.modelmayhem.com",       # Assets CDN
-            "modelmayhem.com",              # Main domain
-            "cloudfront.net"                # Potential CDN
-        ]
+    # Trusted CDN domains for ModelMayhem
+    TRUSTED_DOMAINS = (
+        "photos.modelmayhem.com",      # Main photo CDN
+        "assets.modelmayhem.com",       # Assets CDN
+        "modelmayhem.com",              # Main domain
+        "cloudfront.net",  # Potential CDN
+    )
     
     def _load_api_credentials(self):
         """Load credentials from the auth_config if available"""
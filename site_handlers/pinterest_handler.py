@@ -192,25 +192,21 @@ class PinterestHandler(BaseSiteHandler):
         return active_selectors
 
 
-    def get_trusted_domains(self) -> list:
-        """
-        Return a list of domains that should be considered 'trusted' and allowed
-        even when same_domain_only is enabled.
-        """
-        return [
-            "pinterest.com",
-            "pinimg.com",      # Main image CDN
-            "s-media-cache-ak.pinimg.com",  # Alternative CDN sometimes used
-            "i.pinimg.com",    # Direct image subdomain
-            "s.pinimg.com",    # Static assets subdomain
-            "media-cdn.pinterest.com",  # Media CDN
-            "pin.it",          # Short URL domain
-            "pinterest.ca",    # International domains
-            "pinterest.co.uk",
-            "pinterest.fr",
-            "pinterest.de",
-            "pinterest.jp"
-        ]
+    # Domains allowed even when same_domain_only is enabled
+    TRUSTED_DOMAINS = (
+        "pinterest.com",
+        "pinimg.com",      # Main image CDN
+        "s-media-cache-ak.pinimg.com",  # Alternative CDN sometimes used
+        "i.pinimg.com",    # Direct image subdomain
+        "s.pinimg.com",    # Static assets subdomain
+        "media-cdn.pinterest.com",  # Media CDN
+        "pin.it",          # Short URL domain
+        "pinterest.ca",    # International domains
+        "pinterest.co.uk",
+        "pinterest.fr",
+        "pinterest.de",
+        "pinterest.jp",
+    )
     def _setup_authentication(self):
         """Set up Pinterest authentication based on available credentials"""
         auth_config = self._load_auth_config()
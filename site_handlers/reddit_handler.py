@@ -27,7 +27,7 @@ Third-party code:
 Reddit (reddit.com) specific handler for the Web Image Scraper - Async Version
 """
 
-from site_handlers.base_handler import BaseSiteHandler 
+from site_handlers.base_handler import BaseSiteHandler, _FS_BAD_TABLE
 from urllib.parse import urljoin, urlparse, parse_qs
 import time
 import traceback
@@ -942,7 +942,7 @@ class RedditHandler(BaseSiteHandler):
     def _sanitize_directory_name(self, name):
         """Sanitize directory name to avoid invalid characters."""
         # This method doesn't use async operations, so it remains synchronous
-        return re.sub(r'[<>:"/\\|?*]', '_', name)
+        return name.translate(_FS_BAD_TABLE)
 
     async def _save_debug_info_async(self, page_or_response):
         """Save debug information for troubleshooting (async version)"""
@@ -71,20 +71,19 @@ class TumblrHandler(BaseSiteHandler):
     def can_handle(cls, url):
         return "tumblr.com" in url.lower()
 
-    def get_trusted_domains(self):
-        """Return list of trusted CDN domains for Tumblr"""
-        return [
-            "tumblr.com",           # Main domain
-            "64.media.tumblr.com",  # Primary media CDN
-            "va.media.tumblr.com",  # Video assets
-            "static.tumblr.com",    # Static assets
-            "assets.tumblr.com",    # General assets
-            "media.tumblr.com",     # Legacy media
-            "78.media.tumblr.com",  # Alternative media CDN
-            "66.media.tumblr.com",  # Alternative media CDN 
-            "vxtwitter.com",        # Video content
-            "pbs.twimg.com"         # Twitter embeds (common on Tumblr)
-        ]
+    # Trusted CDN domains for Tumblr
+    TRUSTED_DOMAINS = (
+        "tumblr.com",           # Main domain
+        "64.media.tumblr.com",  # Primary media CDN
+        "va.media.tumblr.com",  # Video assets
+        "static.tumblr.com",    # Static assets
+        "assets.tumblr.com",    # General assets
+        "media.tumblr.com",     # Legacy media
+        "78.media.tumblr.com",  # Alternative media CDN
+        "66.media.tumblr.com",  # Alternative media CDN
+        "vxtwitter.com",        # Video content
+        "pbs.twimg.com",  # Twitter embeds (common on Tumblr)
+    )
 
     def __init__(self, url, scraper=None):
         super().__init__(url, scraper)
@@ -113,7 +113,7 @@ class WordPressHandler(BaseSiteHandler):
 
         for endpoint in possible_endpoints:
             try:
-                resp = requests.head(endpoint, timeout=5)
+                resp = self.http.head(endpoint, timeout=5)
                 if resp.status_code in [200, 301, 302, 403, 401]:
                     # We'll assume it's a valid WP endpoint. We'll do a GET in extract_via_wp_api
                     self.api_base_url = base_url
@@ -139,7 +139,7 @@ class WordPressHandler(BaseSiteHandler):
 
         try:
             print(f"[WordPressHandler] Trying {media_url}")
-            resp = requests.get(media_url, timeout=10)
+            resp = self.http.get(media_url, timeout=10)
             if resp.status_code == 200:
                 data = resp.json()
                 if isinstance(data, list):
@@ -174,7 +174,7 @@ class WordPressHandler(BaseSiteHandler):
         posts_url = f"{self.api_base_url}/wp-json/wp/v2/posts?per_page=10"
         try:
             print(f"[WordPressHandler] Trying {posts_url}")
-            resp = requests.get(posts_url, timeout=10)
+            resp = self.http.get(posts_url, timeout=10)
             if resp.status_code == 200:
                 data = resp.json()
                 for p in data:
@@ -61,16 +61,15 @@ class YouTubeHandler(BaseSiteHandler):
         """Check if this handler can process the URL."""
         return "youtube.com" in url.lower() or "youtu.be" in url.lower()
     
-    def get_trusted_domains(self):
-        """Return list of trusted CDN domains for YouTube"""
-        return [
-            "ytimg.com",           # YouTube thumbnails
-            "ggpht.com",          # YouTube profile images  
-            "youtube.com",        # Main domain
-            "youtu.be",          # Short URLs
-            "googlevideo.com",   # Video streams
-            "googleusercontent.com"  # Various Google CDN content
-        ]
+    # Trusted CDN domains for YouTube
+    TRUSTED_DOMAINS = (
+        "ytimg.com",           # YouTube thumbnails
+        "ggpht.com",          # YouTube profile images
+        "youtube.com",        # Main domain
+        "youtu.be",          # Short URLs
+        "googlevideo.com",   # Video streams
+        "googleusercontent.com",  # Various Google CDN content
+    )
     
     def __init__(self, url, scraper=None):
         super().__init__(url, scraper)
@@ -79,16 +79,15 @@ class YouTubeHandlerYtDlp(BaseSiteHandler):
         # yt-dlp options
         self.ydl_opts = self._get_ydl_options()
     
-    def get_trusted_domains(self):
-        """Return list of trusted CDN domains for YouTube"""
-        return [
-            "ytimg.com",           # YouTube thumbnails
-            "ggpht.com",          # YouTube profile images  
-            "youtube.com",        # Main domain
-            "youtu.be",          # Short URLs
-            "googlevideo.com",   # Video streams
-            "googleusercontent.com"  # Various Google CDN content
-        ]
+    # Trusted CDN domains for YouTube
+    TRUSTED_DOMAINS = (
+        "ytimg.com",           # YouTube thumbnails
+        "ggpht.com",          # YouTube profile images
+        "youtube.com",        # Main domain
+        "youtu.be",          # Short URLs
+        "googlevideo.com",   # Video streams
+        "googleusercontent.com",  # Various Google CDN content
+    )
     
     def _parse_youtube_url(self, url: str) -> Dict[str, Any]:
         """Parse YouTube URL to extract type and identifiers"""
@@ -0,0 +1,99 @@
+"""Sequential download queue: same-domain filtering with same_domain_only on."""
+
+import asyncio
+import os
+import sys
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nodes.web_image_scraper_v082 import EricWebFileScraper
+
+
+def _run_queue(tmp_path, items, **kwargs):
+    scraper = EricWebFileScraper()
+    attempted = []
+
+    def fake_download_file(item, output_path, index, *args):
+        attempted.append(item['url'])
+        filepath = os.path.join(output_path, f"file_{index:04d}.jpg")
+        with open(filepath, 'wb') as f:
+            f.write(b'x')
+        return filepath, 'image', 100, 100, None, None
+
+    scraper.download_file = fake_download_file
+    stats = defaultdict(int)
+    downloaded, _ = asyncio.run(scraper._process_download_queue(
+        items, str(tmp_path), stats,
+        url='https://example.com/gallery', hash_algorithm='none', save_metadata_json=False, **kwargs
+    ))
+    return downloaded, attempted, stats
+
+
+def test_same_domain_only_keeps_same_host_and_cdn_items(tmp_path):
+    items = [
+        {'url': 'https://example.com/a.jpg'},
+        {'url': 'https://d1234.cloudfront.net/b.jpg'},
+        {'url': 'https://cdn.other.net/c.jpg', 'trusted_cdn': True},
+        {'url': 'https://elsewhere.org/d.jpg'},
+    ]
+    downloaded, attempted, stats = _run_queue(tmp_path, items, same_domain_only=True)
+
+    assert attempted == [item['url'] for item in items[:3]]
+    assert len(downloaded) == 3
+    assert stats["skipped_platform"] == 1
+    assert stats["failed_other"] == 0
+
+
+def test_same_domain_only_off_downloads_everything(tmp_path):
+    items = [{'url': 'https://example.com/a.jpg'}, {'url': 'https://elsewhere.org/d.jpg'}]
+    downloaded, attempted, stats = _run_queue(tmp_path, items, same_domain_only=False)
+
+    assert attempted == [item['url'] for item in items]
+    assert stats["skipped_platform"] == 0
+
+
+def _run_parallel_queue(tmp_path, items, fail_urls=(), **kwargs):
+    scraper = EricWebFileScraper()
+    fetched = []
+
+    async def fake_download_file_async(session, fetch_slot, hash_executor, item, output_path, index, *args):
+        async with fetch_slot:
+            await asyncio.sleep(0.01 * (index % 3))
+        fetched.append(item['url'])
+        if item['url'] in fail_urls:
+            return None, None, None, None, None, "HTTP error 404"
+        filepath = os.path.join(output_path, f"file_{index:04d}.jpg")
+        with open(filepath, 'wb') as f:
+            f.write(b'x')
+        return filepath, 'image', 100, 100, None, None
+
+    async def no_rate_limit(domain):
+        pass
+
+    scraper._download_file_async = fake_download_file_async
+    scraper._async_rate_limit = no_rate_limit
+    stats = defaultdict(int)
+    downloaded, _ = asyncio.run(scraper._process_download_queue_parallel(
+        items, str(tmp_path), stats,
+        url='https://example.com/gallery', hash_algorithm='none', save_metadata_json=False, **kwargs
+    ))
+    return downloaded, fetched
+
+
+def test_parallel_queue_never_overshoots_max_files(tmp_path):
+    items = [{'url': f'https://example.com/{i}.jpg'} for i in range(20)]
+    downloaded, fetched = _run_parallel_queue(tmp_path, items, max_files=3, max_workers=8)
+
+    assert len(downloaded) == 3
+    assert len(fetched) == 3
+    assert len(os.listdir(tmp_path)) == 3
+
+
+def test_parallel_queue_reuses_slots_of_failed_downloads(tmp_path):
+    items = [{'url': f'https://example.com/{i}.jpg'} for i in range(20)]
+    fail_urls = {item['url'] for item in items[:4]}
+    downloaded, fetched = _run_parallel_queue(tmp_path, items, fail_urls=fail_urls, max_files=3, max_workers=8)
+
+    assert len(downloaded) == 3
+    assert len(os.listdir(tmp_path)) == 3
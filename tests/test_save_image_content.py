@@ -0,0 +1,64 @@
+"""Exact-duplicate (SHA1) handling in _save_image_content."""
+
+import os
+import sys
+import threading
+from io import BytesIO
+
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nodes import web_image_scraper_v082 as scraper_module
+from nodes.web_image_scraper_v082 import EricWebFileScraper
+
+
+def _png_bytes():
+    buffer = BytesIO()
+    Image.new('RGB', (32, 32), (200, 10, 10)).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _save(scraper, content, tmp_path, name):
+    return scraper._save_image_content(content, f'https://example.com/{name}', str(tmp_path / name), name, 0, 0, 'none')
+
+
+def test_concurrent_identical_images_are_saved_once(tmp_path, monkeypatch):
+    scraper = EricWebFileScraper()
+    content = _png_bytes()
+    first_decoding = threading.Event()
+    second_done = threading.Event()
+    real_open = Image.open
+
+    def slow_open(fp, *args, **kwargs):
+        # Hold the first save between its SHA1 claim and its file write
+        if not first_decoding.is_set():
+            first_decoding.set()
+            second_done.wait(5)
+        return real_open(fp, *args, **kwargs)
+
+    monkeypatch.setattr(scraper_module.Image, 'open', slow_open)
+    results = {}
+    first = threading.Thread(target=lambda: results.setdefault('a', _save(scraper, content, tmp_path, 'a.png')))
+    first.start()
+    first_decoding.wait(5)
+    results['b'] = _save(scraper, content, tmp_path, 'b.png')
+    second_done.set()
+    first.join(5)
+
+    assert results['a'][5] is None
+    assert results['b'][0] is None
+    assert 'Exact duplicate' in results['b'][5]
+    assert sorted(os.listdir(tmp_path)) == ['a.png']
+
+
+def test_failed_claim_is_released(tmp_path):
+    scraper = EricWebFileScraper()
+    content = _png_bytes()
+
+    too_small = scraper._save_image_content(content, 'https://example.com/a.png', str(tmp_path / 'a.png'), 'a.png', 64, 64, 'none')
+    assert 'Too small' in too_small[5]
+
+    saved = _save(scraper, content, tmp_path, 'b.png')
+    assert saved[5] is None
+    assert sorted(os.listdir(tmp_path)) == ['b.png']